@@ -3,208 +3,190 @@ TalentScout Hiring Assistant Chatbot
 AI/ML Intern Assignment - A sophisticated hiring assistant for initial candidate screening
 """
 
+import os
+
 import streamlit as st
-import openai
-from datetime import datetime
-import json
-import re
 from utils.prompt_manager import PromptManager
 from utils.tech_stack_questions import TechStackQuestionGenerator
+from utils.question_rotation import QuestionExposureTracker
+from utils.conversation import ConversationEngine
 from utils.data_handler import DataHandler
-from config.settings import OPENAI_API_KEY, APP_CONFIG
+from utils.retention import RetentionPurger
+from config.settings import (
+    OPENAI_API_KEY, APP_CONFIG, MODEL_CONFIG, LLM_CONFIG, LLM_CACHE_CONFIG, STORAGE_CONFIG, RETENTION_CONFIG,
+    QUESTION_BANK_CONFIG
+)
 
-# Initialize OpenAI API
-openai.api_key = OPENAI_API_KEY
 
-# Initialize helper classes
-prompt_manager = PromptManager()
-question_generator = TechStackQuestionGenerator()
-data_handler = DataHandler()
+@st.cache_resource
+def get_data_handler():
+    """Create the DataHandler once per server process (Streamlit re-executes this script on every rerun)"""
+    return DataHandler(
+        data_dir=STORAGE_CONFIG["data_dir"],
+        storage_mode=STORAGE_CONFIG["storage_mode"],
+        snapshot_interval=STORAGE_CONFIG["snapshot_interval"],
+        writer_queue_size=STORAGE_CONFIG["writer_queue_size"],
+        writer_batch_size=STORAGE_CONFIG["writer_batch_size"]
+    )
 
 
-def initialize_session_state():
-    """Initialize all session state variables for maintaining conversation context"""
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
-    
-    if "conversation_stage" not in st.session_state:
-        st.session_state.conversation_stage = "greeting"
-    
-    if "candidate_data" not in st.session_state:
-        st.session_state.candidate_data = {
-            "full_name": None,
-            "email": None,
-            "phone": None,
-            "years_of_experience": None,
-            "desired_position": None,
-            "current_location": None,
-            "tech_stack": [],
-            "technical_responses": []
-        }
-    
-    if "current_question_index" not in st.session_state:
-        st.session_state.current_question_index = 0
-    
-    if "technical_questions" not in st.session_state:
-        st.session_state.technical_questions = []
-    
-    if "conversation_active" not in st.session_state:
-        st.session_state.conversation_active = True
+@st.cache_resource
+def get_question_generator():
+    """Create the question generator once per server process so loaded banks stay in memory"""
+    exposure_tracker = None
+    if QUESTION_BANK_CONFIG["rotation"]:
+        exposure_tracker = QuestionExposureTracker(STORAGE_CONFIG["data_dir"])
+    return TechStackQuestionGenerator(
+        bank_dir=QUESTION_BANK_CONFIG["bank_dir"],
+        reload_interval=QUESTION_BANK_CONFIG["reload_interval_seconds"],
+        pool_cache_size=QUESTION_BANK_CONFIG["pool_cache_size"],
+        pool_cache_ttl=QUESTION_BANK_CONFIG["pool_cache_ttl_seconds"],
+        exposure_tracker=exposure_tracker
+    )
 
 
-def check_exit_keywords(user_input):
-    """Check if user wants to end the conversation"""
-    exit_keywords = ["exit", "quit", "bye", "goodbye", "end chat", "stop", "terminate"]
-    return any(keyword in user_input.lower() for keyword in exit_keywords)
+@st.cache_resource
+def get_llm_client():
+    """Create the LLM client once per server process so every session shares its connection pool"""
+    from utils.llm_client import LLMClient
+    return LLMClient(
+        api_key=OPENAI_API_KEY,
+        model=MODEL_CONFIG["model_name"],
+        temperature=MODEL_CONFIG["temperature"],
+        max_tokens=MODEL_CONFIG["max_tokens"],
+        base_url=LLM_CONFIG["base_url"],
+        timeout=LLM_CONFIG["timeout_seconds"],
+        first_token_timeout=LLM_CONFIG["first_token_timeout_seconds"],
+        max_connections=LLM_CONFIG["max_connections"]
+    )
 
 
-def extract_candidate_info(user_input, field):
-    """Extract specific information from user input using pattern matching"""
-    if field == "email":
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, user_input)
-        return match.group(0) if match else None
-    
-    elif field == "phone":
-        phone_pattern = r'\b(?:\+?\d{1,3}[-.\s]?)?(?:\(?\d{3}\)?[-.\s]?)?\d{3}[-.\s]?\d{4}\b'
-        match = re.search(phone_pattern, user_input)
-        return match.group(0) if match else None
-    
-    elif field == "years_of_experience":
-        experience_pattern = r'(\d+(?:\.\d+)?(?:-\d+)?)\s*(?:years?|yrs?)'
-        match = re.search(experience_pattern, user_input.lower())
-        return match.group(1) if match else None
-    
-    return None
+@st.cache_resource
+def get_llm_cache():
+    """Create the LLM response cache once per server process so replies are shared across sessions"""
+    from utils.llm_cache import LLMResponseCache
+    disk_path = None
+    if LLM_CACHE_CONFIG["disk"]:
+        disk_path = os.path.join(STORAGE_CONFIG["data_dir"], "llm_cache.db")
+    return LLMResponseCache(
+        LLM_CACHE_CONFIG["stages"],
+        model_config=MODEL_CONFIG,
+        max_size=LLM_CACHE_CONFIG["max_size"],
+        ttl_seconds=LLM_CACHE_CONFIG["ttl_seconds"],
+        disk_path=disk_path
+    )
 
 
-def process_user_input(user_input):
-    """Process user input based on current conversation stage"""
-    stage = st.session_state.conversation_stage
-    candidate_data = st.session_state.candidate_data
-    
-    if check_exit_keywords(user_input):
-        st.session_state.conversation_stage = "closing"
-        st.session_state.conversation_active = False
-        return
-    
-    if stage == "greeting":
-        st.session_state.conversation_stage = "collecting_name"
-    
-    elif stage == "collecting_name":
-        if len(user_input.strip()) > 0:
-            candidate_data["full_name"] = user_input.strip()
-            st.session_state.conversation_stage = "collecting_email"
-    
-    elif stage == "collecting_email":
-        email = extract_candidate_info(user_input, "email")
-        if email:
-            candidate_data["email"] = email
-            st.session_state.conversation_stage = "collecting_phone"
-    
-    elif stage == "collecting_phone":
-        phone = extract_candidate_info(user_input, "phone")
-        if phone:
-            candidate_data["phone"] = phone
-            st.session_state.conversation_stage = "collecting_experience"
-    
-    elif stage == "collecting_experience":
-        experience = extract_candidate_info(user_input, "years_of_experience")
-        if experience:
-            candidate_data["years_of_experience"] = experience
-            st.session_state.conversation_stage = "collecting_position"
-        else:
-            numbers = re.findall(r'\d+', user_input)
-            if numbers:
-                candidate_data["years_of_experience"] = numbers[0]
-                st.session_state.conversation_stage = "collecting_position"
-    
-    elif stage == "collecting_position":
-        if len(user_input.strip()) > 0:
-            candidate_data["desired_position"] = user_input.strip()
-            st.session_state.conversation_stage = "collecting_location"
-    
-    elif stage == "collecting_location":
-        if len(user_input.strip()) > 0:
-            candidate_data["current_location"] = user_input.strip()
-            st.session_state.conversation_stage = "collecting_tech_stack"
-    
-    elif stage == "collecting_tech_stack":
-        if len(user_input.strip()) > 0:
-            tech_items = [item.strip() for item in re.split(r',|;|\band\b', user_input)]
-            candidate_data["tech_stack"] = [item for item in tech_items if len(item) > 0]
-            
-            questions = question_generator.generate_questions(candidate_data["tech_stack"])
-            st.session_state.technical_questions = questions
-            st.session_state.current_question_index = 0
-            st.session_state.conversation_stage = "asking_technical_questions"
-    
-    elif stage == "asking_technical_questions":
-        if st.session_state.current_question_index < len(st.session_state.technical_questions):
-            current_q = st.session_state.technical_questions[st.session_state.current_question_index]
-            candidate_data["technical_responses"].append({
-                "question": current_q,
-                "answer": user_input
-            })
-            
-            st.session_state.current_question_index += 1
-            
-            if st.session_state.current_question_index >= len(st.session_state.technical_questions):
-                st.session_state.conversation_stage = "closing"
-                st.session_state.conversation_active = False
+@st.cache_resource
+def get_speculative_questions(_llm_client):
+    """Create the background question generator once per server process (pending requests outlive reruns)"""
+    from utils.speculative_questions import SpeculativeQuestionGenerator
+    return SpeculativeQuestionGenerator(
+        _llm_client,
+        deadline=LLM_CONFIG["question_deadline_seconds"],
+        warm_up=LLM_CONFIG["warm_up_from_position"]
+    )
 
 
-def get_next_bot_message():
-    """Generate the next bot message based on current conversation stage"""
-    stage = st.session_state.conversation_stage
-    
-    if stage == "greeting":
-        return prompt_manager.get_greeting_message()
-    
-    elif stage == "collecting_name":
-        return "Great! Let's get started. May I have your full name, please?"
-    
-    elif stage == "collecting_email":
-        return f"Thank you, {st.session_state.candidate_data['full_name']}! What's the best email address to reach you?"
-    
-    elif stage == "collecting_phone":
-        return "Perfect! And what's your phone number?"
-    
-    elif stage == "collecting_experience":
-        return "Got it! How many years of professional experience do you have?"
-    
-    elif stage == "collecting_position":
-        return "Excellent! What position(s) are you interested in applying for?"
-    
-    elif stage == "collecting_location":
-        return "Thanks! Where are you currently located?"
-    
-    elif stage == "collecting_tech_stack":
-        return """Now, let's talk about your technical skills! Please list your tech stack - including programming languages, frameworks, databases, and tools you're proficient in. 
+@st.cache_resource
+def start_retention_purger(_data_handler):
+    """Start the background retention purge once per server process"""
+    purger = RetentionPurger(_data_handler, batch_size=RETENTION_CONFIG["batch_size"])
+    purger.start_background(RETENTION_CONFIG["purge_interval_seconds"])
+    return purger
 
-(For example: Python, React, PostgreSQL, Docker, AWS)"""
-    
-    elif stage == "asking_technical_questions":
-        if st.session_state.current_question_index < len(st.session_state.technical_questions):
-            question = st.session_state.technical_questions[st.session_state.current_question_index]
-            question_num = st.session_state.current_question_index + 1
-            total_questions = len(st.session_state.technical_questions)
-            return f"**Technical Question {question_num}/{total_questions}:**\n\n{question}"
-        else:
-            return "Thank you for answering all the technical questions!"
-    
-    elif stage == "closing":
-        data_handler.save_candidate_data(st.session_state.candidate_data)
-        
-        return f"""Thank you so much for your time, {st.session_state.candidate_data.get('full_name', 'candidate')}! 
 
-We've collected all the necessary information for the initial screening. Our team will review your responses and get back to you within 3-5 business days at {st.session_state.candidate_data.get('email', 'your email')}.
+# Initialize helper classes
+prompt_manager = PromptManager()
+question_generator = get_question_generator()
+data_handler = get_data_handler()
+llm_client = get_llm_client() if LLM_CONFIG["enabled"] else None
+speculative_questions = None
+if llm_client is not None and LLM_CONFIG["speculative_questions"]:
+    speculative_questions = get_speculative_questions(llm_client)
+engine = ConversationEngine(
+    question_generator,
+    prompt_manager=prompt_manager,
+    num_questions=APP_CONFIG["default_questions_count"],
+    speculative_questions=speculative_questions
+)
+llm_cache = get_llm_cache() if llm_client is not None and LLM_CACHE_CONFIG["enabled"] else None
 
-If you're selected for the next round, we'll reach out to schedule a detailed technical interview.
+if RETENTION_CONFIG["background_purge"]:
+    start_retention_purger(data_handler)
 
-Best of luck with your application! Have a wonderful day! """
-    
-    return "I'm here to help. How can I assist you?"
+
+def initialize_session_state():
+    """Initialize all session state variables for maintaining conversation context"""
+    if "conversation" not in st.session_state:
+        state, greeting = engine.start()
+        st.session_state.conversation = state
+        st.session_state.messages = [{
+            "role": "assistant",
+            "content": greeting
+        }]
+
+
+def save_candidate(state):
+    """Persist the collected data once a conversation has finished"""
+    # Upsert keyed on the session token: a repeated save doesn't store duplicates
+    if STORAGE_CONFIG["async_writes"]:
+        data_handler.upsert_candidate_data_async(state.candidate_data, state.session_token)
+    else:
+        data_handler.upsert_candidate_data(state.candidate_data, state.session_token)
+
+
+def stream_llm_reply(state, input_stage, user_input, draft_reply):
+    """Render the model's phrasing of a reply token by token; the draft is shown if the model is too slow"""
+    messages = prompt_manager.get_reply_messages(state.stage, user_input, draft_reply)
+    
+    cache_key = None
+    if llm_cache is not None:
+        cache_key = llm_cache.key(
+            messages[0]["content"], state.stage, user_input, draft_reply,
+            input_stage=input_stage, candidate_data=state.candidate_data
+        )
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    with st.chat_message("assistant"):
+        placeholder = st.empty()
+        reply = llm_client.stream_reply(
+            messages,
+            fallback=draft_reply,
+            on_text=lambda text: placeholder.markdown(text + "▌")
+        )
+        placeholder.markdown(reply)
+    
+    # Fallbacks are not cached so the next candidate gets another chance at a model reply
+    if llm_cache is not None and reply != draft_reply:
+        llm_cache.put(cache_key, reply)
+    return reply
+
+
+def handle_user_input(user_input):
+    """Run one conversation turn and record both sides of it"""
+    st.session_state.messages.append({
+        "role": "user",
+        "content": user_input
+    })
+    
+    previous = st.session_state.conversation
+    state, bot_response = engine.step(previous, user_input)
+    if state.finished and not previous.finished:
+        save_candidate(state)
+    st.session_state.conversation = state
+    
+    if llm_client is not None and state.stage in LLM_CONFIG["stages"]:
+        with st.chat_message("user"):
+            st.markdown(user_input)
+        bot_response = stream_llm_reply(state, previous.stage, user_input, bot_response)
+    
+    st.session_state.messages.append({
+        "role": "assistant",
+        "content": bot_response
+    })
 
 
 def main():
@@ -239,9 +221,9 @@ def main():
         
         st.markdown("---")
         
-        if any(v for v in st.session_state.candidate_data.values()):
+        data = st.session_state.conversation.candidate_data
+        if any(v for v in data.values()):
             st.subheader(" Information Collected:")
-            data = st.session_state.candidate_data
             
             if data["full_name"]:
                 st.text(f"Name: {data['full_name']}")
@@ -267,35 +249,15 @@ def main():
     chat_container = st.container()
     
     with chat_container:
-        if len(st.session_state.messages) == 0:
-            greeting = get_next_bot_message()
-            st.session_state.messages.append({
-                "role": "assistant",
-                "content": greeting
-            })
-        
         for message in st.session_state.messages:
             with st.chat_message(message["role"]):
                 st.markdown(message["content"])
     
-    if st.session_state.conversation_active:
+    if st.session_state.conversation.active:
         user_input = st.chat_input("Type your response here...")
         
         if user_input:
-            st.session_state.messages.append({
-                "role": "user",
-                "content": user_input
-            })
-            
-            process_user_input(user_input)
-            
-            bot_response = get_next_bot_message()
-            
-            st.session_state.messages.append({
-                "role": "assistant",
-                "content": bot_response
-            })
-            
+            handle_user_input(user_input)
             st.rerun()
     else:
         st.info("Conversation has ended. Thank you for your time!")
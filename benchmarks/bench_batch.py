@@ -0,0 +1,55 @@
+"""
+Micro-benchmark: generate_questions per candidate vs generate_questions_batch for a cohort
+
+    python benchmarks/bench_batch.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.tech_stack_questions import TechStackQuestionGenerator  # noqa: E402
+
+
+TECHS = [
+    "Python", "Django", "Flask", "PostgreSQL 15", "Docker", "k8s", "AWS (EC2, S3)",
+    "React 18", "Node JS", "TypeScript", "Java", "Spring", "MongoDB", "Redis", "Git",
+]
+
+
+def cohort(size, seed=11):
+    rng = random.Random(seed)
+    stacks = [rng.sample(TECHS, rng.randint(2, 6)) for _ in range(size // 4)]
+    # Cohorts repeat common stacks; draw candidates from a limited set of them
+    return [rng.choice(stacks) for _ in range(size)]
+
+
+def timed(label, fn, size):
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    print(f"{label:28}: {seconds:7.3f} s  ({1e6 * seconds / size:6.1f} us/candidate)")
+
+
+def main(size=50000):
+    generator = TechStackQuestionGenerator()
+    stacks = cohort(size)
+    years = [str(i % 15) for i in range(size)]
+
+    print(f"candidates: {size}")
+    timed("generate_questions loop", lambda: [
+        generator.generate_questions(stack, years_of_experience=y) for stack, y in zip(stacks, years)
+    ], size)
+    timed("batch (single process)", lambda: generator.generate_questions_batch(
+        stacks, years_of_experience=years, processes=1
+    ), size)
+    timed("batch (process pool)", lambda: generator.generate_questions_batch(
+        stacks, years_of_experience=years, parallel_threshold=0
+    ), size)
+
+
+if __name__ == "__main__":
+    main()
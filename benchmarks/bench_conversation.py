@@ -0,0 +1,62 @@
+"""
+Load test: complete screening sessions driven through ConversationEngine in-process
+
+    python benchmarks/bench_conversation.py
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.conversation import ConversationEngine, ConversationState  # noqa: E402
+from utils.tech_stack_questions import TechStackQuestionGenerator  # noqa: E402
+
+
+SCRIPT = [
+    "Hi!",
+    "I'm Jane Doe, jane@example.io, +44 7700 900123, 5 years, backend engineer in Leeds",
+    "Python, Django, PostgreSQL, Docker",
+    "Lists are mutable, tuples are not.",
+    "skip",
+    "It runs middleware in order for each request.",
+    "go back",
+    "Middleware wraps the view and can short-circuit the response.",
+    "Through the ORM's query sets, which are lazy.",
+    "Reference counting plus a cyclic garbage collector.",
+]
+
+
+def run_session(engine, round_trip=False):
+    state, _ = engine.start()
+    for message in SCRIPT:
+        if not state.active:
+            break
+        if round_trip:
+            # What an API server with an external session store does every turn
+            state = ConversationState.from_dict(json.loads(json.dumps(state.to_dict())))
+        state, _ = engine.step(state, message)
+    return state
+
+
+def main(sessions=5000):
+    engine = ConversationEngine(TechStackQuestionGenerator())
+
+    final = run_session(engine)
+    print(f"turns per session: {len(SCRIPT)}, final stage: {final.stage}, "
+          f"answers: {len(final.candidate_data['technical_responses'])}")
+
+    for round_trip in (False, True):
+        start = time.perf_counter()
+        for _ in range(sessions):
+            run_session(engine, round_trip)
+        seconds = time.perf_counter() - start
+        label = "with JSON state round trip" if round_trip else "in-memory state"
+        print(f"{label:28}: {sessions / seconds:8.0f} sessions/s, "
+              f"{sessions * len(SCRIPT) / seconds:8.0f} turns/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Micro-benchmark and sanity check: single-pass CandidateInfoExtractor
+
+    python benchmarks/bench_extraction.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.extraction import CandidateInfoExtractor  # noqa: E402
+
+
+INTRODUCTION = "I'm Jane Doe, jane@example.io, +44 7700 900123, 5 years, backend engineer in Leeds"
+
+# (message, expected fields)
+CASES = [
+    (INTRODUCTION, {
+        "full_name": "Jane Doe", "email": "jane@example.io", "phone": "+44 7700 900123",
+        "years_of_experience": "5", "desired_position": "backend engineer", "current_location": "Leeds",
+    }),
+    ("Yes, I'm Ready!", {}),
+    ("my name is Jane", {"full_name": "Jane"}),
+    ("Call me on 555-123-4567", {"phone": "555-123-4567"}),
+    # Dates and year ranges are not phone numbers
+    ("I was at Acme 2015-2020", {}),
+    ("Graduated 2015 - 2019", {}),
+    ("Started on 2020-01-15", {}),
+]
+
+# (message, expected remaining text)
+REST_CASES = [
+    ("Jane Doe, Software Engineer", "Jane Doe"),
+    ("jane@example.io", ""),
+]
+
+
+def main(number=20000):
+    extractor = CandidateInfoExtractor()
+
+    failures = 0
+    for message, expected in CASES:
+        found = extractor.extract(message)
+        if found != expected:
+            failures += 1
+            print(f"MISMATCH {message!r}: {found} != {expected}")
+    for message, expected in REST_CASES:
+        _, rest = extractor.split(message)
+        if rest != expected:
+            failures += 1
+            print(f"MISMATCH rest of {message!r}: {rest!r} != {expected!r}")
+    print(f"checks: {len(CASES) + len(REST_CASES) - failures}/{len(CASES) + len(REST_CASES)} passed")
+
+    seconds = timeit.timeit(lambda: extractor.extract(INTRODUCTION), number=number)
+    print(f"full introduction: {1e6 * seconds / number:8.1f} us/message")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
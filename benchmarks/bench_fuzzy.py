@@ -0,0 +1,61 @@
+"""
+Micro-benchmark: trigram fuzzy matching against a question bank of thousands of names
+Also checks that misspellings resolve and that other words are not taken for technologies
+
+    python benchmarks/bench_fuzzy.py
+"""
+
+import os
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fuzzy_match import TrigramIndex  # noqa: E402
+from utils.tech_stack_questions import TechStackQuestionGenerator  # noqa: E402
+
+
+MISSPELLINGS = ["Kubernates", "Postgress", "Djano", "Javscript", "Angularr", "Expresss"]
+# Words close to a technology name that must not resolve to it
+NOT_TECHNOLOGIES = ["Reactive", "Expressive", "Javas"]
+
+
+def synthetic_names(count, seed=7):
+    rng = random.Random(seed)
+    return {
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 14))): i
+        for i in range(count)
+    }
+
+
+def main(number=2000):
+    generator = TechStackQuestionGenerator()
+    normalizer = generator.normalizer
+
+    failures = 0
+    for tech in MISSPELLINGS:
+        name, confidence = normalizer._resolve(tech)
+        print(f"{tech:12} -> {name:12} confidence {confidence:.2f}")
+        failures += name not in generator.question_bank
+    for word in NOT_TECHNOLOGIES:
+        name, confidence = normalizer._resolve(word)
+        print(f"{word:12} -> {name:12} confidence {confidence:.2f}")
+        failures += confidence > 0
+
+    for size in (100, 1000, 5000):
+        names = synthetic_names(size)
+        names.update(normalizer.lookup)
+        index = TrigramIndex(names)
+        seconds = timeit.timeit(lambda: [index.best_match(t.lower()) for t in MISSPELLINGS], number=number)
+        per_query = 1e6 * seconds / (number * len(MISSPELLINGS))
+        print(f"indexed names: {len(names):6d}  {per_query:8.1f} us/query")
+
+    if failures:
+        print(f"{failures} name(s) resolved wrongly")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+LLM client against a local stub of the OpenAI streaming API (no key or network needed)
+
+    python benchmarks/bench_llm_client.py
+
+The stub answers POST /v1/chat/completions with server-sent events, one word
+per token_delay seconds. A second stub that stalls before its first token
+shows the fallback path.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import wait
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.llm_client import LLMClient  # noqa: E402
+
+
+REPLY = "Thanks, Jane! What's the best email address to reach you?"
+
+
+def start_stub(token_delay=0.01, first_token_delay=0.0):
+    """Run a stub completions server on a background loop; returns its base URL"""
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    address = {}
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+                length = 0
+                for line in head.split("\r\n")[1:]:
+                    name, _, value = line.partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value)
+                await reader.readexactly(length)
+
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                             b"Transfer-Encoding: chunked\r\n\r\n")
+                await asyncio.sleep(first_token_delay)
+                for i, word in enumerate(REPLY.split(" ")):
+                    chunk = {
+                        "id": "stub", "object": "chat.completion.chunk", "created": 0, "model": "stub",
+                        "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word},
+                                     "finish_reason": None}],
+                    }
+                    event = f"data: {json.dumps(chunk)}\n\n".encode()
+                    writer.write(b"%x\r\n%s\r\n" % (len(event), event))
+                    await writer.drain()
+                    await asyncio.sleep(token_delay)
+                event = b"data: [DONE]\n\n"
+                writer.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(event), event))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    async def serve():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0, backlog=1024)
+        address["port"] = server.sockets[0].getsockname()[1]
+        ready.set()
+        await server.serve_forever()
+
+    threading.Thread(target=lambda: loop.run_until_complete(serve()), daemon=True).start()
+    ready.wait()
+    return f"http://127.0.0.1:{address['port']}/v1"
+
+
+def messages():
+    return [{"role": "system", "content": "stub"}, {"role": "user", "content": "Jane Doe"}]
+
+
+def main(concurrent_calls=50):
+    client = LLMClient(api_key="stub", base_url=start_stub(), timeout=5.0, first_token_timeout=2.0)
+
+    first_token = []
+    start = time.perf_counter()
+    reply = client.stream_reply(messages(), "fallback",
+                                on_text=lambda text: first_token or first_token.append(time.perf_counter()))
+    print(f"streamed reply: {reply!r}")
+    print(f"first token after {(first_token[0] - start) * 1000:.1f} ms, "
+          f"full reply after {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    futures = [client.submit(messages(), "fallback") for _ in range(concurrent_calls)]
+    wait(futures)
+    seconds = time.perf_counter() - start
+    replies = sum(future.result() == REPLY for future in futures)
+    print(f"{concurrent_calls} concurrent calls over one pool: {seconds:.2f}s, {replies} model replies")
+    print(f"stats: {client.stats()}")
+    client.close()
+
+    slow = LLMClient(api_key="stub", base_url=start_stub(first_token_delay=5.0), timeout=5.0,
+                     first_token_timeout=0.5)
+    start = time.perf_counter()
+    reply = slow.stream_reply(messages(), "templated reply")
+    print(f"stalled model: {reply!r} after {(time.perf_counter() - start) * 1000:.0f} ms, stats: {slow.stats()}")
+    slow.close()
+
+
+if __name__ == "__main__":
+    main()
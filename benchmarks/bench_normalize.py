@@ -0,0 +1,65 @@
+"""
+Micro-benchmark: TechNameNormalizer vs the previous per-call dict normalization
+
+    python benchmarks/bench_normalize.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.tech_stack_questions import TechStackQuestionGenerator  # noqa: E402
+
+
+SAMPLE_STACK = [
+    "Python", "Node JS", "React 18", "PostgreSQL 15", "AWS (EC2", "S3)",
+    "k8s", "Docker", "vue.js", "Mongo", "Django REST Framework", "git",
+]
+
+
+def legacy_normalize(tech):
+    """The original implementation: builds the alias dict on every call"""
+    tech_lower = tech.lower().strip()
+
+    variations = {
+        "js": "javascript",
+        "node": "express",
+        "nodejs": "express",
+        "node.js": "express",
+        "reactjs": "react",
+        "react.js": "react",
+        "angularjs": "angular",
+        "vue.js": "vue",
+        "vuejs": "vue",
+        "postgres": "postgresql",
+        "mongo": "mongodb",
+        "k8s": "kubernetes",
+        "py": "python",
+    }
+
+    return variations.get(tech_lower, tech_lower)
+
+
+def main(number=20000):
+    generator = TechStackQuestionGenerator()
+    normalizer = generator.normalizer
+    bank = generator.question_bank
+
+    legacy_hits = sum(legacy_normalize(t) in bank for t in SAMPLE_STACK)
+    engine_hits = sum(normalizer.normalize(t) in bank for t in SAMPLE_STACK)
+
+    legacy = timeit.timeit(lambda: [legacy_normalize(t) for t in SAMPLE_STACK], number=number)
+    cached = timeit.timeit(lambda: normalizer.normalize_many(SAMPLE_STACK), number=number)
+    uncached = timeit.timeit(lambda: [normalizer._normalize(t) for t in SAMPLE_STACK], number=number)
+
+    per_name = 1e9 / (number * len(SAMPLE_STACK))
+    print(f"names per stack: {len(SAMPLE_STACK)}, iterations: {number}")
+    print(f"legacy dict-per-call : {legacy * per_name:8.1f} ns/name, bank hits {legacy_hits}/{len(SAMPLE_STACK)}")
+    print(f"engine (memoized)    : {cached * per_name:8.1f} ns/name, bank hits {engine_hits}/{len(SAMPLE_STACK)}")
+    print(f"engine (cold path)   : {uncached * per_name:8.1f} ns/name")
+
+
+if __name__ == "__main__":
+    main()
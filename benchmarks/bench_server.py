@@ -0,0 +1,76 @@
+"""
+Load test: concurrent candidates chatting with server.py over HTTP on one event loop
+
+    python benchmarks/bench_server.py [memory|sqlite]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_conversation import SCRIPT  # noqa: E402
+from server import build_server  # noqa: E402
+
+
+async def request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    length = 0
+    for line in head.split("\r\n")[1:]:
+        name, _, value = line.partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return json.loads(await reader.readexactly(length)) if length else None
+
+
+async def candidate(port, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    response = await request(reader, writer, "POST", "/sessions")
+    path = f"/sessions/{response['session_id']}/messages"
+    for message in SCRIPT:
+        start = time.perf_counter()
+        response = await request(reader, writer, "POST", path, {"message": message})
+        latencies.append(time.perf_counter() - start)
+        if not response["active"]:
+            break
+    writer.close()
+    return response
+
+
+async def run(session_store, candidates):
+    with tempfile.TemporaryDirectory() as data_dir:
+        app = build_server("sqlite", data_dir, session_store)
+        server = await asyncio.start_server(app.handle_connection, "127.0.0.1", 0, backlog=4096)
+        port = server.sockets[0].getsockname()[1]
+
+        latencies = []
+        start = time.perf_counter()
+        results = await asyncio.gather(*(candidate(port, latencies) for _ in range(candidates)))
+        seconds = time.perf_counter() - start
+
+        server.close()
+        await server.wait_closed()
+        app.close()
+
+    latencies.sort()
+    saved = sum(result["saved"] for result in results)
+    print(f"{session_store} sessions, {candidates} concurrent candidates: {seconds:.2f}s, "
+          f"{len(latencies) / seconds:.0f} turns/s, saved {saved}/{candidates}")
+    print(f"turn latency p50 {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms")
+
+
+def main(session_store="memory", candidates=2000):
+    asyncio.run(run(session_store, candidates))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -25,3 +25,90 @@ MODEL_CONFIG = {
     "temperature": 0.7,
     "max_tokens": 500,
 }
+
+# LLM Reply Configuration
+LLM_CONFIG = {
+    # Have the model phrase replies; the templated replies are used when off,
+    # and whenever a call times out or fails
+    "enabled": os.getenv("TALENTSCOUT_LLM_REPLIES", "false").lower() == "true",
+    # OpenAI-compatible endpoint; point it at a local stub server for testing
+    "base_url": os.getenv("OPENAI_BASE_URL") or None,
+    "timeout_seconds": 8.0,
+    "first_token_timeout_seconds": 3.0,
+    # One connection pool shared by every session
+    "max_connections": 100,
+    # Stages whose replies are phrased by the model; technical questions are
+    # asked verbatim so the recorded question matches what was shown
+    "stages": (
+        "collecting_name", "collecting_email", "collecting_phone", "collecting_experience",
+        "collecting_position", "collecting_location", "collecting_tech_stack", "closing",
+    ),
+    # Generate technical questions for the candidate's stack in the background.
+    # Bank questions are asked at once; model questions replace the ones not
+    # asked yet if they arrive before the deadline
+    "speculative_questions": os.getenv("TALENTSCOUT_LLM_QUESTIONS", "false").lower() == "true",
+    "question_deadline_seconds": 20.0,
+    # Start a position-based request once the position is known
+    "warm_up_from_position": True,
+}
+
+# LLM Response Cache Configuration
+LLM_CACHE_CONFIG = {
+    "enabled": os.getenv("TALENTSCOUT_LLM_CACHE", "true").lower() == "true",
+    # Reply stages whose turns may be cached; turns answering name, email or
+    # phone, or containing them, are never cached
+    "stages": ("collecting_position", "collecting_location", "collecting_tech_stack"),
+    "max_size": 4096,
+    "ttl_seconds": 86400,
+    # Also keep replies in data/llm_cache.db, shared by processes and restarts
+    "disk": os.getenv("TALENTSCOUT_LLM_CACHE_DISK", "false").lower() == "true",
+}
+
+# Storage Configuration
+STORAGE_CONFIG = {
+    "data_dir": os.getenv("TALENTSCOUT_DATA_DIR", "data"),
+    # "json" rewrites one document per save; "journal" appends one line per save;
+    # "sqlite" uses a WAL-mode database that is safe for concurrent sessions
+    "storage_mode": os.getenv("TALENTSCOUT_STORAGE_MODE", "json"),
+    "snapshot_interval": 500,
+    # Closing-turn saves go through a background group-commit writer
+    "async_writes": True,
+    "writer_queue_size": 1000,
+    "writer_batch_size": 64,
+}
+
+# Retention Configuration (GDPR)
+RETENTION_CONFIG = {
+    "background_purge": os.getenv("TALENTSCOUT_BACKGROUND_PURGE", "false").lower() == "true",
+    "purge_interval_seconds": 3600,
+    "batch_size": 500,
+}
+
+# Question Bank Configuration
+QUESTION_BANK_CONFIG = {
+    # One <tech>.json file per technology; None uses question_bank/ in the repo
+    "bank_dir": os.getenv("TALENTSCOUT_QUESTION_BANK_DIR") or None,
+    # Edited files are picked up by the running app after at most this long
+    "reload_interval_seconds": 2.0,
+    # Question pools are cached per normalized tech stack
+    "pool_cache_size": 1024,
+    "pool_cache_ttl_seconds": 300,
+    # Ask the least-exposed questions instead of random ones; exposure counters
+    # are stored in the data directory
+    "rotation": os.getenv("TALENTSCOUT_QUESTION_ROTATION", "false").lower() == "true",
+}
+
+# HTTP API Configuration (server.py, for the careers-page widget)
+SERVER_CONFIG = {
+    "host": os.getenv("TALENTSCOUT_SERVER_HOST", "127.0.0.1"),
+    "port": int(os.getenv("TALENTSCOUT_SERVER_PORT", "8080")),
+    # "memory" keeps sessions in the process; "sqlite" keeps them in
+    # data/sessions.db. Several server processes may share a data directory
+    # only with the sqlite session store and storage mode; otherwise the
+    # first server locks it
+    "session_store": os.getenv("TALENTSCOUT_SESSION_STORE", "memory"),
+    "session_ttl_seconds": 3600,
+    # Origin of the careers page allowed to call the API
+    "allowed_origin": os.getenv("TALENTSCOUT_ALLOWED_ORIGIN", "*"),
+    "max_body_bytes": 65536,
+}
@@ -0,0 +1,338 @@
+"""
+TalentScout Hiring Assistant - HTTP/JSON API
+Asyncio server for the careers-page chat widget; runs the same conversation as app.py:
+
+    python server.py --port 8080
+
+    POST /sessions                       -> {"session_id", "reply", "stage", "active"}
+    POST /sessions/<session_id>/messages {"message": "..."}
+                                         -> {"session_id", "reply", "stage", "active", "saved"}
+    GET  /health                         -> {"status": "ok", "sessions": ...}
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from config.settings import APP_CONFIG, QUESTION_BANK_CONFIG, SERVER_CONFIG, STORAGE_CONFIG
+from utils.conversation import ConversationEngine, ConversationState
+from utils.data_handler import DataHandler
+from utils.process_lock import lock_data_dir
+from utils.question_rotation import QuestionExposureTracker
+from utils.session_store import SessionConflict, create_session_store
+from utils.tech_stack_questions import TechStackQuestionGenerator
+
+
+MESSAGES_PATH_PATTERN = re.compile(r"^/sessions/([0-9a-f]{32})/messages$")
+LOCK_STRIPES = 1024
+
+
+class HTTPError(Exception):
+    """Request failure reported to the client as a JSON error"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ScreeningServer:
+    """
+    Serves screening conversations over HTTP/JSON on one asyncio event loop
+
+    Each request loads the session state from the session store, runs one
+    ConversationEngine step and stores the new state. Blocking work
+    (engine steps, which can load question banks and save exposure counts,
+    DataHandler writes, disk-backed session stores) runs in a thread pool
+    so the loop keeps serving other candidates. Requests for the same
+    session are serialized by striped locks within the process; a shared
+    session store also rejects a turn whose session another process changed
+    meanwhile (409 Conflict).
+    """
+
+    def __init__(self, engine, data_handler, session_store, allowed_origin="*",
+                 max_body_bytes=65536, executor_workers=8, process_lock=None):
+        """
+        Args:
+            engine: ConversationEngine
+            data_handler: DataHandler that stores finished screenings
+            session_store: Session store (see utils.session_store)
+            allowed_origin: Access-Control-Allow-Origin value for the widget
+            max_body_bytes: Largest accepted request body
+            executor_workers: Threads for blocking work
+            process_lock: File from lock_data_dir(), released by close()
+        """
+        self.engine = engine
+        self.data_handler = data_handler
+        self.session_store = session_store
+        self.allowed_origin = allowed_origin
+        self.max_body_bytes = max_body_bytes
+        self.executor = ThreadPoolExecutor(max_workers=executor_workers, thread_name_prefix="screening-io")
+        self.process_lock = process_lock
+        self._locks = [asyncio.Lock() for _ in range(LOCK_STRIPES)]
+
+    # ----- session handling ----------------------------------------------
+
+    def _lock_for(self, session_id):
+        digest = hashlib.blake2b(session_id.encode(), digest_size=4).digest()
+        return self._locks[int.from_bytes(digest, "big") % LOCK_STRIPES]
+
+    async def _store_call(self, method, *args):
+        if self.session_store.blocking:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, method, *args)
+        return method(*args)
+
+    async def start_session(self):
+        """Create a session and return its greeting"""
+        loop = asyncio.get_running_loop()
+        state, reply = await loop.run_in_executor(self.executor, self.engine.start)
+        await self._store_call(self.session_store.put, state.session_token, state.to_dict())
+        return self._response(state, reply)
+
+    async def post_message(self, session_id, message):
+        """Run one conversation turn for a session"""
+        async with self._lock_for(session_id):
+            data = await self._store_call(self.session_store.get, session_id)
+            if data is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, "Unknown or expired session")
+
+            revision = data.get("_revision")
+            loop = asyncio.get_running_loop()
+            state, reply = await loop.run_in_executor(
+                self.executor, self.engine.step, ConversationState.from_dict(data), message
+            )
+            saved = False
+
+            try:
+                if state.finished:
+                    # Finished screenings live in the candidate store only
+                    await self._store_call(self.session_store.delete, session_id, revision)
+                    saved = await self._save(state)
+                else:
+                    await self._store_call(self.session_store.put, session_id, state.to_dict(), revision)
+            except SessionConflict:
+                raise HTTPError(HTTPStatus.CONFLICT, "Session changed by another request; send the message again")
+
+        response = self._response(state, reply)
+        response["saved"] = saved
+        return response
+
+    async def _save(self, state):
+        loop = asyncio.get_running_loop()
+        success, _ = await loop.run_in_executor(
+            self.executor, self.data_handler.upsert_candidate_data, state.candidate_data, state.session_token
+        )
+        return success
+
+    @staticmethod
+    def _response(state, reply):
+        return {
+            "session_id": state.session_token,
+            "reply": reply,
+            "stage": state.stage,
+            "active": state.active,
+        }
+
+    # ----- HTTP ----------------------------------------------------------
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection (keep-alive aware)"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                keep_alive = await self._handle_request(head, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, head, reader, writer):
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, path, version = lines[0].split(" ", 2)
+        except ValueError:
+            self._write(writer, HTTPStatus.BAD_REQUEST, {"error": "Malformed request line"}, False)
+            return False
+
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+        try:
+            length = int(headers.get("content-length") or 0)
+            if length > self.max_body_bytes:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+            body = await reader.readexactly(length) if length else b""
+            status, payload = await self._route(method, path.split("?", 1)[0], body)
+        except HTTPError as e:
+            status, payload = e.status, {"error": e.message}
+        except ValueError:
+            status, payload = HTTPStatus.BAD_REQUEST, {"error": "Invalid request"}
+        except asyncio.IncompleteReadError:
+            return False
+        except Exception as e:
+            print(f"Error handling request: {str(e)}")
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal error"}
+
+        self._write(writer, status, payload, keep_alive)
+        return keep_alive
+
+    async def _route(self, method, path, body):
+        if method == "OPTIONS":
+            return HTTPStatus.NO_CONTENT, None
+
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, {"status": "ok", "sessions": await self._session_count()}
+
+        if path == "/sessions" and method == "POST":
+            return HTTPStatus.CREATED, await self.start_session()
+
+        match = MESSAGES_PATH_PATTERN.match(path)
+        if match and method == "POST":
+            request = json.loads(body or b"{}")
+            message = request.get("message") if isinstance(request, dict) else None
+            if not isinstance(message, str) or not message.strip():
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Field 'message' must be a non-empty string")
+            return HTTPStatus.OK, await self.post_message(match.group(1), message)
+
+        raise HTTPError(HTTPStatus.NOT_FOUND, "Not found")
+
+    async def _session_count(self):
+        return await self._store_call(self.session_store.__len__)
+
+    def _write(self, writer, status, payload, keep_alive):
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Access-Control-Allow-Origin: {self.allowed_origin}\r\n"
+            f"Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+            f"Access-Control-Allow-Headers: Content-Type\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+    async def purge_sessions(self, interval):
+        """Drop expired sessions every interval seconds"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._store_call(self.session_store.purge_expired)
+            except Exception as e:
+                print(f"Error purging sessions: {str(e)}")
+
+    async def serve(self, host, port, backlog=4096, purge_interval=300):
+        """Listen and serve until cancelled"""
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=backlog)
+        addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"TalentScout API listening on {addresses}")
+        purger = asyncio.create_task(self.purge_sessions(purge_interval))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            purger.cancel()
+
+    def close(self):
+        """Stop the executor and flush pending candidate writes"""
+        self.executor.shutdown(wait=True)
+        self.data_handler.close()
+        if self.process_lock is not None:
+            self.process_lock.close()
+
+
+def build_server(storage_mode=None, data_dir=None, session_store=None):
+    """
+    Assemble a ScreeningServer from config/settings.py
+
+    Several processes may serve the same data directory only with the sqlite
+    storage mode and session store; any other combination locks the data
+    directory to this process.
+
+    Raises:
+        RuntimeError: Another server holds the data directory
+    """
+    data_dir = data_dir or STORAGE_CONFIG["data_dir"]
+    storage_mode = storage_mode or STORAGE_CONFIG["storage_mode"]
+    session_store = session_store or SERVER_CONFIG["session_store"]
+    process_lock = None
+    if storage_mode != "sqlite" or session_store != "sqlite":
+        process_lock = lock_data_dir(data_dir)
+
+    data_handler = DataHandler(
+        data_dir=data_dir,
+        storage_mode=storage_mode,
+        snapshot_interval=STORAGE_CONFIG["snapshot_interval"],
+        writer_queue_size=STORAGE_CONFIG["writer_queue_size"],
+        writer_batch_size=STORAGE_CONFIG["writer_batch_size"]
+    )
+
+    exposure_tracker = None
+    if QUESTION_BANK_CONFIG["rotation"]:
+        exposure_tracker = QuestionExposureTracker(data_dir)
+    question_generator = TechStackQuestionGenerator(
+        bank_dir=QUESTION_BANK_CONFIG["bank_dir"],
+        reload_interval=QUESTION_BANK_CONFIG["reload_interval_seconds"],
+        pool_cache_size=QUESTION_BANK_CONFIG["pool_cache_size"],
+        pool_cache_ttl=QUESTION_BANK_CONFIG["pool_cache_ttl_seconds"],
+        exposure_tracker=exposure_tracker
+    )
+    engine = ConversationEngine(question_generator, num_questions=APP_CONFIG["default_questions_count"])
+
+    store = create_session_store(
+        session_store,
+        data_dir=data_dir,
+        ttl_seconds=SERVER_CONFIG["session_ttl_seconds"]
+    )
+    return ScreeningServer(
+        engine,
+        data_handler,
+        store,
+        allowed_origin=SERVER_CONFIG["allowed_origin"],
+        max_body_bytes=SERVER_CONFIG["max_body_bytes"],
+        process_lock=process_lock
+    )
+
+
+def main(argv=None):
+    """Command-line entry point: run the API server"""
+    parser = argparse.ArgumentParser(description="Serve TalentScout screenings over HTTP/JSON")
+    parser.add_argument("--host", default=SERVER_CONFIG["host"])
+    parser.add_argument("--port", type=int, default=SERVER_CONFIG["port"])
+    parser.add_argument("--data-dir", default=STORAGE_CONFIG["data_dir"])
+    parser.add_argument("--storage-mode", default=STORAGE_CONFIG["storage_mode"])
+    parser.add_argument("--session-store", choices=["memory", "sqlite"], default=SERVER_CONFIG["session_store"])
+    args = parser.parse_args(argv)
+
+    try:
+        server = build_server(args.storage_mode, args.data_dir, args.session_store)
+    except RuntimeError as e:
+        print(f"Error starting server: {str(e)}")
+        return
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Tests for the recruiter search index (utils/candidate_search.py)
+"""
+
+import pytest
+
+from utils.candidate_search import CandidateSearchIndex
+
+
+def _candidate(candidate_id, techs, years, position, location):
+    return {
+        "candidate_id": candidate_id,
+        "tech_stack": techs,
+        "years_of_experience": years,
+        "desired_position": position,
+        "current_location": location,
+    }
+
+
+@pytest.fixture(scope="module")
+def index():
+    index = CandidateSearchIndex()
+    index.on_records_saved([
+        _candidate("a", ["PostgreSQL", "Kubernetes"], "5", "Backend Engineer", "Berlin"),
+        _candidate("b", ["PostgreSQL", "Kubernetes"], "2", "Backend Engineer", "Berlin"),
+        _candidate("c", ["PostgreSQL", "Kubernetes"], "6", "SRE", "London"),
+        _candidate("d", ["Rust"], "4", "Systems Engineer", "Leeds"),
+    ])
+    return index
+
+
+def test_docstring_query(index):
+    assert index.search_query("postgresql AND kubernetes, 3+ years, Berlin") == (["a"], [])
+
+
+def test_prefixed_location(index):
+    assert index.search_query("postgresql, in London") == (["c"], [])
+
+
+def test_indexed_tech_outside_the_question_bank(index):
+    assert index.search_query("Rust") == (["d"], [])
+
+
+def test_unprefixed_position(index):
+    assert index.search_query("kubernetes, SRE") == (["c"], [])
+
+
+def test_term_matching_nothing_is_reported(index):
+    assert index.search_query("postgresql, Cobol") == ([], ["Cobol"])
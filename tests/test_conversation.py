@@ -0,0 +1,42 @@
+"""
+Tests for the screening conversation engine (utils/conversation.py)
+"""
+
+import pytest
+
+from utils.conversation import ConversationEngine
+from utils.tech_stack_questions import TechStackQuestionGenerator
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return ConversationEngine(TechStackQuestionGenerator())
+
+
+def test_full_introduction_at_greeting_fills_every_field(engine):
+    state, _ = engine.start()
+    state, _ = engine.step(
+        state, "I'm Jane Doe, jane@x.io, +44 7700 900123, 5 years, backend engineer in Leeds"
+    )
+
+    assert state.stage == "collecting_tech_stack"
+    assert state.candidate_data["full_name"] == "Jane Doe"
+    assert state.candidate_data["email"] == "jane@x.io"
+    assert state.candidate_data["current_location"] == "Leeds"
+
+
+def test_ready_at_greeting_is_not_a_name(engine):
+    state, _ = engine.start()
+    state, _ = engine.step(state, "Yes, I'm Ready!")
+
+    assert state.stage == "collecting_name"
+    assert state.candidate_data["full_name"] is None
+
+
+def test_name_with_position_keeps_the_name(engine):
+    state, _ = engine.start()
+    state, _ = engine.step(state, "yes")
+    state, _ = engine.step(state, "Jane Doe, Software Engineer")
+
+    assert state.candidate_data["full_name"] == "Jane Doe"
+    assert state.candidate_data["desired_position"] == "Software Engineer"
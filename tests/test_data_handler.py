@@ -0,0 +1,41 @@
+"""
+Tests for DataHandler (utils/data_handler.py)
+"""
+
+import threading
+
+from utils.data_handler import DataHandler
+
+
+def _candidate(email):
+    return {
+        "full_name": "Jane Doe",
+        "email": email,
+        "phone": "+44 7700 900123",
+        "years_of_experience": "5",
+        "desired_position": "Backend Engineer",
+        "current_location": "Leeds",
+        "tech_stack": ["Python"],
+        "technical_responses": [],
+    }
+
+
+def test_erasure_fails_instead_of_hanging_on_a_stuck_writer(tmp_path):
+    data_handler = DataHandler(data_dir=str(tmp_path))
+    data_handler.ERASURE_FLUSH_TIMEOUT = 0.2
+    release = threading.Event()
+    append_records = data_handler.store.append_records
+
+    def stuck_append(records):
+        release.wait()
+        append_records(records)
+
+    data_handler.store.append_records = stuck_append
+    data_handler.save_candidate_data_async(_candidate("jane@x.io"))
+
+    assert data_handler.delete_candidates(["jane@x.io"]) == (False, {})
+
+    release.set()
+    assert data_handler.flush(5)
+    assert data_handler.delete_candidates(["jane@x.io"]) == (True, {"jane@x.io": 1})
+    data_handler.close()
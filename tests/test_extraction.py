@@ -0,0 +1,31 @@
+"""
+Tests for single-pass profile extraction (utils/extraction.py)
+"""
+
+import pytest
+
+from utils.extraction import CandidateInfoExtractor
+
+
+@pytest.fixture
+def extractor():
+    return CandidateInfoExtractor()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Senior Engineer at Google", {"desired_position": "Senior Engineer"}),
+    ("Software developer at Microsoft in London",
+     {"desired_position": "Software developer", "current_location": "London"}),
+    ("backend engineer in Leeds", {"desired_position": "backend engineer", "current_location": "Leeds"}),
+])
+def test_employer_is_not_taken_as_location(extractor, text, expected):
+    assert extractor.extract(text) == expected
+
+
+@pytest.mark.parametrize("text", ["I'm Looking Forward to this", "I'm Very Excited", "Yes, I'm Ready!"])
+def test_casual_phrases_are_not_names(extractor, text):
+    assert "full_name" not in extractor.extract(text)
+
+
+def test_casual_name(extractor):
+    assert extractor.extract("I'm Jane van Dijk") == {"full_name": "Jane van Dijk"}
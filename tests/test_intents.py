@@ -0,0 +1,39 @@
+"""
+Tests for control intent matching (utils/intents.py)
+"""
+
+import pytest
+
+from utils.intents import IntentMatcher
+
+
+@pytest.fixture
+def matcher():
+    return IntentMatcher()
+
+
+@pytest.mark.parametrize("text", [
+    "exit", "Bye!", "ok, quit", "no thanks, bye", "bye bye", "Bye bye!", "Thank you, goodbye!", "thanks! bye",
+])
+@pytest.mark.parametrize("stage", ["greeting", "collecting_location", "asking_technical_questions"])
+def test_exit_phrasings(matcher, text, stage):
+    assert matcher.match(text, stage) == "exit"
+
+
+@pytest.mark.parametrize("text, stage", [
+    ("I just quit my job in Leeds", "collecting_location"),
+    ("stop@example.io", "collecting_email"),
+    ("I would stop the container, inspect the logs and then restart it.", "asking_technical_questions"),
+    ("We ran non-stop deployments behind a blue-green load balancer.", "asking_technical_questions"),
+    ("no thanks", "collecting_position"),
+])
+def test_answers_mentioning_exit_words_do_not_exit(matcher, text, stage):
+    assert matcher.match(text, stage) is None
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("skip", "skip"), ("please repeat the question", "repeat"), ("go back", "back"),
+])
+def test_question_intents_only_during_technical_questions(matcher, text, intent):
+    assert matcher.match(text, "asking_technical_questions") == intent
+    assert matcher.match(text, "collecting_name") is None
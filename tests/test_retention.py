@@ -0,0 +1,23 @@
+"""
+Tests for the retention purger (utils/retention.py)
+"""
+
+from utils.process_lock import lock_data_dir
+from utils.retention import main as retention_main
+
+
+def test_cli_refuses_while_another_process_holds_the_data_dir(tmp_path, capsys):
+    process_lock = lock_data_dir(str(tmp_path))
+    try:
+        retention_main(["--data-dir", str(tmp_path), "--storage-mode", "journal"])
+    finally:
+        process_lock.close()
+
+    assert "Another server or maintenance command" in capsys.readouterr().out
+    assert not (tmp_path / "candidates.meta.json").exists()
+
+
+def test_cli_runs_once_the_data_dir_is_free(tmp_path, capsys):
+    retention_main(["--data-dir", str(tmp_path), "--storage-mode", "journal"])
+
+    assert '"purged": 0' in capsys.readouterr().out
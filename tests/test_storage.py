@@ -0,0 +1,201 @@
+"""
+Tests for the candidate storage backends (utils/storage.py)
+"""
+
+import json
+import os
+import threading
+
+import pytest
+
+from utils.data_handler import DataHandler
+from utils.retention import RetentionPurger
+from utils.storage import JournalStore, SqliteStore, create_store, main as storage_main
+
+STORAGE_MODES = ("json", "journal", "sqlite")
+
+
+def _record(number, timestamp="2026-01-01T00:00:00"):
+    return {
+        "candidate_id": f"c{number:03d}",
+        "submission_timestamp": timestamp,
+        "data_retention_until": "2030-01-01T00:00:00",
+        "status": "screening_completed",
+    }
+
+
+def test_journal_append_after_torn_tail_keeps_every_record(tmp_path):
+    store = JournalStore(str(tmp_path))
+    store.append_records([_record(1)])
+
+    # A crash mid-append leaves a partial last line
+    with open(store.journal_file, 'ab') as f:
+        f.write(b'{"op": "put", "record": {"candidate_id": "torn"')
+
+    store = JournalStore(str(tmp_path))
+    store.append_records([_record(2)])
+
+    store = JournalStore(str(tmp_path))
+    assert [r["candidate_id"] for r in store.read_all()] == ["c001", "c002"]
+    assert store.find("c002") == [_record(2)]
+    assert store.metadata()["total_candidates"] == 2
+
+    assert store.snapshot() == 2
+    store = JournalStore(str(tmp_path))
+    assert [r["candidate_id"] for r in store.read_all()] == ["c001", "c002"]
+
+
+def _write_json_store(data_dir, records):
+    path = os.path.join(data_dir, "candidates.json")
+    with open(path, 'w') as f:
+        json.dump({"candidates": records, "metadata": {"created_at": "2025-01-01T00:00:00"}}, f)
+    return path
+
+
+def test_sqlite_store_does_not_migrate_on_open(tmp_path):
+    json_file = _write_json_store(str(tmp_path), [_record(1)])
+
+    store = SqliteStore(str(tmp_path))
+
+    assert store.read_all() == []
+    assert os.path.exists(json_file)
+    store.close()
+
+
+def test_sqlite_migration_keeps_the_json_file_as_migrated_copy(tmp_path):
+    json_file = _write_json_store(str(tmp_path), [_record(1), _record(2)])
+    store = SqliteStore(str(tmp_path))
+
+    assert store.migrate_from_json(json_file) == 2
+    assert [r["candidate_id"] for r in store.read_all()] == ["c001", "c002"]
+    assert not os.path.exists(json_file)
+    assert os.path.exists(json_file + ".migrated")
+
+    # A second run (e.g. after a json-mode app recreated the file) imports nothing
+    _write_json_store(str(tmp_path), [_record(3)])
+    assert store.migrate_from_json(json_file) == 0
+    assert os.path.exists(json_file)
+    assert len(store.read_all()) == 2
+    store.close()
+
+
+def test_sqlite_migration_cli_shreds_only_when_asked(tmp_path):
+    json_file = _write_json_store(str(tmp_path), [_record(1)])
+    with open(json_file + ".migrated", 'w') as f:
+        f.write("{}")
+
+    storage_main(["--data-dir", str(tmp_path), "--shred"])
+
+    assert not os.path.exists(json_file)
+    assert not os.path.exists(json_file + ".migrated")
+    store = SqliteStore(str(tmp_path))
+    assert [r["candidate_id"] for r in store.read_all()] == ["c001"]
+    store.close()
+
+
+@pytest.fixture(params=STORAGE_MODES)
+def store(request, tmp_path):
+    store = create_store(request.param, str(tmp_path), snapshot_interval=5)
+    yield store
+    if hasattr(store, "close"):
+        store.close()
+
+
+def _upsert_record(number, session_token, content_hash):
+    record = _record(number)
+    record.update(session_token=session_token, content_hash=content_hash)
+    return record
+
+
+def test_upsert_skips_identical_content_and_versions_changes(store):
+    first = store.upsert_records([_upsert_record(1, "s1", "h1")])
+    repeat = store.upsert_records([_upsert_record(1, "s1", "h1")])
+    changed = store.upsert_records([_upsert_record(1, "s1", "h2")])
+
+    assert [r["written"] for r in first + repeat + changed] == [True, False, True]
+    assert changed[0]["version"] == 2
+    assert [r["version"] for r in store.find("c001")] == [2]
+    assert len(store.read_all()) == 1
+
+
+def test_upsert_batch_with_the_same_candidate_twice_keeps_one_record(store):
+    results = store.upsert_records([_upsert_record(1, "s1", "h1"), _upsert_record(1, "s1", "h1")])
+
+    assert [r["written"] for r in results] == [True, False]
+    assert len(store.find("c001")) == 1
+
+
+def _page_through(store, appends):
+    """Read one record per page, committing more records between pages"""
+    seen = []
+    cursor = None
+    page = 0
+    while True:
+        records = store.iter_records(cursor=cursor)
+        entry = next(records, None)
+        records.close()
+        if entry is None:
+            return seen
+        seen.append(entry[0]["candidate_id"])
+        cursor = entry[1]
+        page += 1
+        for number, timestamp in appends.get(page, ()):
+            store.append_records([_record(number, timestamp)])
+
+
+def test_cursor_pagination_sees_each_record_once(store):
+    store.append_records([_record(1, "2026-01-01T00:00:02")])
+    store.append_records([_record(2, "2026-01-01T00:00:01")])
+    store.append_records([_record(3, "2026-01-01T00:00:03")])
+
+    # Committed mid-pagination; enough records to trigger journal snapshots
+    appends = {
+        2: [(n, f"2026-01-01T00:00:{n:02d}") for n in range(10, 17)],
+        5: [(n, f"2026-01-01T00:00:{n:02d}") for n in range(20, 27)],
+    }
+    seen = _page_through(store, appends)
+
+    assert sorted(seen) == sorted({r["candidate_id"] for r in store.read_all()})
+    assert len(seen) == 17
+
+
+def test_purge_expired_removes_only_expired_records_in_batches(store):
+    records = [_record(n) for n in range(1, 6)]
+    for n, record in enumerate(records, start=1):
+        record["data_retention_until"] = f"2026-01-0{n}T00:00:00"
+    store.append_records(records)
+
+    assert sorted(store.purge_expired("2026-01-03T12:00:00", 2)) == ["c001", "c002"]
+    assert store.purge_expired("2026-01-03T12:00:00", 2) == ["c003"]
+    assert store.purge_expired("2026-01-03T12:00:00", 2) == []
+    assert sorted(r["candidate_id"] for r in store.read_all()) == ["c004", "c005"]
+
+
+def test_concurrent_appends_are_all_kept(store):
+    def append(worker):
+        for n in range(25):
+            store.append_records([_record(worker * 100 + n)])
+
+    threads = [threading.Thread(target=append, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({r["candidate_id"] for r in store.read_all()}) == 200
+
+
+@pytest.mark.parametrize("storage_mode", STORAGE_MODES)
+def test_retention_purger_works_through_every_batch(tmp_path, storage_mode):
+    data_handler = DataHandler(data_dir=str(tmp_path), storage_mode=storage_mode)
+    records = [_record(n) for n in range(1, 8)]
+    for record in records:
+        record["data_retention_until"] = "2026-01-01T00:00:00"
+    data_handler.store.append_records(records + [_record(8)])
+
+    report = RetentionPurger(data_handler, batch_size=3).purge(now="2026-06-01T00:00:00")
+
+    assert report["purged"] == 7
+    assert report["batches"] == 3
+    assert [r["candidate_id"] for r in data_handler.get_all_candidates()] == ["c008"]
+    data_handler.close()
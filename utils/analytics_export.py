@@ -0,0 +1,486 @@
+"""
+Analytics Export - Columnar (Parquet/Feather) export of completed screenings
+Flattens candidate records into tables that hiring analytics can aggregate directly:
+
+    python -m utils.analytics_export --data-dir data
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+
+# Direct identifiers, location and per-session linkage never leave the candidate store
+EXCLUDED_FIELDS = ("full_name", "email", "phone", "current_location", "session_token", "content_hash")
+EXPORT_SUFFIXES = (".parquet", ".feather")
+
+
+def _read_part(path, columns=None):
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_feather(path, columns=columns)
+
+
+def _write_part(frame, path):
+    tmp_path = path + ".tmp"
+    if path.endswith(".parquet"):
+        frame.to_parquet(tmp_path, index=False)
+    else:
+        frame.reset_index(drop=True).to_feather(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _part_paths(directory):
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, f) for f in sorted(os.listdir(directory)) if f.endswith(EXPORT_SUFFIXES)]
+
+
+def prune_export(export_dir, candidate_ids=None, expired_before=None):
+    """
+    Remove erased or expired candidates from exported part files
+
+    Only part files that contain affected rows are rewritten (or deleted
+    once empty). Called by DataHandler after erasures and retention purges,
+    and by every export run for changes made by other processes.
+
+    Args:
+        export_dir: Export directory
+        candidate_ids: Candidate IDs whose rows are removed (None: any candidate)
+        expired_before: If set, only rows whose data_retention_until is before
+            this ISO timestamp are removed
+
+    Returns:
+        Number of rows removed across all tables
+    """
+    if candidate_ids is not None:
+        candidate_ids = set(candidate_ids)
+        if not candidate_ids:
+            return 0
+    if candidate_ids is None and expired_before is None:
+        raise ValueError("prune_export needs candidate_ids or expired_before")
+
+    removed = 0
+    # (candidate_id, submission_timestamp) of removed candidate rows, for the child tables
+    removed_keys = set()
+
+    for path in _part_paths(os.path.join(export_dir, "candidates")):
+        columns = ["candidate_id", "submission_timestamp", "data_retention_until"]
+        keys = _read_part(path, columns=columns if expired_before is not None else columns[:2])
+        mask = pd.Series(True, index=keys.index)
+        if candidate_ids is not None:
+            mask &= keys["candidate_id"].isin(candidate_ids)
+        if expired_before is not None:
+            mask &= keys["data_retention_until"] < pd.Timestamp(expired_before)
+        if not mask.any():
+            continue
+
+        removed_keys.update(zip(keys.loc[mask, "candidate_id"], keys.loc[mask, "submission_timestamp"]))
+        removed += _rewrite(path, mask)
+
+    for table in ("tech_stack", "technical_responses"):
+        for path in _part_paths(os.path.join(export_dir, table)):
+            keys = _read_part(path, columns=["candidate_id", "submission_timestamp"])
+            if expired_before is None:
+                mask = keys["candidate_id"].isin(candidate_ids)
+            else:
+                mask = pd.Series(
+                    [key in removed_keys for key in zip(keys["candidate_id"], keys["submission_timestamp"])],
+                    index=keys.index, dtype=bool
+                )
+            if not mask.any():
+                continue
+            removed += _rewrite(path, mask)
+
+    return removed
+
+
+def _rewrite(path, mask):
+    # Drops the masked rows from a part file; returns how many were dropped
+    remaining = _read_part(path)[~mask.values]
+    if remaining.empty:
+        os.remove(path)
+    else:
+        _write_part(remaining, path)
+    return int(mask.sum())
+
+
+def latest_versions(frame):
+    """Keep only the newest submission of every candidate (resubmissions are versions, not new candidates)"""
+    if frame.empty or "candidate_id" not in frame:
+        return frame
+    return frame.sort_values("submission_timestamp", kind="stable").drop_duplicates("candidate_id", keep="last")
+
+
+class AnalyticsExporter:
+    """
+    Exports candidate records into three columnar tables:
+
+    - candidates: one row per record (pseudonymous candidate_id, no contact details or location)
+    - tech_stack: one row per declared technology
+    - technical_responses: one row per answered question (question and answer length)
+
+    Each run appends only the records submitted since the previous export
+    as new part files, so the cost of an export does not grow with the
+    size of the store. Erased and expired candidates are pruned from the
+    part files; aggregations count each candidate's newest submission once.
+    """
+
+    FORMATS = {"parquet": ".parquet", "feather": ".feather"}
+    TABLES = ("candidates", "tech_stack", "technical_responses")
+
+    def __init__(self, data_handler, export_dir=None, file_format="parquet", chunk_size=10000,
+                 question_generator=None, lag_seconds=300):
+        """
+        Args:
+            data_handler: DataHandler to export from
+            export_dir: Output directory (defaults to <data_dir>/analytics)
+            file_format: "parquet" or "feather"
+            chunk_size: Records flattened per part file, bounding memory use
+            question_generator: Optional TechStackQuestionGenerator used to normalize tech names
+            lag_seconds: Records newer than this are left for the next run, so submissions
+                still queued in the background writer are not skipped by the watermark
+        """
+        if file_format not in self.FORMATS:
+            raise ValueError(f"Unknown export format: {file_format}")
+
+        self.data_handler = data_handler
+        self.export_dir = export_dir or os.path.join(data_handler.data_dir, "analytics")
+        self.file_format = file_format
+        self.chunk_size = chunk_size
+        self.question_generator = question_generator
+        self.lag_seconds = lag_seconds
+        self.state_file = os.path.join(self.export_dir, "export_state.json")
+
+        for table in self.TABLES:
+            os.makedirs(os.path.join(self.export_dir, table), exist_ok=True)
+
+    # ----- export --------------------------------------------------------
+
+    def export(self, full=False):
+        """
+        Export new records (or everything when `full` is set)
+
+        Args:
+            full: Ignore the watermark and re-export every record into fresh files
+
+        Returns:
+            Report dictionary with exported row counts and the new watermark
+        """
+        if full:
+            self._clear()
+        state = self._read_state()
+        pruned = self._apply_removals(state)
+        watermark = state.get("watermark")
+        watermark_ids = set(state.get("watermark_ids", []))
+
+        rows = {table: 0 for table in self.TABLES}
+        chunk = []
+        until = (datetime.now() - timedelta(seconds=self.lag_seconds)).isoformat()
+
+        for record in self.data_handler.iter_candidates(since=watermark, until=until):
+            submitted = record.get("submission_timestamp") or ""
+            if submitted == watermark and record.get("candidate_id") in watermark_ids:
+                continue
+
+            chunk.append(record)
+            if submitted > (state.get("watermark") or ""):
+                state["watermark"] = submitted
+                state["watermark_ids"] = []
+            if submitted == state.get("watermark"):
+                state["watermark_ids"].append(record.get("candidate_id"))
+
+            if len(chunk) >= self.chunk_size:
+                self._write_chunk(chunk, state, rows)
+                chunk = []
+
+        if chunk:
+            self._write_chunk(chunk, state, rows)
+
+        state["last_export"] = datetime.now().isoformat()
+        self._write_state(state)
+
+        return {
+            "rows": rows,
+            "pruned_rows": pruned,
+            "watermark": state.get("watermark"),
+            "parts": state.get("parts", 0),
+        }
+
+    def _apply_removals(self, state):
+        """
+        Catch up on erasures and expiries made since the last run
+
+        DataHandler prunes the default export directory itself; this covers
+        other export directories and changes made by other processes. New
+        erasure audit entries are read from the last offset, and expired
+        rows are dropped at most once a day.
+        """
+        pruned = 0
+        audit_file = self.data_handler.erasure_audit_file
+        offset = state.get("audit_offset", 0)
+        if os.path.exists(audit_file):
+            if os.path.getsize(audit_file) < offset:
+                offset = 0
+            erased = set()
+            with open(audit_file, 'r') as f:
+                f.seek(offset)
+                for line in f:
+                    if line.endswith("\n"):
+                        erased.update(json.loads(line).get("erased_ids", []))
+                        offset += len(line.encode())
+            if erased:
+                pruned += prune_export(self.export_dir, erased)
+        state["audit_offset"] = offset
+
+        now = datetime.now()
+        last_prune = state.get("last_retention_prune")
+        if last_prune is None or now - datetime.fromisoformat(last_prune) >= timedelta(days=1):
+            pruned += prune_export(self.export_dir, expired_before=now.isoformat())
+            state["last_retention_prune"] = now.isoformat()
+
+        self._write_state(state)
+        return pruned
+
+    def prune(self, candidate_ids=None, expired_before=None):
+        """Remove erased or expired candidates from this export (see prune_export)"""
+        return prune_export(self.export_dir, candidate_ids, expired_before)
+
+    def _write_chunk(self, records, state, rows):
+        tables = self.flatten(records)
+        part = state.get("parts", 0) + 1
+
+        for table, frame in tables.items():
+            if frame.empty:
+                continue
+            path = os.path.join(self.export_dir, table, f"part-{part:05d}{self.FORMATS[self.file_format]}")
+            _write_part(frame, path)
+            rows[table] += len(frame)
+
+        state["parts"] = part
+        # Persist after every part so a crash mid-export does not re-export finished chunks
+        self._write_state(state)
+
+    def flatten(self, records):
+        """
+        Flatten candidate records into columnar tables
+
+        Args:
+            records: List of candidate record dictionaries
+
+        Returns:
+            Dictionary of table name -> DataFrame
+        """
+        candidates = []
+        techs = []
+        responses = []
+
+        for record in records:
+            candidate_id = record.get("candidate_id")
+            submitted = record.get("submission_timestamp")
+            stack = record.get("tech_stack") or []
+            answers = record.get("technical_responses") or []
+
+            row = {
+                key: value for key, value in record.items()
+                if key not in EXCLUDED_FIELDS and not isinstance(value, (list, dict))
+            }
+            row["tech_count"] = len(stack)
+            row["responses_count"] = len(answers)
+            candidates.append(row)
+
+            for tech in stack:
+                techs.append({
+                    "candidate_id": candidate_id,
+                    "submission_timestamp": submitted,
+                    "tech": tech,
+                    "tech_normalized": self._normalize(tech),
+                })
+
+            for position, response in enumerate(answers):
+                responses.append({
+                    "candidate_id": candidate_id,
+                    "submission_timestamp": submitted,
+                    "question_index": position,
+                    "question": response.get("question"),
+                    "answer_length": len(response.get("answer") or ""),
+                })
+
+        frames = {
+            "candidates": pd.DataFrame(candidates),
+            "tech_stack": pd.DataFrame(techs),
+            "technical_responses": pd.DataFrame(responses),
+        }
+
+        candidates_frame = frames["candidates"]
+        if not candidates_frame.empty:
+            if "years_of_experience" in candidates_frame:
+                candidates_frame["years_of_experience"] = pd.to_numeric(
+                    candidates_frame["years_of_experience"].astype(str).str.extract(r"(\d+(?:\.\d+)?)")[0],
+                    errors="coerce"
+                )
+            for column in ("submission_timestamp", "consent_timestamp", "data_retention_until"):
+                if column in candidates_frame:
+                    candidates_frame[column] = pd.to_datetime(candidates_frame[column], errors="coerce")
+
+        for name in ("tech_stack", "technical_responses"):
+            if not frames[name].empty:
+                frames[name]["submission_timestamp"] = pd.to_datetime(
+                    frames[name]["submission_timestamp"], errors="coerce"
+                )
+
+        return frames
+
+    def _normalize(self, tech):
+        if self.question_generator is not None:
+            return self.question_generator.normalize_tech_name(tech)
+        return tech.lower().strip()
+
+    # ----- reading and aggregation --------------------------------------
+
+    def load(self, table, columns=None):
+        """
+        Load an exported table
+
+        Args:
+            table: "candidates", "tech_stack" or "technical_responses"
+            columns: Optional subset of columns to read
+
+        Returns:
+            DataFrame with every exported part
+        """
+        suffix = self.FORMATS[self.file_format]
+        paths = [path for path in _part_paths(os.path.join(self.export_dir, table)) if path.endswith(suffix)]
+        if not paths:
+            return pd.DataFrame(columns=columns)
+        return pd.concat([_read_part(path, columns=columns) for path in paths], ignore_index=True)
+
+    def load_latest(self, table, columns=None):
+        """
+        Load an exported table restricted to every candidate's newest submission
+
+        A resubmitted screening is exported once per version; aggregations
+        count each candidate once.
+
+        Args:
+            table: "candidates", "tech_stack" or "technical_responses"
+            columns: Optional subset of columns to return
+
+        Returns:
+            DataFrame
+        """
+        keys = ["candidate_id", "submission_timestamp"]
+        wanted = None if columns is None else list(dict.fromkeys(keys + list(columns)))
+        if table == "candidates":
+            frame = latest_versions(self.load(table, columns=wanted))
+            return frame if columns is None else frame[list(columns)]
+
+        latest = latest_versions(self.load("candidates", columns=keys))[keys]
+        frame = self.load(table, columns=wanted)
+        if frame.empty or latest.empty:
+            return frame if columns is None else frame.reindex(columns=list(columns))
+        frame = frame.merge(latest, on=keys, how="inner")
+        return frame if columns is None else frame[list(columns)]
+
+    def top_tech_stacks(self, n=10):
+        """
+        Most frequently declared technologies
+
+        Returns:
+            Series of candidate counts indexed by normalized technology
+        """
+        techs = self.load_latest("tech_stack", columns=["candidate_id", "tech_normalized"])
+        if techs.empty:
+            return pd.Series(dtype="int64")
+        return techs.drop_duplicates()["tech_normalized"].value_counts().head(n)
+
+    def experience_distribution(self, bins=(0, 1, 3, 5, 8, 12, 50)):
+        """
+        Candidates per years-of-experience band
+
+        Returns:
+            Series of candidate counts indexed by experience interval
+        """
+        candidates = self.load_latest("candidates", columns=["years_of_experience"])
+        if candidates.empty:
+            return pd.Series(dtype="int64")
+        bands = pd.cut(candidates["years_of_experience"], bins=list(bins), right=False)
+        return bands.value_counts(sort=False)
+
+    def completions_by_day(self):
+        """
+        Completed screenings per day
+
+        Returns:
+            Series of counts indexed by submission date
+        """
+        candidates = self.load_latest("candidates", columns=["submission_timestamp", "status"])
+        if candidates.empty:
+            return pd.Series(dtype="int64")
+        completed = candidates[candidates["status"] == "screening_completed"]
+        return completed.groupby(completed["submission_timestamp"].dt.date).size()
+
+    # ----- state ---------------------------------------------------------
+
+    def _read_state(self):
+        if not os.path.exists(self.state_file):
+            return {}
+        with open(self.state_file, 'r') as f:
+            return json.load(f)
+
+    def _write_state(self, state):
+        tmp_path = self.state_file + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def _clear(self):
+        for table in self.TABLES:
+            directory = os.path.join(self.export_dir, table)
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+        if os.path.exists(self.state_file):
+            os.remove(self.state_file)
+
+
+def main(argv=None):
+    """Command-line entry point: run one export and print its report"""
+    from config.settings import STORAGE_CONFIG
+    from utils.data_handler import DataHandler
+    from utils.process_lock import lock_for_storage_mode
+    from utils.tech_stack_questions import TechStackQuestionGenerator
+
+    parser = argparse.ArgumentParser(description="Export screenings to columnar files for analytics")
+    parser.add_argument("--data-dir", default=STORAGE_CONFIG["data_dir"])
+    parser.add_argument("--storage-mode", default=STORAGE_CONFIG["storage_mode"])
+    parser.add_argument("--export-dir", default=None)
+    parser.add_argument("--format", choices=sorted(AnalyticsExporter.FORMATS), default="parquet")
+    parser.add_argument("--full", action="store_true", help="Re-export every record")
+    args = parser.parse_args(argv)
+
+    # Opening a json/journal store can rewrite its index under a running app or server
+    try:
+        process_lock = lock_for_storage_mode(args.data_dir, args.storage_mode)
+    except RuntimeError as e:
+        print(f"Error exporting analytics: {str(e)}")
+        return
+
+    try:
+        data_handler = DataHandler(data_dir=args.data_dir, storage_mode=args.storage_mode)
+        exporter = AnalyticsExporter(
+            data_handler,
+            export_dir=args.export_dir,
+            file_format=args.format,
+            question_generator=TechStackQuestionGenerator()
+        )
+        print(json.dumps(exporter.export(full=args.full), indent=2))
+    finally:
+        if process_lock is not None:
+            process_lock.close()
+
+
+if __name__ == "__main__":
+    main()
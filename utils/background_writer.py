@@ -0,0 +1,180 @@
+"""
+Background Writer - Group-commit write path for candidate submissions
+Submissions are queued and committed in batches by a single writer thread
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+
+
+class BackgroundWriter:
+    """
+    Drains a bounded queue of pending writes and commits them in batches
+
+    Every pending write gets a Future that resolves once its batch has been
+    committed, so callers can return immediately and check durability later.
+    """
+
+    _STOP = object()
+
+    def __init__(self, commit_batch, max_queue=1000, max_batch=64, max_delay=0.02):
+        """
+        Args:
+            commit_batch: Callable taking a list of items and committing them in one write;
+                returns one result per item
+            max_queue: Maximum number of writes waiting in the queue
+            max_batch: Maximum number of writes committed together
+            max_delay: Seconds to wait for more writes before committing a partial batch
+        """
+        self.commit_batch = commit_batch
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._condition = threading.Condition()
+        self._pending = 0
+        self._thread = None
+        self._closed = False
+        self.stats = {
+            "submitted": 0,
+            "committed": 0,
+            "failed": 0,
+            "batches": 0,
+            "last_commit_at": None,
+            "last_error": None,
+        }
+
+    def start(self):
+        """Start the writer thread if it is not running yet"""
+        with self._condition:
+            if self._thread is None or not self._thread.is_alive():
+                self._closed = False
+                self._thread = threading.Thread(target=self._run, name="candidate-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, item, timeout=1.0):
+        """
+        Queue an item for the next batch
+
+        Args:
+            item: Item passed to commit_batch
+            timeout: Seconds to wait for queue space
+
+        Returns:
+            Future resolved with the item's commit result
+
+        Raises:
+            queue.Full: If the queue stayed full for `timeout` seconds
+            RuntimeError: If the writer has been closed
+        """
+        if self._closed:
+            raise RuntimeError("Background writer is closed")
+        self.start()
+
+        future = Future()
+        with self._condition:
+            self._pending += 1
+            self.stats["submitted"] += 1
+
+        try:
+            self._queue.put((item, future), timeout=timeout)
+        except queue.Full:
+            with self._condition:
+                self._pending -= 1
+                self.stats["submitted"] -= 1
+                self._condition.notify_all()
+            raise
+
+        return future
+
+    def flush(self, timeout=None):
+        """
+        Wait until every queued write has been committed
+
+        Args:
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            True if nothing is pending anymore
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._pending > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def close(self, timeout=10.0):
+        """Flush pending writes and stop the writer thread"""
+        if self._thread is None or self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        self._queue.put((self._STOP, None))
+        self._thread.join(timeout)
+
+    def status(self):
+        """
+        Report durability status of the write path
+
+        Returns:
+            Dictionary with pending count, commit counters and last error
+        """
+        with self._condition:
+            status = dict(self.stats)
+            status["pending"] = self._pending
+            status["running"] = self._thread is not None and self._thread.is_alive()
+            return status
+
+    def _run(self):
+        while True:
+            item, future = self._queue.get()
+            if item is self._STOP:
+                return
+
+            batch = [(item, future)]
+            deadline = time.monotonic() + self.max_delay
+            stop = False
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        next_item = self._queue.get(timeout=remaining)
+                    else:
+                        next_item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if next_item[0] is self._STOP:
+                    stop = True
+                    break
+                batch.append(next_item)
+
+            self._commit(batch)
+            if stop:
+                return
+
+    def _commit(self, batch):
+        try:
+            results = self.commit_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            with self._condition:
+                self.stats["failed"] += len(batch)
+                self.stats["last_error"] = str(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+            with self._condition:
+                self.stats["committed"] += len(batch)
+                self.stats["batches"] += 1
+                self.stats["last_commit_at"] = datetime.now().isoformat()
+
+        with self._condition:
+            self._pending -= len(batch)
+            self._condition.notify_all()
@@ -0,0 +1,307 @@
+"""
+Candidate Search - Inverted index over stored candidates for recruiter queries
+Supports tech stack, position, location and years-of-experience lookups
+"""
+
+import bisect
+import re
+import threading
+
+from utils.tech_stack_questions import TechStackQuestionGenerator
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9]+)*")
+YEARS_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(?:(\+)|-\s*(\d+(?:\.\d+)?))?\s*(?:years?|yrs?)", re.IGNORECASE)
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+
+def tokenize(text):
+    """Split free text into lowercase search tokens"""
+    return set(TOKEN_PATTERN.findall((text or "").lower()))
+
+
+def _years(entry):
+    return entry[0]
+
+
+def parse_years(value):
+    """
+    Read a years-of-experience value as stored by the app ("5", "3-5", "2.5 years")
+
+    Returns:
+        First number as a float, or None
+    """
+    if value is None:
+        return None
+    match = NUMBER_PATTERN.search(str(value))
+    return float(match.group(0)) if match else None
+
+
+class CandidateSearchIndex:
+    """
+    Inverted index over candidate records, keyed by candidate_id
+
+    - tech: normalized tech names (same aliases as the question generator)
+    - position / location: tokenized free text
+    - experience: sorted (years, candidate_id) list for range queries
+
+    The index is built once from the store and then kept current through
+    DataHandler change notifications. Only the latest record of each
+    candidate is indexed.
+    """
+
+    FIELDS = ("tech", "position", "location")
+
+    def __init__(self, question_generator=None):
+        self.question_generator = question_generator or TechStackQuestionGenerator()
+        self.data_handler = None
+        self.postings = {field: {} for field in self.FIELDS}
+        self.documents = {}
+        self.experience = []
+        self._lock = threading.RLock()
+
+    def attach(self, data_handler):
+        """
+        Build the index from a DataHandler's store and subscribe to its changes
+
+        Args:
+            data_handler: DataHandler to index
+
+        Returns:
+            Number of indexed candidates
+        """
+        self.data_handler = data_handler
+        data_handler.add_listener(self)
+
+        with self._lock:
+            for record in data_handler.iter_candidates():
+                self._add(record)
+            return len(self.documents)
+
+    # ----- DataHandler listener interface --------------------------------
+
+    def on_records_saved(self, records):
+        with self._lock:
+            for record in records:
+                self._add(record)
+
+    def on_candidates_removed(self, candidate_ids):
+        with self._lock:
+            for candidate_id in candidate_ids:
+                self._remove(candidate_id)
+
+    # ----- maintenance ---------------------------------------------------
+
+    def _terms(self, record):
+        techs = record.get("tech_stack") or []
+        return {
+            "tech": {self.question_generator.normalize_tech_name(t) for t in techs if t},
+            "position": tokenize(record.get("desired_position")),
+            "location": tokenize(record.get("current_location")),
+        }
+
+    def _add(self, record):
+        candidate_id = record.get("candidate_id")
+        if not candidate_id:
+            return
+
+        self._remove(candidate_id)
+
+        terms = self._terms(record)
+        years = parse_years(record.get("years_of_experience"))
+
+        for field, tokens in terms.items():
+            postings = self.postings[field]
+            for token in tokens:
+                postings.setdefault(token, set()).add(candidate_id)
+
+        if years is not None:
+            bisect.insort(self.experience, (years, candidate_id))
+
+        self.documents[candidate_id] = (terms, years)
+
+    def _remove(self, candidate_id):
+        document = self.documents.pop(candidate_id, None)
+        if document is None:
+            return
+
+        terms, years = document
+        for field, tokens in terms.items():
+            postings = self.postings[field]
+            for token in tokens:
+                ids = postings.get(token)
+                if ids is not None:
+                    ids.discard(candidate_id)
+                    if not ids:
+                        del postings[token]
+
+        if years is not None:
+            i = bisect.bisect_left(self.experience, (years, candidate_id))
+            if i < len(self.experience) and self.experience[i] == (years, candidate_id):
+                del self.experience[i]
+
+    # ----- queries -------------------------------------------------------
+
+    def search(self, techs=None, position=None, location=None,
+               min_years=None, max_years=None, match_all_techs=True):
+        """
+        Find candidates matching every given criterion
+
+        Args:
+            techs: Technology names; normalized with the question bank aliases
+            position: Free text; every token must appear in the desired position
+            location: Free text; every token must appear in the current location
+            min_years: Minimum years of experience (inclusive)
+            max_years: Maximum years of experience (inclusive)
+            match_all_techs: Require every technology (AND) instead of any (OR)
+
+        Returns:
+            Sorted list of matching candidate IDs
+        """
+        with self._lock:
+            sets = []
+
+            if techs:
+                names = {self.question_generator.normalize_tech_name(t) for t in techs}
+                tech_sets = [self.postings["tech"].get(name, set()) for name in names]
+                if match_all_techs:
+                    sets.extend(tech_sets)
+                else:
+                    sets.append(set().union(*tech_sets))
+
+            for field, text in (("position", position), ("location", location)):
+                if text:
+                    sets.extend(self.postings[field].get(token, set()) for token in tokenize(text))
+
+            if min_years is not None or max_years is not None:
+                lo = 0 if min_years is None else bisect.bisect_left(self.experience, min_years, key=_years)
+                hi = len(self.experience) if max_years is None else bisect.bisect_right(
+                    self.experience, max_years, key=_years
+                )
+                sets.append({candidate_id for _, candidate_id in self.experience[lo:hi]})
+
+            if not sets:
+                return sorted(self.documents)
+
+            # Intersect starting from the rarest term
+            sets.sort(key=len)
+            result = set(sets[0])
+            for other in sets[1:]:
+                if not result:
+                    break
+                result &= other
+
+            return sorted(result)
+
+    def search_query(self, query):
+        """
+        Run a recruiter query such as "postgresql AND kubernetes, 3+ years, Berlin"
+
+        Comma-separated parts are combined with AND. A part with a years
+        expression sets the experience range ("3+ years", "2-5 years",
+        "4 years"); "in"/"location:" sets the location and "position:" the
+        position; any other part lists technologies, joined by AND/OR.
+        A term that is neither in the question bank nor in any indexed tech
+        stack is searched as a location, or else a position, if every one
+        of its tokens is indexed there ("Berlin"). Terms that match nothing
+        at all are reported back.
+
+        Args:
+            query: Query string
+
+        Returns:
+            (sorted list of matching candidate IDs, list of unknown terms)
+        """
+        criteria = parse_query(query)
+        unknown = []
+        techs = []
+        with self._lock:
+            for tech in criteria.get("techs", ()):
+                name = self.question_generator.normalize_tech_name(tech)
+                if name in self.postings["tech"] or name in self.question_generator.question_bank:
+                    techs.append(tech)
+                    continue
+                field = self._field_of(tech)
+                if field is None:
+                    # Kept as a technology, so the query matches nothing as written
+                    techs.append(tech)
+                    unknown.append(tech)
+                else:
+                    criteria[field] = " ".join(filter(None, (criteria.get(field), tech)))
+        if techs:
+            criteria["techs"] = techs
+        else:
+            criteria.pop("techs", None)
+        return self.search(**criteria), unknown
+
+    def _field_of(self, term):
+        """Location or position whose index holds every token of a term, else None"""
+        tokens = tokenize(term)
+        for field in ("location", "position"):
+            if tokens and all(token in self.postings[field] for token in tokens):
+                return field
+        return None
+
+    def search_records(self, **criteria):
+        """
+        Run search() and load the latest stored record of each match
+
+        Returns:
+            List of candidate dictionaries
+        """
+        records = []
+        for candidate_id in self.search(**criteria):
+            matches = self.data_handler.store.find(candidate_id)
+            if matches:
+                records.append(matches[-1])
+        return records
+
+
+def parse_query(query):
+    """
+    Turn a recruiter query string into CandidateSearchIndex.search() arguments
+
+    Args:
+        query: Query string, e.g. "postgresql AND kubernetes, 3+ years, Berlin"
+
+    Returns:
+        Dictionary of search() keyword arguments
+    """
+    criteria = {}
+    techs = []
+
+    for part in (p.strip() for p in query.split(",")):
+        if not part:
+            continue
+        lowered = part.lower()
+
+        years = YEARS_PATTERN.search(part)
+        if years:
+            low, plus, high = years.groups()
+            criteria["min_years"] = float(low)
+            if high:
+                criteria["max_years"] = float(high)
+            elif not plus:
+                criteria["max_years"] = float(low)
+            continue
+
+        if lowered.startswith("position:"):
+            criteria["position"] = part.split(":", 1)[1].strip()
+            continue
+        if lowered.startswith("location:") or lowered.startswith("in "):
+            criteria["location"] = part.split(":", 1)[1].strip() if ":" in part else part[3:].strip()
+            continue
+
+        terms = re.split(r"\s+(?:AND|OR)\s+", part, flags=re.IGNORECASE)
+        if len(terms) > 1:
+            if re.search(r"\s+OR\s+", part, flags=re.IGNORECASE):
+                criteria["match_all_techs"] = False
+            techs.extend(t.strip() for t in terms if t.strip())
+            continue
+
+        techs.append(part)
+
+    if techs:
+        criteria["techs"] = techs
+
+    return criteria
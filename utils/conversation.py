@@ -0,0 +1,355 @@
+"""
+Conversation Engine - The screening conversation as a pure state machine
+(state, message) -> (new state, reply), independent of Streamlit, so the same
+flow backs the web UI, an HTTP API and in-process load tests
+"""
+
+import re
+import uuid
+
+from utils.extraction import CandidateInfoExtractor, PROFILE_STAGE_FIELDS, fill_fields, next_profile_stage
+from utils.intents import IntentMatcher
+from utils.prompt_manager import PromptManager
+
+
+# Separators inside parentheses belong to the item: "AWS (EC2, S3)"
+TECH_STACK_SPLIT_PATTERN = re.compile(r"(?:,|;|\band\b)(?![^(]*\))")
+NUMBER_PATTERN = re.compile(r"\d+")
+# Lead-in words before a name given on its own ("I'm Jane", "sure, it's Jane")
+NAME_PREFIX_PATTERN = re.compile(
+    r"^(?:(?:hi|hello|hey|yes|sure|ok|okay)\b[\s,!.]*)*(?:i'?m|i am|my name is|this is|it'?s|name\s*:)\s+",
+    re.IGNORECASE
+)
+
+
+def new_candidate_data():
+    """Empty candidate record as collected by the conversation"""
+    return {
+        "full_name": None,
+        "email": None,
+        "phone": None,
+        "years_of_experience": None,
+        "desired_position": None,
+        "current_location": None,
+        "tech_stack": [],
+        "technical_responses": []
+    }
+
+
+class ConversationState:
+    """
+    Everything a screening session needs between turns
+
+    Plain attributes only, so a state converts to and from a JSON-ready
+    dictionary (to_dict / from_dict) and can live in st.session_state, a
+    session store or a test fixture alike.
+    """
+
+    __slots__ = ("session_token", "stage", "active", "candidate_data", "questions", "question_index")
+
+    def __init__(self, session_token, stage="greeting", active=True, candidate_data=None,
+                 questions=None, question_index=0):
+        self.session_token = session_token
+        self.stage = stage
+        self.active = active
+        self.candidate_data = candidate_data if candidate_data is not None else new_candidate_data()
+        self.questions = questions if questions is not None else []
+        self.question_index = question_index
+
+    @property
+    def finished(self):
+        """True once the conversation has reached its closing stage"""
+        return self.stage == "closing"
+
+    def copy(self):
+        """Copy that can be changed without affecting this state"""
+        candidate_data = dict(self.candidate_data)
+        candidate_data["tech_stack"] = list(candidate_data.get("tech_stack") or [])
+        candidate_data["technical_responses"] = list(candidate_data.get("technical_responses") or [])
+        return ConversationState(
+            self.session_token, self.stage, self.active, candidate_data,
+            list(self.questions), self.question_index
+        )
+
+    def to_dict(self):
+        """Serialize to a JSON-ready dictionary"""
+        return {
+            "session_token": self.session_token,
+            "stage": self.stage,
+            "active": self.active,
+            "candidate_data": self.candidate_data,
+            "questions": self.questions,
+            "question_index": self.question_index,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a state from to_dict() output"""
+        return cls(
+            data["session_token"],
+            stage=data.get("stage", "greeting"),
+            active=data.get("active", True),
+            candidate_data=data.get("candidate_data"),
+            questions=data.get("questions"),
+            question_index=data.get("question_index", 0)
+        )
+
+
+class ConversationEngine:
+    """
+    Drives the screening conversation
+
+    step() never touches storage or UI: it returns a new state and the bot
+    reply, leaving the input state unchanged. Callers persist the candidate
+    data once the returned state is finished. The only side effect is the
+    optional background question generation, which never delays a reply.
+    """
+
+    def __init__(self, question_generator, prompt_manager=None, extractor=None, intent_matcher=None,
+                 num_questions=5, speculative_questions=None):
+        """
+        Args:
+            question_generator: TechStackQuestionGenerator used at the tech stack stage
+            prompt_manager: PromptManager for the greeting (a new one by default)
+            extractor: CandidateInfoExtractor for profile fields (a new one by default)
+            intent_matcher: IntentMatcher for exit/repeat/skip/back (a new one by default)
+            num_questions: Technical questions asked per candidate
+            speculative_questions: SpeculativeQuestionGenerator whose model questions replace
+                bank questions not asked yet (None asks bank questions only)
+        """
+        self.question_generator = question_generator
+        self.prompt_manager = prompt_manager or PromptManager()
+        self.extractor = extractor or CandidateInfoExtractor()
+        self.intent_matcher = intent_matcher or IntentMatcher()
+        self.num_questions = num_questions
+        self.speculative_questions = speculative_questions
+
+    def start(self, session_token=None):
+        """
+        Begin a new conversation
+
+        Args:
+            session_token: Identifier of the session (a random one by default)
+
+        Returns:
+            (initial state, greeting message)
+        """
+        state = ConversationState(session_token or uuid.uuid4().hex)
+        return state, self.reply(state)
+
+    def step(self, state, user_input):
+        """
+        Process one candidate message
+
+        Args:
+            state: Current ConversationState (not modified)
+            user_input: Candidate message
+
+        Returns:
+            (new state, bot reply)
+        """
+        state = state.copy()
+        if state.active:
+            self._advance(state, user_input)
+            if state.stage == "asking_technical_questions":
+                self._use_speculative_questions(state)
+        return state, self.reply(state)
+
+    # ----- transitions ---------------------------------------------------
+
+    def _advance(self, state, user_input):
+        stage = state.stage
+        candidate_data = state.candidate_data
+
+        intent = self.intent_matcher.match(user_input, stage)
+
+        if intent == "exit":
+            self._close(state)
+            return
+
+        if intent is not None and stage == "asking_technical_questions":
+            self._question_intent(state, intent)
+            return
+
+        if stage == "greeting":
+            # Candidates who introduce themselves fully skip the questions they already answered.
+            # "I'm ..." usually answers "Ready to get started?", so it only introduces a name
+            # when the message also carries contact details ("I'm Jane Doe, jane@x.io, ...")
+            found = self.extractor.extract(user_input, casual_names=False)
+            if "email" in found or "phone" in found:
+                found = self.extractor.extract(user_input)
+            fill_fields(candidate_data, found)
+            state.stage = next_profile_stage(candidate_data)
+            self._warm_up_questions(state)
+
+        elif stage in PROFILE_STAGE_FIELDS:
+            found, rest = self.extractor.split(user_input)
+            fill_fields(candidate_data, found)
+            field = PROFILE_STAGE_FIELDS[stage]
+            # What the patterns left over answers the question ("Jane Doe, Software Engineer")
+            if not candidate_data.get(field):
+                candidate_data[field] = self._fallback_field_value(stage, rest)
+            state.stage = next_profile_stage(candidate_data)
+            self._warm_up_questions(state)
+
+        elif stage == "collecting_tech_stack":
+            if len(user_input.strip()) > 0:
+                tech_items = [item.strip() for item in TECH_STACK_SPLIT_PATTERN.split(user_input)]
+                candidate_data["tech_stack"] = [item for item in tech_items if len(item) > 0]
+
+                # Seeded by the session token so the question set can be regenerated for audit
+                state.questions = self.question_generator.generate_questions(
+                    candidate_data["tech_stack"],
+                    num_questions=self.num_questions,
+                    seed=state.session_token,
+                    years_of_experience=candidate_data["years_of_experience"]
+                )
+                state.question_index = 0
+                state.stage = "asking_technical_questions"
+
+                # Bank questions are asked right away; model questions can replace later ones
+                if self.speculative_questions is not None:
+                    self.speculative_questions.start(
+                        state.session_token,
+                        candidate_data["tech_stack"],
+                        desired_position=candidate_data["desired_position"],
+                        years_of_experience=candidate_data["years_of_experience"],
+                        num_questions=len(state.questions) or self.num_questions
+                    )
+
+        elif stage == "asking_technical_questions":
+            if state.question_index < len(state.questions):
+                candidate_data["technical_responses"].append({
+                    "question": state.questions[state.question_index],
+                    "answer": user_input
+                })
+                state.question_index += 1
+                if state.question_index >= len(state.questions):
+                    self._close(state)
+
+
+    def _warm_up_questions(self, state):
+        candidate_data = state.candidate_data
+        if self.speculative_questions is not None and candidate_data.get("desired_position"):
+            self.speculative_questions.warm_up(
+                state.session_token,
+                candidate_data["desired_position"],
+                years_of_experience=candidate_data["years_of_experience"],
+                num_questions=self.num_questions
+            )
+
+    def _use_speculative_questions(self, state):
+        """Swap in model questions, if ready, for the questions not asked yet"""
+        if self.speculative_questions is None:
+            return
+        generated = self.speculative_questions.collect(state.session_token)
+        if not generated:
+            return
+
+        asked = state.questions[:state.question_index]
+        remaining = len(state.questions) - state.question_index
+        fresh = [question for question in generated if question not in asked][:remaining]
+        state.questions = asked + fresh + state.questions[state.question_index + len(fresh):]
+
+    def _question_intent(self, state, intent):
+        responses = state.candidate_data["technical_responses"]
+
+        if intent == "skip" and state.question_index < len(state.questions):
+            responses.append({
+                "question": state.questions[state.question_index],
+                "answer": "",
+                "skipped": True
+            })
+            state.question_index += 1
+            if state.question_index >= len(state.questions):
+                self._close(state)
+
+        elif intent == "back" and state.question_index > 0:
+            # The previous answer is discarded so it can be given again
+            responses.pop()
+            state.question_index -= 1
+
+        # "repeat": nothing changes, so the current question is asked again
+
+    def _close(self, state):
+        state.stage = "closing"
+        state.active = False
+        if self.speculative_questions is not None:
+            self.speculative_questions.discard(state.session_token)
+
+    @staticmethod
+    def _fallback_field_value(stage, user_input):
+        """Read the text no pattern used as the asked-for field"""
+        text = user_input.strip()
+        if stage == "collecting_name":
+            return NAME_PREFIX_PATTERN.sub("", text).strip(" \t,.;!") or None
+        if stage in ("collecting_position", "collecting_location"):
+            return text or None
+        if stage == "collecting_experience":
+            numbers = NUMBER_PATTERN.findall(user_input)
+            return numbers[0] if numbers else None
+        return None
+
+    # ----- replies -------------------------------------------------------
+
+    def reply(self, state):
+        """
+        Bot message for a state
+
+        Args:
+            state: ConversationState
+
+        Returns:
+            Message text (markdown)
+        """
+        stage = state.stage
+        candidate_data = state.candidate_data
+
+        if stage == "greeting":
+            return self.prompt_manager.get_greeting_message()
+
+        elif stage == "collecting_name":
+            return "Great! Let's get started. May I have your full name, please?"
+
+        elif stage == "collecting_email":
+            return f"Thank you, {candidate_data['full_name']}! What's the best email address to reach you?"
+
+        elif stage == "collecting_phone":
+            return "Perfect! And what's your phone number?"
+
+        elif stage == "collecting_experience":
+            return "Got it! How many years of professional experience do you have?"
+
+        elif stage == "collecting_position":
+            return "Excellent! What position(s) are you interested in applying for?"
+
+        elif stage == "collecting_location":
+            return "Thanks! Where are you currently located?"
+
+        elif stage == "collecting_tech_stack":
+            return """Now, let's talk about your technical skills! Please list your tech stack - including programming languages, frameworks, databases, and tools you're proficient in.
+
+(For example: Python, React, PostgreSQL, Docker, AWS)"""
+
+        elif stage == "asking_technical_questions":
+            if state.question_index < len(state.questions):
+                question = state.questions[state.question_index]
+                question_num = state.question_index + 1
+                total_questions = len(state.questions)
+                message = f"**Technical Question {question_num}/{total_questions}:**\n\n{question}"
+                if question_num == 1:
+                    message += "\n\n_You can type 'skip', 'repeat' or 'go back' at any question._"
+                return message
+            else:
+                return "Thank you for answering all the technical questions!"
+
+        elif stage == "closing":
+            return f"""Thank you so much for your time, {candidate_data.get('full_name') or 'candidate'}!
+
+We've collected all the necessary information for the initial screening. Our team will review your responses and get back to you within 3-5 business days at {candidate_data.get('email') or 'your email'}.
+
+If you're selected for the next round, we'll reach out to schedule a detailed technical interview.
+
+Best of luck with your application! Have a wonderful day! """
+
+        return "I'm here to help. How can I assist you?"
@@ -3,41 +3,58 @@ Data Handler - Manages secure storage and retrieval of candidate data
 Implements GDPR compliance best practices
 """
 
+import atexit
+import base64
+import copy
 import json
 import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import datetime
 import hashlib
 
+from utils.background_writer import BackgroundWriter
+from utils.storage import create_store
+
 
 class DataHandler:
     """
     Handles secure storage of candidate data with GDPR compliance
     """
 
-    def __init__(self, data_dir="data"):
+    RECENT_UPSERTS_LIMIT = 4096
+    # Seconds an erasure request waits for queued saves before it fails
+    ERASURE_FLUSH_TIMEOUT = 30.0
+
+    def __init__(self, data_dir="data", storage_mode="json", snapshot_interval=500,
+                 writer_queue_size=1000, writer_batch_size=64):
         self.data_dir = data_dir
-        self.candidates_file = os.path.join(data_dir, "candidates.json")
+        self.storage_mode = storage_mode
 
         # Ensure data directory exists
         os.makedirs(data_dir, exist_ok=True)
 
-        # Initialize candidates file if it doesn't exist
-        if not os.path.exists(self.candidates_file):
-            self._initialize_storage()
-
-    def _initialize_storage(self):
-        """Initialize empty storage file"""
-        initial_data = {
-            "candidates": [],
-            "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "total_candidates": 0,
-                "last_updated": datetime.now().isoformat()
-            }
-        }
+        self.store = create_store(storage_mode, data_dir, snapshot_interval=snapshot_interval)
+        self.erasure_audit_file = os.path.join(data_dir, "erasure_audit.jsonl")
+        # Default AnalyticsExporter output, pruned on erasure and retention purges
+        self.analytics_dir = os.path.join(data_dir, "analytics")
+
+        # Group-commit writer for save_candidate_data_async, started on first use
+        self.writer = BackgroundWriter(
+            self._commit_batch,
+            max_queue=writer_queue_size,
+            max_batch=writer_batch_size
+        )
+        atexit.register(self.close)
+
+        # Objects notified of every committed change (search indexes and the like)
+        self._listeners = []
 
-        with open(self.candidates_file, 'w') as f:
-            json.dump(initial_data, f, indent=2)
+        # (candidate_id, session_token) -> (content hash, version) of recent upserts, to skip reruns cheaply
+        self._recent_upserts = OrderedDict()
+        self._upsert_lock = threading.Lock()
 
     def _hash_email(self, email):
         """
@@ -92,33 +109,211 @@ class DataHandler:
             Success status and candidate ID
         """
         try:
-            # Load existing data
-            with open(self.candidates_file, 'r') as f:
-                storage = json.load(f)
+            enhanced_data = self._build_record(candidate_data)
 
-            # Add metadata to candidate data
-            enhanced_data = self._anonymize_sensitive_data(candidate_data)
-            enhanced_data["submission_timestamp"] = datetime.now().isoformat()
-            enhanced_data["candidate_id"] = self._hash_email(candidate_data.get("email", ""))
-            enhanced_data["status"] = "screening_completed"
+            self.store.append_records([enhanced_data])
+            self._notify_saved([enhanced_data])
 
-            # Add to candidates list
-            storage["candidates"].append(enhanced_data)
+            return True, enhanced_data["candidate_id"]
 
-            # Update metadata
-            storage["metadata"]["total_candidates"] = len(storage["candidates"])
-            storage["metadata"]["last_updated"] = datetime.now().isoformat()
+        except Exception as e:
+            print(f"Error saving candidate data: {str(e)}")
+            return False, None
 
-            # Save back to file
-            with open(self.candidates_file, 'w') as f:
-                json.dump(storage, f, indent=2)
+    def save_candidate_data_async(self, candidate_data):
+        """
+        Queue candidate data for the background writer and return immediately
 
-            return True, enhanced_data["candidate_id"]
+        Pending submissions are committed together in one write. If the
+        queue is full the data is saved synchronously instead.
+
+        Args:
+            candidate_data: Dictionary containing candidate information
+
+        Returns:
+            Success status and a Future resolving to the candidate ID once durable
+        """
+        try:
+            # Snapshot the data now; the session keeps mutating its own copy
+            enhanced_data = self._build_record(copy.deepcopy(candidate_data))
+
+            return True, self._submit("append", enhanced_data)
+
+        except Exception as e:
+            print(f"Error queueing candidate data: {str(e)}")
+            return False, None
+
+    def upsert_candidate_data(self, candidate_data, session_token):
+        """
+        Save candidate data exactly once per screening session
+
+        Keyed on candidate_id: a repeat call from the same session with
+        unchanged content is skipped, and a new session (or changed content)
+        replaces the stored record with the next version.
+
+        Args:
+            candidate_data: Dictionary containing candidate information
+            session_token: Identifier of the screening session
+
+        Returns:
+            Success status and a result dictionary (candidate_id, version, written)
+        """
+        try:
+            record = self._build_upsert_record(candidate_data, session_token)
+
+            skipped = self._skip_result(record)
+            if skipped:
+                return True, skipped
+
+            result = self.store.upsert_records([record])[0]
+            self._remember_upsert(record, result)
+            if result["written"]:
+                self._notify_saved([record])
+
+            return True, result
 
         except Exception as e:
             print(f"Error saving candidate data: {str(e)}")
             return False, None
 
+    def upsert_candidate_data_async(self, candidate_data, session_token):
+        """
+        Queue an idempotent upsert for the background writer
+
+        Args:
+            candidate_data: Dictionary containing candidate information
+            session_token: Identifier of the screening session
+
+        Returns:
+            Success status and a Future resolving to the upsert result dictionary
+        """
+        try:
+            record = self._build_upsert_record(copy.deepcopy(candidate_data), session_token)
+
+            skipped = self._skip_result(record)
+            if skipped:
+                future = Future()
+                future.set_result(skipped)
+                return True, future
+
+            return True, self._submit("upsert", record)
+
+        except Exception as e:
+            print(f"Error queueing candidate data: {str(e)}")
+            return False, None
+
+    def _build_record(self, candidate_data):
+        """Add storage metadata to candidate data"""
+        enhanced_data = self._anonymize_sensitive_data(candidate_data)
+        enhanced_data["submission_timestamp"] = datetime.now().isoformat()
+        enhanced_data["candidate_id"] = self._hash_email(candidate_data.get("email", ""))
+        enhanced_data["status"] = "screening_completed"
+
+        return enhanced_data
+
+    def _build_upsert_record(self, candidate_data, session_token):
+        """Build a record carrying the session token and a hash of its content"""
+        content = json.dumps(candidate_data, sort_keys=True, default=str)
+
+        record = self._build_record(candidate_data)
+        record["session_token"] = session_token
+        record["content_hash"] = hashlib.sha256(content.encode()).hexdigest()
+
+        return record
+
+    def _skip_result(self, record):
+        """Return a no-op result if this process already stored identical content"""
+        key = (record["candidate_id"], record["session_token"])
+        with self._upsert_lock:
+            recent = self._recent_upserts.get(key)
+        if recent and recent[0] == record["content_hash"]:
+            return {"candidate_id": record["candidate_id"], "version": recent[1], "written": False}
+        return None
+
+    def _remember_upsert(self, record, result):
+        key = (record["candidate_id"], record["session_token"])
+        with self._upsert_lock:
+            self._recent_upserts[key] = (record["content_hash"], result["version"])
+            self._recent_upserts.move_to_end(key)
+            while len(self._recent_upserts) > self.RECENT_UPSERTS_LIMIT:
+                self._recent_upserts.popitem(last=False)
+
+    def _forget_upserts(self, candidate_ids):
+        """Drop cached upsert hashes of erased candidates"""
+        with self._upsert_lock:
+            for key in [key for key in self._recent_upserts if key[0] in candidate_ids]:
+                del self._recent_upserts[key]
+
+    def _submit(self, op, record):
+        """Queue a write, falling back to a synchronous commit when the queue is full"""
+        try:
+            return self.writer.submit((op, record))
+        except (queue.Full, RuntimeError):
+            future = Future()
+            future.set_result(self._commit_batch([(op, record)])[0])
+            return future
+
+    def _commit_batch(self, items):
+        """
+        Commit a batch of queued writes
+
+        Consecutive writes of the same kind go to the store in one call.
+
+        Args:
+            items: List of (op, record) pairs, op being "append" or "upsert"
+
+        Returns:
+            One result per item: the candidate ID for appends, the upsert result for upserts
+        """
+        results = []
+        start = 0
+        while start < len(items):
+            op = items[start][0]
+            end = start
+            while end < len(items) and items[end][0] == op:
+                end += 1
+            records = [record for _, record in items[start:end]]
+
+            if op == "upsert":
+                upserted = self.store.upsert_records(records)
+                for record, result in zip(records, upserted):
+                    self._remember_upsert(record, result)
+                self._notify_saved([r for r, result in zip(records, upserted) if result["written"]])
+                results.extend(upserted)
+            else:
+                self.store.append_records(records)
+                self._notify_saved(records)
+                results.extend(record["candidate_id"] for record in records)
+
+            start = end
+
+        return results
+
+    def get_write_status(self):
+        """
+        Report durability status of queued submissions
+
+        Returns:
+            Dictionary with pending, committed and failed counts
+        """
+        return self.writer.status()
+
+    def flush(self, timeout=None):
+        """
+        Wait until every queued submission is on disk
+
+        Args:
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            True if nothing is pending anymore
+        """
+        return self.writer.flush(timeout)
+
+    def close(self):
+        """Flush queued submissions and stop the background writer"""
+        self.writer.close()
+
     def get_candidate_by_email(self, email):
         """
         Retrieve candidate data by email
@@ -130,16 +325,9 @@ class DataHandler:
             Candidate data dictionary or None
         """
         try:
-            with open(self.candidates_file, 'r') as f:
-                storage = json.load(f)
+            matches = self.store.find(self._hash_email(email))
 
-            candidate_id = self._hash_email(email)
-
-            for candidate in storage["candidates"]:
-                if candidate.get("candidate_id") == candidate_id:
-                    return candidate
-
-            return None
+            return matches[0] if matches else None
 
         except Exception as e:
             print(f"Error retrieving candidate data: {str(e)}")
@@ -153,15 +341,71 @@ class DataHandler:
             List of candidate dictionaries
         """
         try:
-            with open(self.candidates_file, 'r') as f:
-                storage = json.load(f)
-
-            return storage["candidates"]
+            return self.store.read_all()
 
         except Exception as e:
             print(f"Error retrieving candidates: {str(e)}")
             return []
 
+    def iter_candidates(self, filters=None, since=None, until=None):
+        """
+        Stream candidate records without loading the whole store
+
+        Filters on status and the submission window are evaluated by the
+        storage backend where it can (indexed columns in SQLite).
+
+        Args:
+            filters: Dictionary of field -> required value, e.g. {"status": "screening_completed"}
+            since: Minimum submission_timestamp (inclusive, ISO format)
+            until: Maximum submission_timestamp (exclusive, ISO format)
+
+        Yields:
+            Candidate dictionaries in storage order
+        """
+        for record, _ in self.store.iter_records(filters=filters, since=since, until=until):
+            yield record
+
+    def get_candidates_page(self, cursor=None, page_size=50, filters=None, since=None, until=None):
+        """
+        Retrieve one page of candidates for a review UI
+
+        Args:
+            cursor: Opaque cursor from the previous page (None for the first page)
+            page_size: Maximum records per page
+            filters: Dictionary of field -> required value
+            since: Minimum submission_timestamp (inclusive, ISO format)
+            until: Maximum submission_timestamp (exclusive, ISO format)
+
+        Returns:
+            List of candidate dictionaries and the cursor of the next page (None on the last page)
+        """
+        try:
+            position = self._decode_cursor(cursor) if cursor else None
+            records = self.store.iter_records(filters=filters, since=since, until=until, cursor=position)
+
+            page = []
+            page_end = None
+            for record, record_position in records:
+                if len(page) == page_size:
+                    # At least one more record exists: hand out a cursor to the next page
+                    records.close()
+                    return page, self._encode_cursor(page_end)
+                page.append(record)
+                page_end = record_position
+
+            return page, None
+
+        except Exception as e:
+            print(f"Error retrieving candidates page: {str(e)}")
+            return [], None
+
+    def _encode_cursor(self, position):
+        payload = json.dumps(position, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    def _decode_cursor(self, cursor):
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
     def delete_candidate_data(self, email):
         """
         Delete candidate data (GDPR right to erasure)
@@ -172,28 +416,132 @@ class DataHandler:
         Returns:
             Success status
         """
-        try:
-            with open(self.candidates_file, 'r') as f:
-                storage = json.load(f)
+        success, _ = self.delete_candidates([email])
+
+        return success
+
+    def delete_candidates(self, emails):
+        """
+        Delete a batch of candidates in a single write (GDPR right to erasure)
 
-            candidate_id = self._hash_email(email)
+        Queued submissions are flushed first so none of them can re-insert
+        erased data; if they are not committed within ERASURE_FLUSH_TIMEOUT
+        seconds nothing is erased and the request fails. An audit entry holding only the hashed IDs is appended
+        to erasure_audit.jsonl.
 
-            # Remove candidate from list
-            storage["candidates"] = [
-                c for c in storage["candidates"]
-                if c.get("candidate_id") != candidate_id
-            ]
+        Args:
+            emails: Iterable of candidate email addresses
 
-            # Update metadata
-            storage["metadata"]["total_candidates"] = len(storage["candidates"])
-            storage["metadata"]["last_updated"] = datetime.now().isoformat()
+        Returns:
+            Success status and a dictionary of email -> number of records removed
+        """
+        try:
+            candidate_ids = {email: self._hash_email(email) for email in emails}
 
-            # Save back to file
-            with open(self.candidates_file, 'w') as f:
-                json.dump(storage, f, indent=2)
+            if not self.writer.flush(self.ERASURE_FLUSH_TIMEOUT):
+                raise TimeoutError("queued saves were not committed in time; nothing was erased")
+            removed = self.store.remove_many(set(candidate_ids.values()))
+            self._forget_upserts(set(candidate_ids.values()))
+            self._notify_removed([cid for cid, count in removed.items() if count])
+            self._write_erasure_audit(removed)
+            self._prune_analytics([cid for cid, count in removed.items() if count])
 
-            return True
+            return True, {email: removed[candidate_id] for email, candidate_id in candidate_ids.items()}
 
         except Exception as e:
             print(f"Error deleting candidate data: {str(e)}")
-            return False
+            return False, {}
+
+    def purge_expired(self, now, limit):
+        """
+        Remove up to `limit` records whose retention date has passed
+
+        Args:
+            now: ISO timestamp to compare retention dates against
+            limit: Maximum number of records to remove
+
+        Returns:
+            Number of records removed
+        """
+        purged = self.store.purge_expired(now, limit)
+
+        if purged:
+            self._prune_analytics(set(purged), expired_before=now)
+
+        if purged and self._listeners:
+            # A candidate may still have newer records that have not expired
+            gone = {cid for cid in purged if not self.store.find(cid)}
+            self._notify_removed(sorted(gone))
+            self._notify_saved([self.store.find(cid)[-1] for cid in set(purged) - gone])
+
+        return len(purged)
+
+    def add_listener(self, listener):
+        """
+        Register an object notified of committed changes
+
+        The listener needs on_records_saved(records) and
+        on_candidates_removed(candidate_ids) methods. They run on whichever
+        thread committed the change, including the background writer.
+
+        Args:
+            listener: Listener object
+        """
+        self._listeners.append(listener)
+
+    def _notify_saved(self, records):
+        if not records:
+            return
+        for listener in self._listeners:
+            try:
+                listener.on_records_saved(records)
+            except Exception as e:
+                print(f"Error notifying listener: {str(e)}")
+
+    def _notify_removed(self, candidate_ids):
+        if not candidate_ids:
+            return
+        for listener in self._listeners:
+            try:
+                listener.on_candidates_removed(candidate_ids)
+            except Exception as e:
+                print(f"Error notifying listener: {str(e)}")
+
+    def _prune_analytics(self, candidate_ids, expired_before=None):
+        """Remove erased or expired candidates from the analytics export, if there is one"""
+        if not candidate_ids or not os.path.isdir(self.analytics_dir):
+            return
+        try:
+            from utils.analytics_export import prune_export
+            prune_export(self.analytics_dir, candidate_ids, expired_before=expired_before)
+        except Exception as e:
+            print(f"Error pruning analytics export: {str(e)}")
+
+    def _write_erasure_audit(self, removed):
+        """Append an erasure audit entry containing hashed IDs only"""
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "requested": len(removed),
+            "records_removed": sum(removed.values()),
+            "erased_ids": sorted(cid for cid, count in removed.items() if count),
+            "not_found_ids": sorted(cid for cid, count in removed.items() if not count),
+        }
+
+        with open(self.erasure_audit_file, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def get_metadata(self):
+        """
+        Retrieve storage metadata counters
+
+        Returns:
+            Metadata dictionary (created_at, total_candidates, last_updated, ...)
+        """
+        try:
+            return self.store.metadata()
+
+        except Exception as e:
+            print(f"Error retrieving metadata: {str(e)}")
+            return {}
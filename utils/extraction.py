@@ -0,0 +1,209 @@
+"""
+Candidate Info Extraction - Pulls every recognizable profile field out of one message
+"I'm Jane Doe, jane@x.io, +44 7700 900123, 5 years, backend engineer in Leeds"
+fills six fields in a single regex scan
+"""
+
+import re
+
+
+ROLE_WORDS = (
+    "engineer", "developer", "architect", "scientist", "analyst", "manager", "designer",
+    "administrator", "consultant", "programmer", "intern", "tech lead", "team lead", "sre", "devops",
+)
+_ROLE = r"(?:" + "|".join(ROLE_WORDS) + r")s?"
+
+# Capitalized words ("Jane Doe", "San Francisco"); _FULL_NAME needs at least two
+_NAME_PARTICLE = r"(?:de|da|van|von|del|la|le)"
+_PROPER_NAME = r"[A-Z][\w'-]*(?:[ \t]+(?:[A-Z][\w'-]*|" + _NAME_PARTICLE + r"))*"
+_FULL_NAME = r"[A-Z][\w'-]*(?:[ \t]+" + _NAME_PARTICLE + r")*[ \t]+" + _PROPER_NAME
+_LOCATION = r"[A-Z][\w'-]*(?:(?:[ \t]+|,[ \t]*)[A-Z][\w'-]*){0,3}"
+_EMPLOYER = r"[A-Z][\w'&.-]*(?:[ \t]+[A-Z][\w'&.-]*){0,3}"
+
+# One alternation with a named group per field, tried left to right at each
+# position: email before phone so digits inside addresses are not phones,
+# years before phone so "10 years" is not read as a number
+COMBINED_PATTERN = re.compile(
+    r"(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)"
+    r"|(?P<years_of_experience>\b\d+(?:\.\d+)?(?:\s*-\s*\d+(?:\.\d+)?)?)\+?\s*(?i:years?|yrs?)\b"
+    r"|(?P<phone>(?<![\w@.])\+?\(?\d[\d \t().-]{5,}\d\b)"
+    r"|(?i:\b(?:my name is|this is|name\s*:))[ \t]+(?P<full_name>" + _PROPER_NAME + r")"
+    # "I'm ..." is also "I'm ready", so it only introduces a name of two or more words
+    r"|(?i:\b(?:i'?m|i am))[ \t]+(?P<casual_name>" + _FULL_NAME + r")"
+    r"|(?P<desired_position>\b(?i:(?:[a-z+#./-]+[ \t]+){0,3}" + _ROLE + r"(?:[ \t]+" + _ROLE + r")*)\b)"
+    # "at Google" names the employer, not the location: skipped, not stored
+    r"(?:[ \t]+(?i:at)[ \t]+" + _EMPLOYER + r")?"
+    r"(?:[ \t]+(?i:in|from)[ \t]+(?P<position_location>" + _LOCATION + r"))?"
+    r"|(?i:\b(?:based in|located in|living in|live in|currently in|from|location\s*:))[ \t]+"
+    r"(?P<current_location>" + _LOCATION + r")"
+)
+
+# Lead-in words that are not part of a desired position
+POSITION_PREFIX_PATTERN = re.compile(
+    r"^(?:(?:a|an|the|as|for|i|i'?m|am|be|work|working|currently|applying|apply|looking|interested|in)\s+)+",
+    re.IGNORECASE
+)
+# Capitalized words after "I'm" that describe the candidate rather than name them
+# ("I'm Looking Forward", "I'm Very Excited")
+NOT_NAME_WORDS = frozenset((
+    "looking", "forward", "very", "so", "really", "just", "excited", "ready", "happy", "glad",
+    "keen", "eager", "pleased", "thrilled", "interested", "available", "here", "not", "sure",
+    "fine", "good", "great", "currently", "working", "applying", "new", "an", "the",
+))
+PHONE_DIGITS_RANGE = (7, 15)
+# Digit runs that look like phone numbers but are dates: "2015-2020", "2020-01-15"
+DATE_LIKE_PATTERN = re.compile(
+    r"^(?:(?:19|20)\d{2}[ \t]*[-/.][ \t]*(?:(?:19|20)\d{2}|\d{2})|\d{4}[-/.]\d{1,2}[-/.]\d{1,2}|\d{1,2}[-/.]\d{1,2}[-/.]\d{4})$"
+)
+
+# Profile-collection stages in conversation order, with the field each one fills
+PROFILE_STAGES = (
+    ("collecting_name", "full_name"),
+    ("collecting_email", "email"),
+    ("collecting_phone", "phone"),
+    ("collecting_experience", "years_of_experience"),
+    ("collecting_position", "desired_position"),
+    ("collecting_location", "current_location"),
+)
+PROFILE_STAGE_FIELDS = dict(PROFILE_STAGES)
+
+
+def next_profile_stage(candidate_data):
+    """
+    Find the first profile stage whose field is still empty
+
+    Args:
+        candidate_data: Candidate dictionary collected so far
+
+    Returns:
+        Stage name, or "collecting_tech_stack" once every profile field is filled
+    """
+    for stage, field in PROFILE_STAGES:
+        if not candidate_data.get(field):
+            return stage
+    return "collecting_tech_stack"
+
+
+def fill_fields(candidate_data, found):
+    """
+    Copy extracted fields into the empty fields of a candidate
+
+    Returns:
+        Dictionary of the fields that were filled
+    """
+    filled = {field: value for field, value in found.items() if not candidate_data.get(field)}
+    candidate_data.update(filled)
+    return filled
+
+
+class CandidateInfoExtractor:
+    """
+    Single-pass extraction of candidate profile fields from free text
+
+    All field patterns are compiled into one alternation with a named group
+    per field, so a message is scanned once no matter how many fields it
+    carries. The first value found for each field wins.
+    """
+
+    FIELDS = ("full_name", "email", "phone", "years_of_experience", "desired_position", "current_location")
+
+    def extract(self, text, casual_names=True):
+        """
+        Extract every recognizable field from a message
+
+        Args:
+            text: Candidate message
+            casual_names: Whether "I'm Jane Doe" introduces a name; off where
+                "I'm ..." is more likely an answer ("Yes, I'm Ready!")
+
+        Returns:
+            Dictionary of field name -> extracted string (only fields found)
+        """
+        return self.split(text, casual_names)[0]
+
+    def split(self, text, casual_names=True):
+        """
+        Extract fields and keep what the patterns did not use
+
+        "Jane Doe, Software Engineer" gives {"desired_position": "Software
+        Engineer"} and the rest "Jane Doe", which is the answer when the name
+        was asked for.
+
+        Returns:
+            (dictionary of extracted fields, remaining text)
+        """
+        found = {}
+        if not text:
+            return found, ""
+
+        pieces = []
+        position = 0
+        for match in COMBINED_PATTERN.finditer(text):
+            used = False
+            for group, value in match.groupdict().items():
+                if value is None or (group == "casual_name" and not casual_names):
+                    continue
+                field, value = self._clean(group, value)
+                if value:
+                    used = True
+                    if field not in found:
+                        found[field] = value
+            if used:
+                pieces.append(text[position:match.start()])
+                position = match.end()
+        pieces.append(text[position:])
+
+        rest = " ".join(" ".join(pieces).split()).strip(" \t,.;")
+        return found, rest
+
+    def fill(self, candidate_data, text, casual_names=True):
+        """
+        Extract fields from a message into the empty fields of a candidate
+
+        Fields that already have a value are never overwritten.
+
+        Args:
+            candidate_data: Candidate dictionary, updated in place
+            text: Candidate message
+            casual_names: See extract()
+
+        Returns:
+            Dictionary of the fields that were filled
+        """
+        return fill_fields(candidate_data, self.extract(text, casual_names))
+
+    def extract_field(self, text, field):
+        """
+        Extract one field from a message
+
+        Returns:
+            Extracted string, or None
+        """
+        return self.extract(text).get(field)
+
+    @staticmethod
+    def _clean(group, value):
+        value = value.strip(" \t,.;")
+
+        if group == "position_location":
+            return "current_location", value
+
+        if group == "casual_name":
+            if any(word.lower() in NOT_NAME_WORDS for word in value.split()):
+                return "full_name", None
+            return "full_name", value
+
+        if group == "phone":
+            digits = sum(ch.isdigit() for ch in value)
+            low, high = PHONE_DIGITS_RANGE
+            if not low <= digits <= high or DATE_LIKE_PATTERN.match(value):
+                return group, None
+            return group, value
+
+        if group == "years_of_experience":
+            return group, re.sub(r"\s+", "", value)
+
+        if group == "desired_position":
+            return group, POSITION_PREFIX_PATTERN.sub("", value)
+
+        return group, value
@@ -0,0 +1,103 @@
+"""
+Fuzzy Matcher - Character trigram index for misspelled technology names
+"Kubernates", "Postgress" and "Djano" still find their question bank entries
+"""
+
+
+class TrigramIndex:
+    """
+    Maps character trigrams to the names containing them
+
+    A query only scores the names that share at least one trigram with it,
+    so lookups stay fast as the number of indexed names grows. Similarity
+    is the Dice coefficient over trigram sets.
+    """
+
+    def __init__(self, names):
+        """
+        Args:
+            names: Mapping of indexed name -> value returned on a match
+        """
+        self.names = []
+        self.values = []
+        self.sizes = []
+        self.postings = {}
+
+        for name, value in names.items():
+            name_id = len(self.values)
+            grams = self.trigrams(name)
+            self.names.append(name)
+            self.values.append(value)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(name_id)
+
+    @staticmethod
+    def trigrams(text):
+        """Return the set of padded character trigrams of a name"""
+        padded = f"  {text} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def best_match(self, text, threshold=0.0):
+        """
+        Find the most similar indexed name
+
+        Args:
+            text: Name to look up (already lowercased and cleaned)
+            threshold: Minimum similarity to report a match
+
+        Returns:
+            (value, similarity) of the best match, or (None, 0.0)
+        """
+        name_id, score = self._best(text)
+        if name_id is None or score < threshold:
+            return None, score
+        return self.values[name_id], score
+
+    def best_name(self, text, threshold=0.0):
+        """
+        Like best_match(), but return the indexed name itself
+
+        Returns:
+            (name, similarity) of the best match, or (None, 0.0)
+        """
+        name_id, score = self._best(text)
+        if name_id is None or score < threshold:
+            return None, score
+        return self.names[name_id], score
+
+    def _best(self, text):
+        grams = self.trigrams(text)
+        if not grams:
+            return None, 0.0
+
+        shared = {}
+        for gram in grams:
+            for name_id in self.postings.get(gram, ()):
+                shared[name_id] = shared.get(name_id, 0) + 1
+
+        best_id, best_score = None, 0.0
+        size = len(grams)
+        for name_id, common in shared.items():
+            score = 2.0 * common / (size + self.sizes[name_id])
+            if score > best_score:
+                best_id, best_score = name_id, score
+        return best_id, best_score
+
+
+def edit_distance(a, b):
+    """
+    Number of single-character insertions, deletions, substitutions and
+    adjacent transpositions turning a into b (optimal string alignment)
+    """
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[-1]
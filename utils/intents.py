@@ -0,0 +1,88 @@
+"""
+Intent Matcher - Detects control intents (exit, repeat, skip, back) in candidate messages
+One compiled regex for every stage; every message is scanned once
+"""
+
+import re
+
+
+# Phrases per intent; multi-word phrases match with any whitespace between words
+INTENT_PHRASES = {
+    "exit": ("exit", "quit", "bye", "goodbye", "good bye", "end chat", "end the chat", "stop", "terminate"),
+    "repeat": ("repeat", "repeat the question", "repeat question", "repeat that", "say that again",
+               "come again", "pardon"),
+    "skip": ("skip", "skip this", "skip this question", "skip question", "next question", "pass"),
+    "back": ("go back", "back", "previous question", "previous", "undo"),
+}
+
+# Intents recognized per stage (exit everywhere)
+STAGE_INTENTS = {
+    "asking_technical_questions": ("exit", "repeat", "skip", "back"),
+}
+DEFAULT_INTENTS = ("exit",)
+
+_POLITE_PREFIX = (
+    r"(?:(?:please|pls|ok|okay|no thanks|no thank you|thanks|thank you|no|can we|could we|can you|could you"
+    r"|let'?s|i want to|i'd like to|i)[\s,.!]+)*"
+)
+_POLITE_SUFFIX = r"(?:\s+(?:please|pls|now|thanks|thank you))*"
+
+
+def _alternation(phrases):
+    # Longest first so "skip this question" wins over "skip"
+    ordered = sorted(phrases, key=len, reverse=True)
+    return "|".join(r"\s+".join(re.escape(word) for word in phrase.split()) for phrase in ordered)
+
+
+def _groups():
+    return "|".join(
+        f"(?P<{intent}>{_alternation(phrases)})" for intent, phrases in INTENT_PHRASES.items()
+    )
+
+
+# Whole-message command: "skip", "please repeat the question", "ok bye!", "no thanks, bye bye".
+# Only an exit phrase may repeat ("bye bye", "ok bye, goodbye")
+COMMAND_PATTERN = re.compile(
+    r"^\s*" + _POLITE_PREFIX + r"(?:" + _groups() + r")"
+    + r"(?(exit)(?:[\s,.!]+(?:" + _alternation(INTENT_PHRASES["exit"]) + r"))*)"
+    + _POLITE_SUFFIX + r"\s*[.!?]*\s*$",
+    re.IGNORECASE
+)
+
+
+class IntentMatcher:
+    """
+    Stage-aware matcher for conversation control intents
+
+    A control intent must make up the whole message, apart from polite
+    words ("ok, bye", "please skip"), in every stage. An answer like "I'd
+    stop the container first" or "I just quit my job in Leeds" is never
+    read as a request to leave. The stage decides which intents count:
+    repeat, skip and back only apply to technical questions.
+    """
+
+    def match(self, text, stage=None):
+        """
+        Find the control intent of a message
+
+        Args:
+            text: Candidate message
+            stage: Current conversation stage (None treats the message as a short answer)
+
+        Returns:
+            "exit", "repeat", "skip", "back" or None
+        """
+        if not text:
+            return None
+
+        allowed = STAGE_INTENTS.get(stage, DEFAULT_INTENTS)
+
+        match = COMMAND_PATTERN.match(text)
+        if match is None:
+            return None
+        intent = match.lastgroup
+        return intent if intent in allowed else None
+
+    def is_exit(self, text, stage=None):
+        """Check if a message asks to end the conversation"""
+        return self.match(text, stage) == "exit"
@@ -0,0 +1,226 @@
+"""
+LLM Response Cache - Reuses model replies for turns that many candidates share
+("5 years", "Python, Django"), keyed by a hash of everything the model was given
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from utils.extraction import CandidateInfoExtractor
+from utils.ttl_cache import TTLCache
+
+
+# Turns at these stages carry the candidate's identity and are never cached
+PII_STAGES = ("collecting_name", "collecting_email", "collecting_phone")
+PII_FIELDS = ("full_name", "email", "phone")
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_SEPARATOR_PATTERN = re.compile(r"\s*([,;])\s*")
+
+
+def normalize_input(text):
+    """Case, spacing and trailing punctuation do not change a cache key"""
+    text = _WHITESPACE_PATTERN.sub(" ", (text or "").lower()).strip(" .!?")
+    return _SEPARATOR_PATTERN.sub(r"\1 ", text)
+
+
+class DiskResponseCache:
+    """Second cache tier in SQLite, shared by processes and kept across restarts"""
+
+    def __init__(self, path, ttl_seconds=86400):
+        """
+        Args:
+            path: Database file
+            ttl_seconds: Seconds a reply stays valid
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "cache_key TEXT PRIMARY KEY, reply TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, cache_key):
+        """Return the cached reply, or None if missing or expired"""
+        row = self._connection().execute(
+            "SELECT reply FROM responses WHERE cache_key = ? AND created_at >= ?",
+            (cache_key, time.time() - self.ttl_seconds)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, cache_key, reply):
+        """Store a reply"""
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (cache_key, reply, created_at) VALUES (?, ?, ?)",
+                (cache_key, reply, time.time())
+            )
+
+    def purge_expired(self):
+        """
+        Delete replies past their TTL
+
+        Returns:
+            Number of deleted replies
+        """
+        with self._connection() as conn:
+            cursor = conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            return cursor.rowcount
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache of model replies: an in-memory LRU/TTL cache in front of
+    an optional SQLite tier
+
+    Keys hash the system prompt, stage, model settings, normalized candidate
+    message and templated draft, i.e. everything the model sees. Only stages
+    that opt in are cached, and a turn is never cached if it is answering a
+    name/email/phone question, if the message contains a name, email address
+    or phone number, or if the candidate's own values appear in the draft.
+    """
+
+    def __init__(self, stages, model_config=None, max_size=4096, ttl_seconds=86400, disk_path=None,
+                 extractor=None):
+        """
+        Args:
+            stages: Reply stages whose turns may be cached
+            model_config: Model settings that change replies (part of every key)
+            max_size: Maximum replies held in memory
+            ttl_seconds: Seconds a reply stays valid in either tier
+            disk_path: SQLite file for the disk tier (None keeps the cache in memory only)
+            extractor: CandidateInfoExtractor used to spot PII (a new one by default)
+        """
+        self.stages = frozenset(stages) - frozenset(PII_STAGES)
+        self._model_key = json.dumps(model_config or {}, sort_keys=True)
+        self.memory = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.disk = DiskResponseCache(disk_path, ttl_seconds) if disk_path else None
+        self.extractor = extractor or CandidateInfoExtractor()
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+    def key(self, system_prompt, stage, user_input, draft_reply, input_stage=None, candidate_data=None):
+        """
+        Cache key of a turn
+
+        Args:
+            system_prompt: System prompt sent to the model
+            stage: Stage the reply belongs to
+            user_input: Candidate message
+            draft_reply: Templated reply the model phrases
+            input_stage: Stage the candidate was answering
+            candidate_data: Candidate dictionary, to keep the candidate's own values out of the cache
+
+        Returns:
+            Hex digest, or None if the turn must not be cached
+        """
+        if not self._cacheable(stage, user_input, draft_reply, input_stage, candidate_data):
+            with self._lock:
+                self.skipped += 1
+            return None
+
+        material = json.dumps(
+            [system_prompt, stage, self._model_key, normalize_input(user_input), draft_reply],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _cacheable(self, stage, user_input, draft_reply, input_stage, candidate_data):
+        if stage not in self.stages or input_stage in PII_STAGES:
+            return False
+
+        found = self.extractor.extract(user_input)
+        if any(field in found for field in PII_FIELDS):
+            return False
+
+        if candidate_data:
+            texts = ((user_input or "") + "\n" + (draft_reply or "")).lower()
+            for field in PII_FIELDS:
+                value = candidate_data.get(field)
+                if value and str(value).lower() in texts:
+                    return False
+
+        return True
+
+    def get(self, cache_key):
+        """
+        Look up a reply in memory, then on disk
+
+        Returns:
+            Cached reply, or None
+        """
+        if cache_key is None:
+            return None
+
+        reply = self.memory.get(cache_key)
+        from_disk = False
+        if reply is None and self.disk is not None:
+            try:
+                reply = self.disk.get(cache_key)
+            except sqlite3.Error as e:
+                print(f"Error reading LLM cache: {str(e)}")
+            if reply is not None:
+                from_disk = True
+                self.memory.put(cache_key, reply)
+
+        with self._lock:
+            if reply is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.disk_hits += from_disk
+        return reply
+
+    def put(self, cache_key, reply):
+        """Store a reply in both tiers (ignored for uncacheable turns)"""
+        if cache_key is None or not reply:
+            return
+        self.memory.put(cache_key, reply)
+        if self.disk is not None:
+            try:
+                self.disk.put(cache_key, reply)
+            except sqlite3.Error as e:
+                print(f"Error writing LLM cache: {str(e)}")
+
+    def stats(self):
+        """
+        Get cache counters
+
+        Returns:
+            Dictionary with hits, disk_hits, misses, skipped (uncacheable turns),
+            hit_rate and the memory tier's counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "skipped": self.skipped,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "memory": self.memory.stats(),
+            }
@@ -0,0 +1,230 @@
+"""
+LLM Client - One pooled async OpenAI client shared by every session
+Streams reply text as tokens arrive and falls back to the templated reply on timeout or error
+"""
+
+import asyncio
+import queue
+import threading
+import time
+
+import httpx
+from openai import APITimeoutError, AsyncOpenAI, OpenAIError
+
+
+_DONE = object()
+
+
+class LLMClient:
+    """
+    Chat completions over one pooled HTTP client on a background event loop
+
+    Every session shares the same connection pool, so calls skip the TCP/TLS
+    handshake once the pool is warm. Synchronous callers (Streamlit) get
+    tokens delivered on their own thread; any loop can await the same calls.
+    A call that produces no first token within first_token_timeout, or does
+    not finish within timeout, returns the fallback text instead.
+    """
+
+    def __init__(self, api_key, model="gpt-3.5-turbo", temperature=0.7, max_tokens=500, base_url=None,
+                 timeout=8.0, first_token_timeout=3.0, max_connections=100):
+        """
+        Args:
+            api_key: OpenAI API key
+            model: Chat model name
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens per reply
+            base_url: OpenAI-compatible endpoint (None for api.openai.com), e.g. a local stub server
+            timeout: Seconds allowed for a whole reply
+            first_token_timeout: Seconds allowed until the first token arrives
+            max_connections: Size of the shared connection pool
+        """
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.first_token_timeout = first_token_timeout
+        # Without a key there is nothing to call unless a stub endpoint is configured
+        self.enabled = bool(api_key) or base_url is not None
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"calls": 0, "completed": 0, "fallbacks": 0, "timeouts": 0, "errors": 0}
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-client", daemon=True)
+        self._thread.start()
+
+        self._client = None
+        if self.enabled:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+                timeout=httpx.Timeout(timeout, connect=first_token_timeout)
+            )
+            self._client = AsyncOpenAI(
+                api_key=api_key or "unused",
+                base_url=base_url,
+                http_client=http_client,
+                max_retries=0,
+                timeout=timeout
+            )
+
+    # ----- core ----------------------------------------------------------
+
+    async def stream(self, messages, timeout=None, first_token_timeout=None):
+        """
+        Yield reply text fragments as they arrive (runs on the client's loop)
+
+        Raises:
+            asyncio.TimeoutError: No first token, or no complete reply, in time
+            OpenAIError: The API call failed
+        """
+        start = time.monotonic()
+        deadline = start + (timeout or self.timeout)
+        first_deadline = min(deadline, start + (first_token_timeout or self.first_token_timeout))
+
+        response = await asyncio.wait_for(
+            self._client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+                stream=True
+            ),
+            max(first_deadline - time.monotonic(), 0)
+        )
+
+        received = False
+        try:
+            while True:
+                limit = (deadline if received else first_deadline) - time.monotonic()
+                try:
+                    chunk = await asyncio.wait_for(response.__anext__(), max(limit, 0))
+                except StopAsyncIteration:
+                    break
+                if not chunk.choices:
+                    continue
+                text = chunk.choices[0].delta.content
+                if text:
+                    received = True
+                    yield text
+        finally:
+            # Hands the connection back to the pool (or drops it mid-stream)
+            await response.response.aclose()
+
+    async def _produce(self, messages, sink, timeout):
+        # sink(fragment) per fragment; returns the full text, or raises
+        parts = []
+        async for text in self.stream(messages, timeout):
+            parts.append(text)
+            if sink is not None:
+                sink(text)
+        reply = "".join(parts).strip()
+        if not reply:
+            raise OpenAIError("Empty reply")
+        return reply
+
+    def _record(self, outcome):
+        with self._stats_lock:
+            self._stats["calls"] += 1
+            self._stats[outcome] += 1
+            if outcome in ("timeouts", "errors"):
+                self._stats["fallbacks"] += 1
+
+    def _failed(self, error):
+        if isinstance(error, (asyncio.TimeoutError, queue.Empty, APITimeoutError)):
+            self._record("timeouts")
+        else:
+            self._record("errors")
+            print(f"Error generating LLM reply: {str(error)}")
+
+    # ----- public API ----------------------------------------------------
+
+    def stream_reply(self, messages, fallback, on_text=None, timeout=None):
+        """
+        Generate a reply, reporting the text so far as tokens arrive
+
+        Blocks the calling thread; on_text is called on that thread, so it can
+        update a Streamlit placeholder.
+
+        Args:
+            messages: Chat messages ([{"role": ..., "content": ...}])
+            fallback: Text returned when the model times out or fails
+            on_text: Called with the accumulated text after every token (and
+                with the fallback if the call fails)
+            timeout: Seconds allowed for the whole reply (client default if None)
+
+        Returns:
+            Reply text
+        """
+        if not self.enabled:
+            return fallback
+
+        timeout = timeout or self.timeout
+        fragments = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._produce(messages, fragments.put_nowait, timeout), self._loop
+        )
+        future.add_done_callback(lambda _: fragments.put_nowait(_DONE))
+
+        deadline = time.monotonic() + timeout + 1.0
+        text = ""
+        try:
+            while True:
+                item = fragments.get(timeout=max(deadline - time.monotonic(), 0))
+                if item is _DONE:
+                    break
+                text += item
+                if on_text is not None:
+                    on_text(text)
+            reply = future.result(timeout=0)
+        except Exception as e:
+            future.cancel()
+            self._failed(e)
+            if on_text is not None:
+                on_text(fallback)
+            return fallback
+
+        self._record("completed")
+        return reply
+
+    def submit(self, messages, fallback, timeout=None):
+        """
+        Start a reply in the background
+
+        Returns:
+            concurrent.futures.Future resolving to the reply text, or to the
+            fallback if the model times out or fails
+        """
+        return asyncio.run_coroutine_threadsafe(self._complete(messages, fallback, timeout), self._loop)
+
+    async def complete(self, messages, fallback, timeout=None):
+        """Awaitable reply from any event loop (fallback on timeout or error)"""
+        return await asyncio.wrap_future(self.submit(messages, fallback, timeout))
+
+    async def _complete(self, messages, fallback, timeout):
+        if not self.enabled:
+            return fallback
+        try:
+            reply = await self._produce(messages, None, timeout or self.timeout)
+        except Exception as e:
+            self._failed(e)
+            return fallback
+        self._record("completed")
+        return reply
+
+    def stats(self):
+        """
+        Call counters
+
+        Returns:
+            Dictionary with calls, completed, fallbacks, timeouts and errors
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def close(self):
+        """Close pooled connections and stop the background loop"""
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.close(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
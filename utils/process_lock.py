@@ -0,0 +1,59 @@
+"""
+Process Lock - Keeps a second writer process off a data directory
+Taken by the API server and the maintenance commands (retention, analytics
+export, JSON migration) whenever the storage mode is single-writer
+"""
+
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def lock_data_dir(data_dir):
+    """
+    Hold an exclusive lock on data_dir/server.lock until the returned file is closed
+
+    The json and journal candidate stores are single-writer, and the server's
+    session locks only serialize turns within one process, so a second
+    process on the same data directory is refused.
+
+    Returns:
+        Open lock file (closing it releases the lock)
+
+    Raises:
+        RuntimeError: Another process holds the lock
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    lock_file = open(os.path.join(data_dir, "server.lock"), "a+")
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        lock_file.close()
+        raise RuntimeError(
+            f"Another server or maintenance command is using {data_dir}; several processes may "
+            f"share a data directory only with the sqlite storage mode (and sqlite session store)"
+        )
+    return lock_file
+
+
+def lock_for_storage_mode(data_dir, storage_mode):
+    """
+    Take lock_data_dir() unless the storage mode allows concurrent writers
+
+    Returns:
+        Open lock file, or None in sqlite mode
+
+    Raises:
+        RuntimeError: Another process holds the lock
+    """
+    if storage_mode == "sqlite":
+        return None
+    return lock_data_dir(data_dir)
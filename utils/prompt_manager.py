@@ -47,6 +47,62 @@ class PromptManager:
         prompt_key = stage_mapping.get(stage, "greeting")
         return self.prompts[prompt_key]
     
+    def get_reply_messages(self, stage, user_input, draft_reply):
+        """
+        Chat messages asking the model to phrase a templated reply
+
+        The draft carries everything the reply must say, so the flow stays the
+        same whether the model answers or the draft is used as the fallback.
+
+        Args:
+            stage: Conversation stage the reply belongs to
+            user_input: Candidate message being answered
+            draft_reply: Templated reply for the stage
+
+        Returns:
+            List of {"role", "content"} messages
+        """
+        system_prompt = (
+            self.get_system_prompt(stage)
+            + "\n\nRewrite the draft reply for the candidate in a warm, professional tone. "
+            "Keep every question, name, number and email address from the draft, "
+            "do not ask anything else, and keep it about as short as the draft."
+        )
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"Candidate's message: {user_input}\n\nDraft reply:\n{draft_reply}"}
+        ]
+    
+    def get_question_messages(self, tech_stack, desired_position=None, seniority=None, num_questions=5):
+        """
+        Chat messages asking the model for technical screening questions
+
+        Args:
+            tech_stack: Technologies to ask about (empty to ask about the position only)
+            desired_position: Position the candidate applies for
+            seniority: "junior", "mid", "senior" or None
+            num_questions: Number of questions to ask for
+
+        Returns:
+            List of {"role", "content"} messages
+        """
+        subject = ", ".join(tech_stack) if tech_stack else "the skills the position needs"
+        details = []
+        if desired_position:
+            details.append(f"Position: {desired_position}")
+        if seniority:
+            details.append(f"Level: {seniority}")
+        system_prompt = (
+            self.get_system_prompt("asking_technical_questions")
+            + f"\n\nWrite {num_questions} technical screening questions about {subject}. "
+            "Each question must be answerable in a few sentences in a chat. "
+            "Put one question per line with no numbering and no other text."
+        )
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": "\n".join(details) or "No further details."}
+        ]
+    
     def get_greeting_message(self):
         return """Hello!  Welcome to TalentScout!
 
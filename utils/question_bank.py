@@ -0,0 +1,249 @@
+"""
+Question Bank - Technical questions stored as one data file per technology
+Files are parsed lazily on first use and re-read when they change on disk
+"""
+
+import json
+import marshal
+import os
+import threading
+import time
+from collections import namedtuple
+from collections.abc import Mapping
+
+
+DEFAULT_BANK_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "question_bank")
+GENERIC_NAME = "_generic"
+FILE_SUFFIX = ".json"
+COMPILED_SUFFIX = ".marshal"
+COMPILED_FORMAT = 2
+
+DIFFICULTIES = ("junior", "mid", "senior")
+# Questions without a difficulty suit every level
+ANY_DIFFICULTY = "any"
+
+# Parsed form of one bank file: parallel tuples indexed by question id, plus
+# difficulty -> tuple of question ids
+CompiledQuestions = namedtuple("CompiledQuestions", ["texts", "difficulties", "topics", "buckets"])
+
+
+class QuestionBank(Mapping):
+    """
+    Read-only mapping of technology -> tuple of questions
+
+    <bank_dir>/<tech>.json holds {"questions": [...]} for one technology,
+    each question either a string or {"text", "difficulty", "topic"};
+    files starting with an underscore (e.g. _generic.json) are not
+    technologies. compiled() gives the per-file difficulty index.
+
+    Only the directory listing is read up front. A technology's file is
+    parsed the first time it is looked up, and the result is also written
+    to <bank_dir>/__pycache__ as a marshal file stamped with the source
+    mtime and size, so later processes skip the JSON parse until the file
+    changes.
+
+    Files and the listing are re-checked at most once per reload_interval
+    seconds, so edits, new and deleted technologies show up in a running
+    app without a restart.
+    """
+
+    def __init__(self, bank_dir=None, reload_interval=2.0, use_compiled_cache=True):
+        """
+        Args:
+            bank_dir: Directory with the question files (defaults to question_bank/ in the repo)
+            reload_interval: Minimum seconds between checks of a file for changes
+            use_compiled_cache: Read and write compiled banks under <bank_dir>/__pycache__
+        """
+        self.bank_dir = bank_dir or DEFAULT_BANK_DIR
+        self.cache_dir = os.path.join(self.bank_dir, "__pycache__")
+        self.reload_interval = reload_interval
+        self.use_compiled_cache = use_compiled_cache
+
+        # Incremented whenever the set of technologies changes
+        self.version = 0
+        self._names = frozenset()
+        self._dir_stamp = None
+        self._dir_checked = 0.0
+        # name -> (file stamp, questions, monotonic time of last check)
+        self._entries = {}
+        self._lock = threading.RLock()
+
+        self._scan()
+
+    # ----- mapping interface ---------------------------------------------
+
+    def __getitem__(self, name):
+        if name not in self.names():
+            raise KeyError(name)
+        compiled = self._load(name)
+        if compiled is None:
+            raise KeyError(name)
+        return compiled.texts
+
+    def __contains__(self, name):
+        return name in self.names()
+
+    def __iter__(self):
+        return iter(sorted(self.names()))
+
+    def __len__(self):
+        return len(self.names())
+
+    def names(self):
+        """Return the current set of technology names"""
+        if time.monotonic() - self._dir_checked >= self.reload_interval:
+            with self._lock:
+                self._scan()
+        return self._names
+
+    def compiled(self, name):
+        """
+        Return the compiled questions of a technology
+
+        Returns:
+            CompiledQuestions, or None if the technology has no (valid) file
+        """
+        if name not in self.names():
+            return None
+        return self._load(name)
+
+    @property
+    def generic(self):
+        """Fallback questions not tied to a technology"""
+        compiled = self._load(GENERIC_NAME)
+        return compiled.texts if compiled is not None else ()
+
+    def reload(self):
+        """Drop everything held in memory; files are re-read on next use"""
+        with self._lock:
+            self._entries.clear()
+            self._dir_stamp = None
+            self._scan()
+
+    # ----- loading -------------------------------------------------------
+
+    def _path(self, name):
+        return os.path.join(self.bank_dir, name + FILE_SUFFIX)
+
+    def _scan(self):
+        self._dir_checked = time.monotonic()
+        try:
+            stamp = os.stat(self.bank_dir).st_mtime_ns
+        except OSError as e:
+            print(f"Error reading question bank directory: {str(e)}")
+            return
+
+        if stamp == self._dir_stamp:
+            return
+        self._dir_stamp = stamp
+
+        names = frozenset(
+            entry[:-len(FILE_SUFFIX)] for entry in os.listdir(self.bank_dir)
+            if entry.endswith(FILE_SUFFIX) and not entry.startswith("_")
+        )
+        if names != self._names:
+            for removed in self._names - names:
+                self._entries.pop(removed, None)
+            self._names = names
+            self.version += 1
+
+    def _load(self, name):
+        now = time.monotonic()
+        entry = self._entries.get(name)
+        if entry is not None and now - entry[2] < self.reload_interval:
+            return entry[1]
+
+        with self._lock:
+            try:
+                stat = os.stat(self._path(name))
+            except FileNotFoundError:
+                self._entries.pop(name, None)
+                return None
+            stamp = (stat.st_mtime_ns, stat.st_size)
+
+            if entry is not None and entry[0] == stamp:
+                self._entries[name] = (stamp, entry[1], now)
+                return entry[1]
+
+            questions = self._read_compiled(name, stamp)
+            if questions is None:
+                questions = self._parse(name)
+                if questions is None:
+                    # Keep serving the previous version while a file is invalid (e.g. mid-edit)
+                    questions = entry[1] if entry is not None else None
+                    self._entries[name] = (stamp, questions, now)
+                    return questions
+                self._write_compiled(name, stamp, questions)
+
+            self._entries[name] = (stamp, questions, now)
+            return questions
+
+    def _parse(self, name):
+        try:
+            with open(self._path(name), 'r', encoding='utf-8') as f:
+                document = json.load(f)
+            return compile_questions(document["questions"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Error loading question bank file {name}{FILE_SUFFIX}: {str(e)}")
+            return None
+
+    def _read_compiled(self, name, stamp):
+        if not self.use_compiled_cache:
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, name + COMPILED_SUFFIX), 'rb') as f:
+                version, compiled_stamp, fields = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if version != COMPILED_FORMAT or tuple(compiled_stamp) != stamp:
+            return None
+        return CompiledQuestions(*fields)
+
+    def _write_compiled(self, name, stamp, questions):
+        if not self.use_compiled_cache:
+            return
+        path = os.path.join(self.cache_dir, name + COMPILED_SUFFIX)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                marshal.dump((COMPILED_FORMAT, stamp, tuple(questions)), f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # A read-only deployment simply parses the JSON each time a file changes
+            pass
+
+
+def compile_questions(entries):
+    """
+    Build the compiled form of a list of bank entries
+
+    Args:
+        entries: Question strings or {"text", "difficulty", "topic"} dictionaries
+
+    Returns:
+        CompiledQuestions
+    """
+    texts = []
+    difficulties = []
+    topics = []
+    buckets = {}
+
+    for question_id, entry in enumerate(entries):
+        if isinstance(entry, str):
+            entry = {"text": entry}
+        difficulty = entry.get("difficulty") or ANY_DIFFICULTY
+        if difficulty not in DIFFICULTIES and difficulty != ANY_DIFFICULTY:
+            raise ValueError(f"unknown difficulty {difficulty!r}")
+
+        texts.append(str(entry["text"]))
+        difficulties.append(difficulty)
+        topics.append(entry.get("topic") or "")
+        buckets.setdefault(difficulty, []).append(question_id)
+
+    return CompiledQuestions(
+        tuple(texts),
+        tuple(difficulties),
+        tuple(topics),
+        {difficulty: tuple(ids) for difficulty, ids in buckets.items()},
+    )
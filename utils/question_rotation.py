@@ -0,0 +1,140 @@
+"""
+Question Rotation - Least-exposed question selection across candidates
+Exposure counters are kept next to the candidate store so rotation survives restarts
+"""
+
+import atexit
+import heapq
+import json
+import os
+import random
+import threading
+
+
+class QuestionExposureTracker:
+    """
+    Counts how often each question has been asked and hands out the least-exposed ones
+
+    Every question bucket (technology and difficulty) has its own min-heap
+    of (exposure, random tiebreak, question id) entries and its own lock, so
+    sessions asking about different technologies never wait on each other.
+    Picking k questions pops k entries and pushes them back with updated
+    counts: O(k log n) per pick. A question reachable through several
+    buckets is requeued lazily when its heap entry turns out to be stale.
+
+    Counters are keyed by question text, so they survive reordering or
+    extending the bank files, and are written to <data_dir>/question_exposure.json
+    every save_every picks and at exit.
+    """
+
+    FILENAME = "question_exposure.json"
+
+    def __init__(self, data_dir="data", save_every=50):
+        """
+        Args:
+            data_dir: Directory of the candidate store
+            save_every: Number of picks between writes of the counters
+        """
+        self.path = os.path.join(data_dir, self.FILENAME)
+        self.save_every = save_every
+        self.counts = self._read()
+        self._heaps = {}
+        self._heaps_lock = threading.Lock()
+        self._counts_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._unsaved = 0
+        self._random = random.Random()
+
+        os.makedirs(data_dir, exist_ok=True)
+        atexit.register(self.save)
+
+    def pick(self, key, texts, ids, count, exclude=()):
+        """
+        Take the least-exposed questions of a bucket and count them as exposed
+
+        Args:
+            key: Bucket identifier, e.g. ("python", "senior")
+            texts: Question texts of the technology, indexed by question id
+            ids: Question ids in the bucket
+            count: Number of questions wanted
+            exclude: Question texts that must not be picked (already chosen)
+
+        Returns:
+            List of picked question ids, least exposed first
+        """
+        if count <= 0 or not ids:
+            return []
+
+        heap, lock = self._heap(key, texts, ids)
+        counts = self.counts
+        picked = []
+        with lock:
+            popped = []
+            while heap and len(picked) < count:
+                entry = heapq.heappop(heap)
+                text = texts[entry[2]]
+                exposure = counts.get(text, 0)
+                if entry[0] != exposure:
+                    # The same question was picked through another bucket; requeue at its real count
+                    heapq.heappush(heap, (exposure, entry[1], entry[2]))
+                    continue
+                popped.append(entry)
+                if text not in exclude:
+                    picked.append(entry[2])
+
+            picked_ids = set(picked)
+            with self._counts_lock:
+                for exposure, _, question_id in popped:
+                    if question_id in picked_ids:
+                        exposure = counts.get(texts[question_id], 0) + 1
+                        counts[texts[question_id]] = exposure
+                    heapq.heappush(heap, (exposure, self._random.random(), question_id))
+                self._unsaved += len(picked)
+                due = self._unsaved >= self.save_every
+
+        if due:
+            self.save()
+        return picked
+
+    def exposure(self, question):
+        """Number of times a question has been picked"""
+        return self.counts.get(question, 0)
+
+    def _heap(self, key, texts, ids):
+        with self._heaps_lock:
+            cached = self._heaps.get(key)
+            # Rebuilt when the bank file behind the bucket was reloaded
+            if cached is None or cached[0] is not texts or cached[1] != ids:
+                with self._counts_lock:
+                    heap = [(self.counts.get(texts[i], 0), self._random.random(), i) for i in ids]
+                heapq.heapify(heap)
+                cached = (texts, ids, heap, threading.Lock())
+                self._heaps[key] = cached
+            return cached[2], cached[3]
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading question exposure counters: {str(e)}")
+            return {}
+
+    def save(self):
+        """Write the counters to disk"""
+        with self._save_lock:
+            with self._counts_lock:
+                if not self._unsaved and os.path.exists(self.path):
+                    return
+                snapshot = dict(self.counts)
+                self._unsaved = 0
+            try:
+                # Per process: several API servers may share the data directory
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Error saving question exposure counters: {str(e)}")
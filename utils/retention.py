@@ -0,0 +1,138 @@
+"""
+Retention Purger - Enforces data_retention_until on stored candidate records (GDPR)
+Can run as a background thread or from the command line:
+
+    python -m utils.retention --data-dir data --storage-mode sqlite
+"""
+
+import argparse
+import json
+import threading
+import time
+from datetime import datetime
+
+
+class RetentionPurger:
+    """
+    Deletes candidate records whose retention period has ended
+
+    Works through the expired records in bounded batches. The journal and
+    sqlite backends find them by expiry (an expiry heap, an index), so a
+    batch only touches expired records; the json backend reads and rewrites
+    its whole file for every batch.
+    """
+
+    def __init__(self, data_handler, batch_size=500, max_batches=None):
+        """
+        Args:
+            data_handler: DataHandler whose store is purged
+            batch_size: Maximum records removed per batch (one write or transaction)
+            max_batches: Optional cap on batches per run; the rest waits for the next run
+        """
+        self.data_handler = data_handler
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.last_report = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def purge(self, now=None):
+        """
+        Remove expired records
+
+        Args:
+            now: ISO timestamp treated as the current time (defaults to now)
+
+        Returns:
+            Report dictionary with purged count, batches and duration
+        """
+        started_at = datetime.now()
+        now = now or started_at.isoformat()
+        start = time.perf_counter()
+        purged = 0
+        batches = 0
+
+        while self.max_batches is None or batches < self.max_batches:
+            removed = self.data_handler.purge_expired(now, self.batch_size)
+            if removed == 0:
+                break
+            purged += removed
+            batches += 1
+            if removed < self.batch_size:
+                break
+
+        self.last_report = {
+            "started_at": started_at.isoformat(),
+            "cutoff": now,
+            "purged": purged,
+            "batches": batches,
+            "duration_seconds": round(time.perf_counter() - start, 6),
+        }
+        return self.last_report
+
+    def start_background(self, interval_seconds=3600):
+        """
+        Run purges periodically on a daemon thread
+
+        Args:
+            interval_seconds: Seconds between purge runs
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(interval_seconds,),
+            name="retention-purger",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Stop the background thread"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self, interval_seconds):
+        while not self._stop_event.is_set():
+            try:
+                self.purge()
+            except Exception as e:
+                print(f"Error purging expired candidate data: {str(e)}")
+            self._stop_event.wait(interval_seconds)
+
+
+def main(argv=None):
+    """Command-line entry point: run one purge and print its report"""
+    from config.settings import RETENTION_CONFIG, STORAGE_CONFIG
+    from utils.data_handler import DataHandler
+    from utils.process_lock import lock_for_storage_mode
+
+    parser = argparse.ArgumentParser(description="Purge candidate records past their retention date")
+    parser.add_argument("--data-dir", default=STORAGE_CONFIG["data_dir"])
+    parser.add_argument("--storage-mode", default=STORAGE_CONFIG["storage_mode"])
+    parser.add_argument("--batch-size", type=int, default=RETENTION_CONFIG["batch_size"])
+    parser.add_argument("--max-batches", type=int, default=None)
+    parser.add_argument("--now", default=None, help="ISO timestamp to use as the cutoff")
+    args = parser.parse_args(argv)
+
+    # A running app or server on a json/journal store would not see the purge
+    try:
+        process_lock = lock_for_storage_mode(args.data_dir, args.storage_mode)
+    except RuntimeError as e:
+        print(f"Error purging expired candidate data: {str(e)}")
+        return
+
+    try:
+        data_handler = DataHandler(data_dir=args.data_dir, storage_mode=args.storage_mode)
+        purger = RetentionPurger(data_handler, batch_size=args.batch_size, max_batches=args.max_batches)
+        print(json.dumps(purger.purge(now=args.now), indent=2))
+    finally:
+        if process_lock is not None:
+            process_lock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Session Stores - Where the HTTP server keeps ConversationState between requests
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class SessionConflict(Exception):
+    """A session was changed by another request since it was read"""
+
+
+class InMemorySessionStore:
+    """
+    Sessions in a process-local dictionary, expired after ttl_seconds of inactivity
+
+    Fast enough to call from the event loop directly (blocking = False).
+    Sessions are lost on restart and not shared between processes, so the
+    server's own locks already serialize the turns of a session and
+    revisions are not checked.
+    """
+
+    blocking = False
+
+    def __init__(self, ttl_seconds=3600, max_sessions=100000):
+        """
+        Args:
+            ttl_seconds: Seconds of inactivity after which a session is dropped
+            max_sessions: Maximum live sessions; the least recently used are dropped beyond it
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        # session_id -> (last access, state dictionary)
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        """Return the state dictionary of a session, or None if unknown or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if now - entry[0] > self.ttl_seconds:
+                del self._sessions[session_id]
+                return None
+            self._sessions.move_to_end(session_id)
+            return entry[1]
+
+    def put(self, session_id, state, revision=None):
+        """Store the state dictionary of a session"""
+        with self._lock:
+            self._sessions[session_id] = (time.monotonic(), state)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def delete(self, session_id, revision=None):
+        """Forget a session"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def purge_expired(self):
+        """
+        Delete sessions past their TTL
+
+        Returns:
+            Number of deleted sessions
+        """
+        cutoff = time.monotonic() - self.ttl_seconds
+        with self._lock:
+            expired = [session_id for session_id, (accessed, _) in self._sessions.items() if accessed < cutoff]
+            for session_id in expired:
+                del self._sessions[session_id]
+        return len(expired)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class SqliteSessionStore:
+    """
+    Sessions in a SQLite database, shared by every server process on a host
+
+    Calls block on disk, so the server runs them in its executor
+    (blocking = True). Each session carries a revision: get() returns it as
+    "_revision", and put()/delete() given that revision raise
+    SessionConflict if another process has changed the session meanwhile,
+    so two processes never both apply a turn to the same state.
+    """
+
+    blocking = True
+
+    def __init__(self, path, ttl_seconds=3600):
+        """
+        Args:
+            path: Database file
+            ttl_seconds: Seconds of inactivity after which a session is dropped
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL, "
+                "revision INTEGER NOT NULL DEFAULT 0)"
+            )
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(sessions)")]
+            if "revision" not in columns:
+                conn.execute("ALTER TABLE sessions ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at)")
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id):
+        """Return the state dictionary of a session, or None if unknown or expired"""
+        row = self._connection().execute(
+            "SELECT state, revision FROM sessions WHERE session_id = ? AND updated_at >= ?",
+            (session_id, time.time() - self.ttl_seconds)
+        ).fetchone()
+        if row is None:
+            return None
+        state = json.loads(row[0])
+        state["_revision"] = row[1]
+        return state
+
+    def put(self, session_id, state, revision=None):
+        """
+        Store the state dictionary of a session
+
+        Args:
+            session_id: Session identifier
+            state: State dictionary
+            revision: "_revision" the state was read at (None stores unconditionally)
+
+        Raises:
+            SessionConflict: The session changed since that revision
+        """
+        state = json.dumps({key: value for key, value in state.items() if key != "_revision"})
+        with self._connection() as conn:
+            if revision is None:
+                conn.execute(
+                    "INSERT INTO sessions (session_id, state, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(session_id) DO UPDATE SET state = excluded.state, "
+                    "updated_at = excluded.updated_at, revision = revision + 1",
+                    (session_id, state, time.time())
+                )
+                return
+            cursor = conn.execute(
+                "UPDATE sessions SET state = ?, updated_at = ?, revision = revision + 1 "
+                "WHERE session_id = ? AND revision = ?",
+                (state, time.time(), session_id, revision)
+            )
+        if cursor.rowcount == 0:
+            raise SessionConflict(session_id)
+
+    def delete(self, session_id, revision=None):
+        """
+        Forget a session
+
+        Raises:
+            SessionConflict: A revision was given and the session changed since
+        """
+        with self._connection() as conn:
+            if revision is None:
+                conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                return
+            cursor = conn.execute(
+                "DELETE FROM sessions WHERE session_id = ? AND revision = ?", (session_id, revision)
+            )
+        if cursor.rowcount == 0:
+            raise SessionConflict(session_id)
+
+    def purge_expired(self):
+        """
+        Delete sessions past their TTL
+
+        Returns:
+            Number of deleted sessions
+        """
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM sessions WHERE updated_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            return cursor.rowcount
+
+    def __len__(self):
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM sessions WHERE updated_at >= ?", (time.time() - self.ttl_seconds,)
+        ).fetchone()[0]
+
+
+def create_session_store(kind, data_dir="data", ttl_seconds=3600):
+    """
+    Build a session store
+
+    Args:
+        kind: "memory" or "sqlite"
+        data_dir: Directory for the sqlite database
+        ttl_seconds: Session inactivity timeout
+
+    Returns:
+        Session store instance
+    """
+    if kind == "memory":
+        return InMemorySessionStore(ttl_seconds=ttl_seconds)
+    if kind == "sqlite":
+        return SqliteSessionStore(os.path.join(data_dir, "sessions.db"), ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown session store: {kind}")
@@ -0,0 +1,156 @@
+"""
+Speculative Questions - Generates model-tailored technical questions in the background
+The candidate starts on bank questions at once; model questions replace the
+not-yet-asked ones if they arrive before the deadline
+"""
+
+import re
+import threading
+import time
+
+from utils.prompt_manager import PromptManager
+from utils.tech_stack_questions import seniority_for_years
+
+
+# "1. ", "2) ", "- ", "* ", "Q3: " in front of generated questions
+QUESTION_PREFIX_PATTERN = re.compile(r"^\s*(?:(?:q(?:uestion)?\s*)?\d+\s*[.):-]|[-*•])\s*", re.IGNORECASE)
+MIN_QUESTION_LENGTH = 15
+
+
+def parse_questions(text):
+    """
+    Split a model reply into questions, one per line
+
+    Returns:
+        List of question strings (numbering and bullets removed)
+    """
+    questions = []
+    for line in (text or "").splitlines():
+        line = QUESTION_PREFIX_PATTERN.sub("", line).strip().strip("*").strip()
+        if len(line) >= MIN_QUESTION_LENGTH and line.endswith("?") and line not in questions:
+            questions.append(line)
+    return questions
+
+
+class SpeculativeQuestionGenerator:
+    """
+    Background model question generation per session, with a hard deadline
+
+    start() is called as soon as the tech stack is parsed (warm_up() even
+    earlier, once the desired position is known) and never blocks. collect()
+    is non-blocking too: it hands over the model's questions once they are
+    ready, and gives up for good once the deadline has passed, so the bank
+    questions stay. Requests run on the shared LLMClient; warm-up also opens
+    its pooled connection before the tech stack request needs it.
+    """
+
+    def __init__(self, llm_client, prompt_manager=None, deadline=20.0, warm_up=True):
+        """
+        Args:
+            llm_client: LLMClient used for generation
+            prompt_manager: PromptManager building the generation prompt (a new one by default)
+            deadline: Seconds after start() within which model questions are accepted
+            warm_up: Whether warm_up() starts position-based generation
+        """
+        self.llm_client = llm_client
+        self.prompt_manager = prompt_manager or PromptManager()
+        self.deadline = deadline
+        self.warm_up_enabled = warm_up
+
+        # session token -> {"stack": (future, started at), "position": (future, started at)}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._stats = {"started": 0, "used": 0, "used_warm_up": 0, "expired": 0}
+
+    def warm_up(self, session_token, desired_position, years_of_experience=None, num_questions=5):
+        """Start generating questions for a position before the tech stack is known"""
+        if not self.warm_up_enabled or not desired_position:
+            return
+        with self._lock:
+            if "position" in self._pending.get(session_token, {}):
+                return
+        self._submit(session_token, "position", [], desired_position, years_of_experience, num_questions)
+
+    def start(self, session_token, tech_stack, desired_position=None, years_of_experience=None, num_questions=5):
+        """Start generating questions for a parsed tech stack"""
+        self._prune()
+        self._submit(session_token, "stack", tech_stack, desired_position, years_of_experience, num_questions)
+        with self._lock:
+            self._stats["started"] += 1
+
+    def _submit(self, session_token, kind, tech_stack, desired_position, years_of_experience, num_questions):
+        messages = self.prompt_manager.get_question_messages(
+            tech_stack, desired_position, seniority_for_years(years_of_experience), num_questions
+        )
+        future = self.llm_client.submit(messages, None, timeout=self.deadline)
+        with self._lock:
+            self._pending.setdefault(session_token, {})[kind] = (future, time.monotonic())
+
+    def collect(self, session_token):
+        """
+        Take the model questions of a session if they are ready
+
+        Never waits. Once the tech stack request is past its deadline, the
+        warm-up questions are used if they are ready; otherwise the session
+        keeps its bank questions and nothing is returned again.
+
+        Returns:
+            List of questions, or None if none are available (yet)
+        """
+        with self._lock:
+            entries = self._pending.get(session_token)
+            if not entries or "stack" not in entries:
+                return None
+
+            future, started = entries["stack"]
+            if future.done():
+                questions = parse_questions(future.result())
+                if questions:
+                    del self._pending[session_token]
+                    self._stats["used"] += 1
+                    return questions
+            elif time.monotonic() - started < self.deadline:
+                return None
+
+            # Tech stack questions failed or missed the deadline
+            del self._pending[session_token]
+            future.cancel()
+            warm = entries.get("position")
+            if warm is not None and warm[0].done():
+                questions = parse_questions(warm[0].result())
+                if questions:
+                    self._stats["used_warm_up"] += 1
+                    return questions
+            elif warm is not None:
+                warm[0].cancel()
+            self._stats["expired"] += 1
+            return None
+
+    def discard(self, session_token):
+        """Forget a session (e.g. when it ends before questions are collected)"""
+        with self._lock:
+            entries = self._pending.pop(session_token, {})
+        for future, _ in entries.values():
+            future.cancel()
+
+    def _prune(self):
+        # Sessions abandoned before collect() would otherwise stay forever
+        cutoff = time.monotonic() - 2 * self.deadline
+        with self._lock:
+            stale = [
+                token for token, entries in self._pending.items()
+                if all(started < cutoff for _, started in entries.values())
+            ]
+            for token in stale:
+                for future, _ in self._pending.pop(token).values():
+                    future.cancel()
+
+    def stats(self):
+        """
+        Generation counters
+
+        Returns:
+            Dictionary with started, used, used_warm_up, expired and pending
+        """
+        with self._lock:
+            return dict(self._stats, pending=len(self._pending))
@@ -0,0 +1,1394 @@
+"""
+Storage backends - Persistence layer used by DataHandler
+Each backend stores the same candidate records; they differ in how writes hit the disk
+A json-mode candidates.json is imported into the sqlite store on request:
+
+    python -m utils.storage --data-dir data [--shred]
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class JsonFileStore:
+    """
+    Original storage layout: a single JSON document rewritten on every write
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.candidates_file = os.path.join(data_dir, "candidates.json")
+        self._lock = threading.RLock()
+
+        if not os.path.exists(self.candidates_file):
+            self._initialize_storage()
+
+    def _initialize_storage(self):
+        """Initialize empty storage file"""
+        initial_data = {
+            "candidates": [],
+            "metadata": {
+                "created_at": datetime.now().isoformat(),
+                "total_candidates": 0,
+                "last_updated": datetime.now().isoformat()
+            }
+        }
+
+        self._write(initial_data)
+
+    def _read(self):
+        with open(self.candidates_file, 'r') as f:
+            return json.load(f)
+
+    def _write(self, storage):
+        with open(self.candidates_file, 'w') as f:
+            json.dump(storage, f, indent=2)
+
+    def append_records(self, records):
+        """
+        Append records to the store
+
+        Args:
+            records: List of candidate record dictionaries
+        """
+        with self._lock:
+            storage = self._read()
+            storage["candidates"].extend(records)
+            storage["metadata"]["total_candidates"] = len(storage["candidates"])
+            storage["metadata"]["last_updated"] = datetime.now().isoformat()
+            self._write(storage)
+
+    def upsert_records(self, records):
+        """
+        Insert or replace records keyed on candidate_id
+
+        Args:
+            records: List of candidate record dictionaries
+
+        Returns:
+            One result dictionary (candidate_id, version, written) per record
+        """
+        with self._lock:
+            storage = self._read()
+            latest = {c.get("candidate_id"): c for c in storage["candidates"]}
+            results = []
+            changed = False
+
+            for record in records:
+                candidate_id = record.get("candidate_id")
+                result = _resolve_upsert(latest.get(candidate_id), record)
+                results.append(result)
+                if result["written"]:
+                    storage["candidates"] = [
+                        c for c in storage["candidates"]
+                        if c.get("candidate_id") != candidate_id
+                    ]
+                    storage["candidates"].append(record)
+                    latest[candidate_id] = record
+                    changed = True
+
+            if changed:
+                storage["metadata"]["total_candidates"] = len(storage["candidates"])
+                storage["metadata"]["last_updated"] = datetime.now().isoformat()
+                self._write(storage)
+
+            return results
+
+    def read_all(self):
+        """
+        Return every stored record
+
+        Returns:
+            List of candidate record dictionaries
+        """
+        with self._lock:
+            return self._read()["candidates"]
+
+    def iter_records(self, filters=None, since=None, until=None, cursor=None):
+        """
+        Yield matching records with a cursor that resumes after each one
+
+        The single JSON document cannot be parsed incrementally, so this
+        still loads the file once; it exists so callers page the same way
+        across backends. Records are sorted by their cursor key first:
+        storage order is commit order, which differs from submission order
+        when queued saves commit after later synchronous ones.
+
+        Args:
+            filters: Dictionary of field -> required value
+            since: Minimum submission_timestamp (inclusive, ISO format)
+            until: Maximum submission_timestamp (exclusive, ISO format)
+            cursor: Position returned with a previously yielded record
+
+        Yields:
+            (record, cursor) pairs in (submission_timestamp, candidate_id) order
+        """
+        after = (cursor["t"], cursor["id"]) if cursor else None
+
+        for record in sorted(self.read_all(), key=_record_key):
+            key = _record_key(record)
+            if after is not None and key <= after:
+                continue
+            if _matches(record, filters, since, until):
+                yield record, {"t": key[0], "id": key[1]}
+
+    def find(self, candidate_id):
+        """
+        Return the records stored under a candidate ID
+
+        Args:
+            candidate_id: Hashed candidate identifier
+
+        Returns:
+            List of matching records (oldest first)
+        """
+        return [c for c in self.read_all() if c.get("candidate_id") == candidate_id]
+
+    def remove(self, candidate_id):
+        """
+        Remove every record stored under a candidate ID
+
+        Args:
+            candidate_id: Hashed candidate identifier
+
+        Returns:
+            Number of records removed
+        """
+        return self.remove_many([candidate_id])[candidate_id]
+
+    def remove_many(self, candidate_ids):
+        """
+        Remove every record stored under any of the candidate IDs in one rewrite
+
+        Args:
+            candidate_ids: Iterable of hashed candidate identifiers
+
+        Returns:
+            Dictionary of candidate ID -> number of records removed
+        """
+        removed = {candidate_id: 0 for candidate_id in candidate_ids}
+
+        with self._lock:
+            storage = self._read()
+            kept = []
+            for c in storage["candidates"]:
+                if c.get("candidate_id") in removed:
+                    removed[c["candidate_id"]] += 1
+                else:
+                    kept.append(c)
+
+            if len(kept) < len(storage["candidates"]):
+                storage["candidates"] = kept
+                storage["metadata"]["total_candidates"] = len(storage["candidates"])
+                storage["metadata"]["last_updated"] = datetime.now().isoformat()
+                self._write(storage)
+
+        return removed
+
+    def purge_expired(self, now, limit):
+        """
+        Remove up to `limit` records whose retention date has passed
+
+        Args:
+            now: ISO timestamp to compare retention dates against
+            limit: Maximum number of records to remove
+
+        Returns:
+            Candidate IDs of the removed records
+        """
+        with self._lock:
+            storage = self._read()
+            expired = sorted(
+                (c["data_retention_until"], i)
+                for i, c in enumerate(storage["candidates"])
+                if c.get("data_retention_until") and c["data_retention_until"] <= now
+            )[:limit]
+            if not expired:
+                return []
+
+            drop = {i for _, i in expired}
+            purged = [storage["candidates"][i].get("candidate_id") for _, i in expired]
+            storage["candidates"] = [c for i, c in enumerate(storage["candidates"]) if i not in drop]
+            storage["metadata"]["total_candidates"] = len(storage["candidates"])
+            storage["metadata"]["last_updated"] = datetime.now().isoformat()
+            self._write(storage)
+
+            return purged
+
+    def metadata(self):
+        """Return the storage metadata counters"""
+        with self._lock:
+            return self._read()["metadata"]
+
+
+class CandidateIndex:
+    """
+    Persistent candidate_id -> record location index for the journal store
+
+    Locations are (file, byte offset, byte length, retention expiry) tuples
+    where file is "s" (snapshot) or "j" (journal). The index lives in memory
+    and is persisted as an append-only log, so keeping it current costs one
+    small append per write. The log is rewritten whole only when the journal
+    is folded into a snapshot or when it has to be rebuilt.
+
+    A min-heap over the expiry dates lets the retention purge find expired
+    records without scanning the store.
+    """
+
+    def __init__(self, index_file):
+        self.index_file = index_file
+        self.locations = {}
+        self.generation = None
+        self.journal_end = 0
+        self._expiry_heap = []
+
+    def load(self):
+        """
+        Load the index log into memory
+
+        Returns:
+            True if the log was read completely, False if it is missing or corrupted
+        """
+        self.locations = {}
+        self.generation = None
+        self.journal_end = 0
+
+        if not os.path.exists(self.index_file):
+            return False
+
+        try:
+            with open(self.index_file, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    entry = json.loads(line)
+                    if "_index" in entry:
+                        self.generation = entry["_index"]["generation"]
+                        self.journal_end = entry["_index"]["journal_end"]
+                    elif "add" in entry:
+                        loc = tuple(entry["loc"])
+                        if len(loc) != 4:
+                            # Written before locations carried an expiry date
+                            return False
+                        self.locations.setdefault(entry["add"], []).append(loc)
+                        self.journal_end = entry.get("end", self.journal_end)
+                    elif "drop" in entry:
+                        self.locations.pop(entry["drop"], None)
+                    elif "unloc" in entry:
+                        self._discard(entry["unloc"], tuple(entry["loc"]))
+        except (ValueError, KeyError, TypeError):
+            return False
+
+        self._build_expiry_heap()
+        return self.generation is not None
+
+    def reset(self, generation, locations, journal_end):
+        """Replace the whole index and rewrite its log"""
+        self.generation = generation
+        self.locations = locations
+        self.journal_end = journal_end
+        self._build_expiry_heap()
+
+        lines = [json.dumps({"_index": {"generation": generation, "journal_end": journal_end}})]
+        for candidate_id, locs in locations.items():
+            lines.extend(json.dumps({"add": candidate_id, "loc": list(loc)}) for loc in locs)
+        _atomic_write(self.index_file, "\n".join(lines) + "\n")
+
+    def add(self, entries, journal_end):
+        """
+        Record new locations
+
+        Args:
+            entries: List of (candidate_id, location) pairs
+            journal_end: Journal size after the write
+        """
+        for candidate_id, loc in entries:
+            self.locations.setdefault(candidate_id, []).append(loc)
+            self._push_expiry(candidate_id, loc)
+        self.journal_end = journal_end
+
+        self._append([{"add": cid, "loc": list(loc), "end": journal_end} for cid, loc in entries])
+
+    def drop_many(self, candidate_ids):
+        """Forget every location of the given candidate IDs"""
+        for candidate_id in candidate_ids:
+            self.locations.pop(candidate_id, None)
+        self._append([{"drop": candidate_id} for candidate_id in candidate_ids])
+
+    def replace(self, entries, journal_end):
+        """
+        Point candidate IDs at new locations only
+
+        Args:
+            entries: List of (candidate_id, location) pairs
+            journal_end: Journal size after the write
+        """
+        lines = []
+        for candidate_id, loc in entries:
+            self.locations[candidate_id] = [loc]
+            self._push_expiry(candidate_id, loc)
+            lines.append({"drop": candidate_id})
+            lines.append({"add": candidate_id, "loc": list(loc), "end": journal_end})
+        self.journal_end = journal_end
+
+        self._append(lines)
+
+    def get(self, candidate_id):
+        return self.locations.get(candidate_id, [])
+
+    def expired(self, now, limit):
+        """
+        Return up to `limit` live locations whose retention date has passed
+
+        Heap entries for records that were erased or replaced since they
+        were pushed are discarded on the way.
+
+        Args:
+            now: ISO timestamp to compare retention dates against
+            limit: Maximum number of locations to return
+
+        Returns:
+            List of (candidate_id, location) pairs, earliest expiry first
+        """
+        found = []
+        live = []
+
+        while self._expiry_heap and len(found) < limit:
+            expiry, candidate_id, loc = self._expiry_heap[0]
+            if expiry > now:
+                break
+            heapq.heappop(self._expiry_heap)
+            if loc in self.locations.get(candidate_id, []):
+                found.append((candidate_id, loc))
+                live.append((expiry, candidate_id, loc))
+
+        # Keep live entries until the caller has actually removed them
+        for entry in live:
+            heapq.heappush(self._expiry_heap, entry)
+
+        return found
+
+    def remove_locations(self, entries):
+        """
+        Forget individual locations
+
+        Args:
+            entries: List of (candidate_id, location) pairs
+        """
+        for candidate_id, loc in entries:
+            self._discard(candidate_id, loc)
+        self._append([{"unloc": cid, "loc": list(loc)} for cid, loc in entries])
+
+    def _discard(self, candidate_id, loc):
+        locs = self.locations.get(candidate_id)
+        if locs and loc in locs:
+            locs.remove(loc)
+            if not locs:
+                del self.locations[candidate_id]
+
+    def _push_expiry(self, candidate_id, loc):
+        if loc[3]:
+            heapq.heappush(self._expiry_heap, (loc[3], candidate_id, loc))
+
+    def _build_expiry_heap(self):
+        self._expiry_heap = [
+            (loc[3], candidate_id, loc)
+            for candidate_id, locs in self.locations.items()
+            for loc in locs
+            if loc[3]
+        ]
+        heapq.heapify(self._expiry_heap)
+
+    def _append(self, entries):
+        payload = "".join(json.dumps(entry) + "\n" for entry in entries)
+        with open(self.index_file, 'a') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class JournalStore:
+    """
+    Append-only storage: every save appends one line to a JSONL journal
+
+    The current view is the latest snapshot plus a replay of the journal.
+    Every `snapshot_interval` journal entries the view is folded into a new
+    snapshot and the journal starts over, so replay cost stays bounded.
+    Metadata counters live in a small sidecar file instead of the data file.
+
+    A CandidateIndex maps each candidate_id to the byte ranges of its lines,
+    so lookups and erasure touch only that candidate's records. Erased lines
+    are overwritten with blanks in place, which removes the data from disk
+    without rewriting the rest of the file.
+    """
+
+    def __init__(self, data_dir, snapshot_interval=500):
+        self.data_dir = data_dir
+        self.snapshot_interval = snapshot_interval
+        self.journal_file = os.path.join(data_dir, "candidates.journal.jsonl")
+        self.snapshot_file = os.path.join(data_dir, "candidates.snapshot.jsonl")
+        self.meta_file = os.path.join(data_dir, "candidates.meta.json")
+        self.index = CandidateIndex(os.path.join(data_dir, "candidates.index.jsonl"))
+        self._lock = threading.RLock()
+
+        if not os.path.exists(self.meta_file):
+            self._initialize_storage()
+
+        self._load_index()
+
+    def _initialize_storage(self):
+        """Create an empty snapshot, journal, index and sidecar"""
+        now = datetime.now().isoformat()
+        self._write_meta({
+            "created_at": now,
+            "total_candidates": 0,
+            "last_updated": now,
+            "generation": 0,
+            "journal_entries": 0,
+            "last_snapshot": None
+        })
+        self._write_snapshot([], generation=0)
+        journal_end = self._reset_journal(generation=0)
+        self.index.reset(0, {}, journal_end)
+
+    # ----- sidecar -------------------------------------------------------
+
+    def _read_meta(self):
+        with open(self.meta_file, 'r') as f:
+            return json.load(f)
+
+    def _write_meta(self, meta):
+        _atomic_write(self.meta_file, json.dumps(meta, indent=2))
+
+    # ----- snapshot / journal files -------------------------------------
+
+    def _path(self, file_key):
+        return self.snapshot_file if file_key == "s" else self.journal_file
+
+    def _write_snapshot(self, records, generation):
+        """Write a snapshot and return the locations of its records"""
+        lines = [json.dumps({"_snapshot": {"generation": generation}}).encode() + b"\n"]
+        locations = {}
+        offset = len(lines[0])
+
+        for record in records:
+            line = json.dumps(record).encode() + b"\n"
+            locations.setdefault(record.get("candidate_id"), []).append(
+                ("s", offset, len(line), record.get("data_retention_until"))
+            )
+            lines.append(line)
+            offset += len(line)
+
+        _atomic_write(self.snapshot_file, b"".join(lines))
+        return locations
+
+    def _reset_journal(self, generation):
+        """Start an empty journal and return its size"""
+        header = json.dumps({"_journal": {"generation": generation}}).encode() + b"\n"
+        _atomic_write(self.journal_file, header)
+        return len(header)
+
+    def _append_journal(self, entries):
+        """Append journal entries and return (offset, length) of each line"""
+        lines = [json.dumps(entry).encode() + b"\n" for entry in entries]
+        spans = []
+
+        with open(self.journal_file, 'r+b') as f:
+            offset = _truncate_torn_tail(f)
+            for line in lines:
+                spans.append((offset, len(line)))
+                offset += len(line)
+            f.write(b"".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+        return spans
+
+    def _scan(self, file_key, start=0):
+        """Yield (offset, length, entry) for every non-blank line of a data file"""
+        path = self._path(file_key)
+        if not os.path.exists(path):
+            return
+
+        with open(path, 'rb') as f:
+            offset = f.seek(start)
+            for line in f:
+                length = len(line)
+                if line.strip():
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-append, or a line being erased right now
+                        offset += length
+                        continue
+                    yield offset, length, entry
+                offset += length
+
+    def _replay(self, with_locations=False):
+        """Rebuild the current view (and optionally its index) from the snapshot and the journal"""
+        records = []
+        locations = {}
+        snapshot_generation = 0
+        journal_end = 0
+
+        for offset, length, entry in self._scan("s"):
+            if "_snapshot" in entry:
+                snapshot_generation = entry["_snapshot"]["generation"]
+            else:
+                records.append(entry)
+                locations.setdefault(entry.get("candidate_id"), []).append(
+                    ("s", offset, length, entry.get("data_retention_until"))
+                )
+
+        for offset, length, entry in self._scan("j"):
+            if "_journal" in entry:
+                # Journal already folded into a newer snapshot (crash between the two writes)
+                if entry["_journal"]["generation"] < snapshot_generation:
+                    break
+            elif entry.get("op") == "put":
+                record = entry["record"]
+                records.append(record)
+                locations.setdefault(record.get("candidate_id"), []).append(
+                    ("j", offset, length, record.get("data_retention_until"))
+                )
+            journal_end = offset + length
+
+        if with_locations:
+            return records, locations, snapshot_generation, journal_end
+        return records
+
+    # ----- index maintenance ---------------------------------------------
+
+    def _load_index(self):
+        """Load the index, rebuilding it if it is missing, stale or corrupted"""
+        with self._lock:
+            meta = self._read_meta()
+            journal_size = os.path.getsize(self.journal_file) if os.path.exists(self.journal_file) else 0
+
+            if (not self.index.load()
+                    or self.index.generation != meta.get("generation", 0)
+                    or self.index.journal_end != journal_size):
+                self.rebuild_index()
+
+    def rebuild_index(self):
+        """
+        Rebuild the candidate index by scanning the snapshot and the journal
+
+        Returns:
+            Number of indexed candidate IDs
+        """
+        with self._lock:
+            _, locations, generation, journal_end = self._replay(with_locations=True)
+            self.index.reset(generation, locations, journal_end)
+            return len(locations)
+
+    def _read_location(self, loc):
+        file_key, offset, length = loc[:3]
+        with open(self._path(file_key), 'rb') as f:
+            f.seek(offset)
+            entry = json.loads(f.read(length))
+        return entry["record"] if file_key == "j" else entry
+
+    def _erase_locations(self, locs):
+        """Overwrite record lines with blanks, keeping file offsets stable"""
+        for file_key in ("s", "j"):
+            spans = [(loc[1], loc[2]) for loc in locs if loc[0] == file_key]
+            if not spans:
+                continue
+            with open(self._path(file_key), 'r+b') as f:
+                for offset, length in spans:
+                    f.seek(offset)
+                    f.write(b" " * (length - 1) + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def snapshot(self):
+        """
+        Fold the journal into a new snapshot and start a fresh journal
+
+        Returns:
+            Number of records in the new snapshot
+        """
+        with self._lock:
+            records = self._replay()
+            meta = self._read_meta()
+            generation = meta.get("generation", 0) + 1
+
+            locations = self._write_snapshot(records, generation)
+            journal_end = self._reset_journal(generation)
+            self.index.reset(generation, locations, journal_end)
+
+            meta["generation"] = generation
+            meta["journal_entries"] = 0
+            meta["total_candidates"] = len(records)
+            meta["last_snapshot"] = datetime.now().isoformat()
+            self._write_meta(meta)
+
+            return len(records)
+
+    # ----- backend interface ---------------------------------------------
+
+    def append_records(self, records):
+        """
+        Append records to the journal
+
+        Args:
+            records: List of candidate record dictionaries
+        """
+        with self._lock:
+            spans = self._append_journal([{"op": "put", "record": r} for r in records])
+            journal_end = spans[-1][0] + spans[-1][1] if spans else self.index.journal_end
+            self.index.add(
+                [(r.get("candidate_id"), ("j", offset, length, r.get("data_retention_until")))
+                 for r, (offset, length) in zip(records, spans)],
+                journal_end
+            )
+
+            meta = self._read_meta()
+            meta["total_candidates"] += len(records)
+            meta["journal_entries"] += len(records)
+            meta["last_updated"] = datetime.now().isoformat()
+            self._write_meta(meta)
+
+            if meta["journal_entries"] >= self.snapshot_interval:
+                self.snapshot()
+
+    def upsert_records(self, records):
+        """
+        Insert or replace records keyed on candidate_id
+
+        New versions are appended to the journal first; the lines of the
+        versions they replace are blanked afterwards.
+
+        Args:
+            records: List of candidate record dictionaries
+
+        Returns:
+            One result dictionary (candidate_id, version, written) per record
+        """
+        with self._lock:
+            pending = {}
+            results = []
+
+            for record in records:
+                candidate_id = record.get("candidate_id")
+                if candidate_id in pending:
+                    latest = pending[candidate_id]
+                else:
+                    existing = self.find(candidate_id)
+                    latest = existing[-1] if existing else None
+                result = _resolve_upsert(latest, record)
+                results.append(result)
+                if result["written"]:
+                    pending[candidate_id] = record
+
+            if not pending:
+                return results
+
+            replaced = {cid: list(self.index.get(cid)) for cid in pending}
+            written = list(pending.values())
+            spans = self._append_journal([{"op": "put", "record": r} for r in written])
+            journal_end = spans[-1][0] + spans[-1][1]
+
+            self._erase_locations([loc for locs in replaced.values() for loc in locs])
+            self.index.replace(
+                [(r.get("candidate_id"), ("j", offset, length, r.get("data_retention_until")))
+                 for r, (offset, length) in zip(written, spans)],
+                journal_end
+            )
+
+            meta = self._read_meta()
+            meta["total_candidates"] += len(written) - sum(len(locs) for locs in replaced.values())
+            meta["journal_entries"] += len(written)
+            meta["last_updated"] = datetime.now().isoformat()
+            self._write_meta(meta)
+
+            if meta["journal_entries"] >= self.snapshot_interval:
+                self.snapshot()
+
+            return results
+
+    def read_all(self):
+        """
+        Return every stored record
+
+        Returns:
+            List of candidate record dictionaries
+        """
+        with self._lock:
+            return self._replay()
+
+    def iter_records(self, filters=None, since=None, until=None, cursor=None):
+        """
+        Stream matching records straight from the snapshot and journal files
+
+        Erased and replaced records are blank lines, so every record line
+        on disk is live and nothing has to be held in memory. A cursor
+        resumes at its byte offset while no snapshot has been taken since.
+        Snapshots keep records in storage order, so after one the cursor's
+        record is looked up and iteration resumes right after it. Only if
+        that record has since been erased or replaced are the remaining
+        records sorted by (submission_timestamp, candidate_id) and resumed
+        past the cursor's key.
+
+        Args:
+            filters: Dictionary of field -> required value
+            since: Minimum submission_timestamp (inclusive, ISO format)
+            until: Maximum submission_timestamp (exclusive, ISO format)
+            cursor: Position returned with a previously yielded record
+
+        Yields:
+            (record, cursor) pairs in storage order
+        """
+        generation = 0
+        for offset, length, entry in self._scan("s"):
+            if "_snapshot" in entry:
+                generation = entry["_snapshot"]["generation"]
+                break
+
+        if cursor and cursor.get("g") != generation:
+            # Offsets from another generation: find the cursor's record again
+            after = (cursor["t"], cursor["id"])
+            found = False
+            for (file_key, end), record in self._iter_live([("s", 0), ("j", 0)], generation):
+                key = _record_key(record)
+                if not found:
+                    found = key == after
+                elif _matches(record, filters, since, until):
+                    yield record, {"g": generation, "f": file_key, "o": end, "t": key[0], "id": key[1]}
+            if found:
+                return
+
+            records = [
+                record for _, record in self._iter_live([("s", 0), ("j", 0)], generation)
+                if _record_key(record) > after and _matches(record, filters, since, until)
+            ]
+            for record in sorted(records, key=_record_key):
+                key = _record_key(record)
+                yield record, {"g": None, "t": key[0], "id": key[1]}
+            return
+
+        sources = [("s", 0), ("j", 0)]
+        if cursor:
+            sources = [("s", cursor["o"]), ("j", 0)] if cursor["f"] == "s" else [("j", cursor["o"])]
+
+        for (file_key, end), record in self._iter_live(sources, generation):
+            if _matches(record, filters, since, until):
+                key = _record_key(record)
+                yield record, {"g": generation, "f": file_key, "o": end, "t": key[0], "id": key[1]}
+
+    def _iter_live(self, sources, generation):
+        """Yield ((file key, end offset), record) for every live record line of the given files"""
+        for file_key, start in sources:
+            for offset, length, entry in self._scan(file_key, start):
+                if "_snapshot" in entry:
+                    continue
+                if "_journal" in entry:
+                    if entry["_journal"]["generation"] < generation:
+                        return
+                    continue
+
+                if file_key == "j":
+                    if entry.get("op") != "put":
+                        continue
+                    yield (file_key, offset + length), entry["record"]
+                else:
+                    yield (file_key, offset + length), entry
+
+    def find(self, candidate_id):
+        """
+        Return the records stored under a candidate ID
+
+        Args:
+            candidate_id: Hashed candidate identifier
+
+        Returns:
+            List of matching records (oldest first)
+        """
+        with self._lock:
+            try:
+                records = [self._read_location(loc) for loc in self.index.get(candidate_id)]
+                if all(r.get("candidate_id") == candidate_id for r in records):
+                    return records
+            except (OSError, ValueError, KeyError):
+                pass
+
+            # The index points at the wrong bytes; rebuild it and retry once
+            self.rebuild_index()
+            return [self._read_location(loc) for loc in self.index.get(candidate_id)]
+
+    def remove(self, candidate_id):
+        """
+        Remove every record stored under a candidate ID
+
+        Args:
+            candidate_id: Hashed candidate identifier
+
+        Returns:
+            Number of records removed
+        """
+        return self.remove_many([candidate_id])[candidate_id]
+
+    def remove_many(self, candidate_ids):
+        """
+        Remove every record stored under any of the candidate IDs
+
+        All matching lines are blanked with one pass per data file and the
+        index is updated with a single append.
+
+        Args:
+            candidate_ids: Iterable of hashed candidate identifiers
+
+        Returns:
+            Dictionary of candidate ID -> number of records removed
+        """
+        with self._lock:
+            # find() validates the index before anything is overwritten
+            removed = {candidate_id: len(self.find(candidate_id)) for candidate_id in candidate_ids}
+            found = [candidate_id for candidate_id, count in removed.items() if count]
+            if not found:
+                return removed
+
+            self._erase_locations([loc for candidate_id in found for loc in self.index.get(candidate_id)])
+            self.index.drop_many(found)
+
+            meta = self._read_meta()
+            meta["total_candidates"] -= sum(removed.values())
+            meta["last_updated"] = datetime.now().isoformat()
+            self._write_meta(meta)
+
+            return removed
+
+    def purge_expired(self, now, limit):
+        """
+        Remove up to `limit` records whose retention date has passed
+
+        Expired records come off the index's expiry heap, so only the
+        expired prefix is touched.
+
+        Args:
+            now: ISO timestamp to compare retention dates against
+            limit: Maximum number of records to remove
+
+        Returns:
+            Candidate IDs of the removed records
+        """
+        with self._lock:
+            expired = self.index.expired(now, limit)
+            if not expired:
+                return []
+
+            self._erase_locations([loc for _, loc in expired])
+            self.index.remove_locations(expired)
+
+            meta = self._read_meta()
+            meta["total_candidates"] -= len(expired)
+            meta["last_updated"] = datetime.now().isoformat()
+            self._write_meta(meta)
+
+            return [candidate_id for candidate_id, _ in expired]
+
+    def metadata(self):
+        """Return the storage metadata counters"""
+        with self._lock:
+            return self._read_meta()
+
+
+class SqliteStore:
+    """
+    SQLite storage in WAL mode, safe for many concurrent Streamlit sessions
+
+    Each record is one row: the full record as JSON plus indexed columns for
+    candidate_id, submission_timestamp and data_retention_until. Writes run
+    in short IMMEDIATE transactions, so concurrent saves queue on the
+    database lock instead of overwriting each other. Every thread gets its
+    own connection, reused across calls.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS candidates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            candidate_id TEXT NOT NULL,
+            submission_timestamp TEXT,
+            data_retention_until TEXT,
+            status TEXT,
+            record TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_candidates_candidate_id ON candidates (candidate_id);
+        CREATE INDEX IF NOT EXISTS idx_candidates_submission ON candidates (submission_timestamp);
+        CREATE INDEX IF NOT EXISTS idx_candidates_retention ON candidates (data_retention_until);
+        CREATE INDEX IF NOT EXISTS idx_candidates_status ON candidates (status, id);
+        CREATE TABLE IF NOT EXISTS metadata (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, data_dir, busy_timeout=30.0):
+        self.data_dir = data_dir
+        self.db_file = os.path.join(data_dir, "candidates.db")
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+
+        conn = self._connection()
+        conn.executescript(self.SCHEMA)
+
+        with self._transaction() as conn:
+            now = datetime.now().isoformat()
+            conn.execute(
+                "INSERT OR IGNORE INTO metadata (key, value) VALUES ('created_at', ?), ('last_updated', ?)",
+                (now, now)
+            )
+
+        json_file = os.path.join(data_dir, "candidates.json")
+        if os.path.exists(json_file) and not self._migrated(conn):
+            print(f"Note: {json_file} has not been imported; run "
+                  f"'python -m utils.storage --data-dir {data_dir}' to migrate it")
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # Zero out deleted rows so erased data does not linger in free pages
+            conn.execute("PRAGMA secure_delete=ON")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Run a write transaction, taking the write lock up front"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+    @staticmethod
+    def _row_values(record):
+        return (
+            record.get("candidate_id", ""),
+            record.get("submission_timestamp"),
+            record.get("data_retention_until"),
+            record.get("status"),
+            json.dumps(record)
+        )
+
+    def _insert(self, conn, records):
+        conn.executemany(
+            "INSERT INTO candidates (candidate_id, submission_timestamp, data_retention_until, status, record) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [self._row_values(r) for r in records]
+        )
+
+    def _touch(self, conn):
+        conn.execute(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES ('last_updated', ?)",
+            (datetime.now().isoformat(),)
+        )
+
+    @staticmethod
+    def _migrated(conn):
+        return conn.execute("SELECT 1 FROM metadata WHERE key = 'migrated_from_json'").fetchone() is not None
+
+    def migrate_from_json(self, json_file, shred=False):
+        """
+        One-shot import of an existing candidates.json into the database
+
+        Never runs implicitly: stop any json-mode app on the same data
+        directory first, since the JSON file is moved away. Runs only while
+        the database has never been migrated. Once the import has committed
+        the file is renamed to candidates.json.migrated and kept until an
+        operator removes it; that copy is outside erasure and retention
+        purges. With shred=True it is overwritten and deleted instead, as is
+        any .migrated copy from an earlier run.
+
+        Args:
+            json_file: Path to the legacy JSON store
+            shred: Overwrite and delete the JSON file instead of keeping it
+
+        Returns:
+            Number of imported records
+        """
+        migrated_copy = json_file + ".migrated"
+        if shred and os.path.exists(migrated_copy):
+            _shred_file(migrated_copy)
+        if not os.path.exists(json_file):
+            return 0
+
+        with self._transaction() as conn:
+            if self._migrated(conn):
+                return 0
+
+            with open(json_file, 'r') as f:
+                storage = json.load(f)
+
+            records = storage.get("candidates", [])
+            self._insert(conn, records)
+            conn.execute(
+                "INSERT INTO metadata (key, value) VALUES ('migrated_from_json', ?)",
+                (datetime.now().isoformat(),)
+            )
+            created_at = storage.get("metadata", {}).get("created_at")
+            if created_at:
+                conn.execute("UPDATE metadata SET value = ? WHERE key = 'created_at'", (created_at,))
+            self._touch(conn)
+
+        if shred:
+            _shred_file(json_file)
+        else:
+            os.replace(json_file, migrated_copy)
+        return len(records)
+
+    def append_records(self, records):
+        """
+        Append records to the store
+
+        Args:
+            records: List of candidate record dictionaries
+        """
+        with self._transaction() as conn:
+            self._insert(conn, records)
+            self._touch(conn)
+
+    def upsert_records(self, records):
+        """
+        Insert or replace records keyed on candidate_id
+
+        Args:
+            records: List of candidate record dictionaries
+
+        Returns:
+            One result dictionary (candidate_id, version, written) per record
+        """
+        with self._transaction() as conn:
+            results = []
+            for record in records:
+                candidate_id = record.get("candidate_id", "")
+                row = conn.execute(
+                    "SELECT record FROM candidates WHERE candidate_id = ? ORDER BY id DESC LIMIT 1",
+                    (candidate_id,)
+                ).fetchone()
+                result = _resolve_upsert(json.loads(row[0]) if row else None, record)
+                results.append(result)
+                if result["written"]:
+                    conn.execute("DELETE FROM candidates WHERE candidate_id = ?", (candidate_id,))
+                    self._insert(conn, [record])
+
+            if any(result["written"] for result in results):
+                self._touch(conn)
+            return results
+
+    def read_all(self):
+        """
+        Return every stored record
+
+        Returns:
+            List of candidate record dictionaries
+        """
+        rows = self._connection().execute("SELECT record FROM candidates ORDER BY id").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def iter_records(self, filters=None, since=None, until=None, cursor=None, fetch_size=500):
+        """
+        Stream matching records using keyset pagination on the row id
+
+        status, since and until are evaluated by SQLite on indexed columns;
+        any other filters are applied to the decoded records.
+
+        Args:
+            filters: Dictionary of field -> required value
+            since: Minimum submission_timestamp (inclusive, ISO format)
+            until: Maximum submission_timestamp (exclusive, ISO format)
+            cursor: Position returned with a previously yielded record
+            fetch_size: Rows fetched from SQLite per round trip
+
+        Yields:
+            (record, cursor) pairs in insertion order
+        """
+        filters = dict(filters or {})
+        clauses = ["id > ?"]
+        params = [cursor["rowid"] if cursor else 0]
+
+        if "status" in filters:
+            clauses.append("status = ?")
+            params.append(filters.pop("status"))
+        if since:
+            clauses.append("submission_timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("submission_timestamp < ?")
+            params.append(until)
+
+        query = "SELECT id, record FROM candidates WHERE " + " AND ".join(clauses) + " ORDER BY id LIMIT ?"
+
+        while True:
+            rows = self._connection().execute(query, params + [fetch_size]).fetchall()
+            for rowid, raw in rows:
+                record = json.loads(raw)
+                if _matches(record, filters):
+                    yield record, {"rowid": rowid}
+            if len(rows) < fetch_size:
+                return
+            params[0] = rows[-1][0]
+
+    def find(self, candidate_id):
+        """
+        Return the records stored under a candidate ID
+
+        Args:
+            candidate_id: Hashed candidate identifier
+
+        Returns:
+            List of matching records (oldest first)
+        """
+        rows = self._connection().execute(
+            "SELECT record FROM candidates WHERE candidate_id = ? ORDER BY id",
+            (candidate_id,)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def remove(self, candidate_id):
+        """
+        Remove every record stored under a candidate ID
+
+        Args:
+            candidate_id: Hashed candidate identifier
+
+        Returns:
+            Number of records removed
+        """
+        return self.remove_many([candidate_id])[candidate_id]
+
+    def remove_many(self, candidate_ids):
+        """
+        Remove every record stored under any of the candidate IDs in one transaction
+
+        Args:
+            candidate_ids: Iterable of hashed candidate identifiers
+
+        Returns:
+            Dictionary of candidate ID -> number of records removed
+        """
+        removed = {}
+        with self._transaction() as conn:
+            for candidate_id in candidate_ids:
+                removed[candidate_id] = conn.execute(
+                    "DELETE FROM candidates WHERE candidate_id = ?",
+                    (candidate_id,)
+                ).rowcount
+            if any(removed.values()):
+                self._touch(conn)
+
+        if any(removed.values()):
+            # Old page images in the WAL still hold the erased rows until checkpointed
+            self._connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return removed
+
+    def purge_expired(self, now, limit):
+        """
+        Remove up to `limit` records whose retention date has passed
+
+        Args:
+            now: ISO timestamp to compare retention dates against
+            limit: Maximum number of records to remove
+
+        Returns:
+            Candidate IDs of the removed records
+        """
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, candidate_id FROM candidates WHERE data_retention_until <= ? "
+                "ORDER BY data_retention_until LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            if rows:
+                conn.executemany("DELETE FROM candidates WHERE id = ?", [(row[0],) for row in rows])
+                self._touch(conn)
+
+        if rows:
+            self._connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return [row[1] for row in rows]
+
+    def metadata(self):
+        """Return the storage metadata counters"""
+        conn = self._connection()
+        meta = dict(conn.execute("SELECT key, value FROM metadata").fetchall())
+        meta["total_candidates"] = conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+        return meta
+
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _record_key(record):
+    """Ordering key used by keyset cursors: (submission_timestamp, candidate_id)"""
+    return (record.get("submission_timestamp") or "", record.get("candidate_id") or "")
+
+
+def _matches(record, filters=None, since=None, until=None):
+    """Check a record against equality filters and a submission time window"""
+    if filters:
+        for field, value in filters.items():
+            if record.get(field) != value:
+                return False
+
+    submitted = record.get("submission_timestamp") or ""
+    if since and submitted < since:
+        return False
+    if until and submitted >= until:
+        return False
+
+    return True
+
+
+def _resolve_upsert(latest, record):
+    """
+    Decide whether an upserted record needs writing and stamp its version
+
+    A record is a no-op when the latest stored version came from the same
+    session with identical content; anything else becomes the next version.
+
+    Args:
+        latest: Latest stored record for the candidate ID, or None
+        record: Incoming record carrying session_token and content_hash
+
+    Returns:
+        Result dictionary with candidate_id, version and written flag
+    """
+    if (latest is not None
+            and latest.get("session_token") == record.get("session_token")
+            and latest.get("content_hash") == record.get("content_hash")):
+        return {
+            "candidate_id": record.get("candidate_id"),
+            "version": latest.get("version", 1),
+            "written": False
+        }
+
+    record["version"] = (latest.get("version", 1) if latest is not None else 0) + 1
+    return {"candidate_id": record.get("candidate_id"), "version": record["version"], "written": True}
+
+
+def _atomic_write(path, content):
+    """Write a file via a temporary sibling so readers never see a partial file"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb' if isinstance(content, bytes) else 'w') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _truncate_torn_tail(f, chunk_size=4096):
+    """
+    Cut a partial last line (left by a crash mid-append) off a JSONL file
+
+    Without this the next append would be glued onto the partial line and
+    skipped as undecodable on replay.
+
+    Args:
+        f: File opened in 'r+b' mode
+
+    Returns:
+        Size of the file afterwards, i.e. the offset to append at
+    """
+    end = f.seek(0, os.SEEK_END)
+    position = end
+    while position > 0:
+        start = max(position - chunk_size, 0)
+        f.seek(start)
+        chunk = f.read(position - start)
+        newline = chunk.rfind(b"\n")
+        if newline != -1:
+            position = start + newline + 1
+            break
+        position = start
+
+    if position != end:
+        f.truncate(position)
+        f.seek(position)
+    return position
+
+
+def _shred_file(path):
+    """Overwrite a file with zeros, flush it to disk and delete it"""
+    size = os.path.getsize(path)
+    with open(path, 'r+b') as f:
+        remaining = size
+        block = b"\0" * 65536
+        while remaining > 0:
+            f.write(block[:min(remaining, len(block))])
+            remaining -= len(block)
+        f.flush()
+        os.fsync(f.fileno())
+    os.remove(path)
+
+
+def create_store(storage_mode, data_dir, snapshot_interval=500):
+    """
+    Build the storage backend for a storage mode
+
+    Args:
+        storage_mode: "json" (single document), "journal" (append-only) or "sqlite"
+        data_dir: Directory holding the data files
+        snapshot_interval: Journal entries between snapshots (journal mode)
+
+    Returns:
+        Storage backend instance
+    """
+    if storage_mode == "json":
+        return JsonFileStore(data_dir)
+    if storage_mode == "journal":
+        return JournalStore(data_dir, snapshot_interval=snapshot_interval)
+    if storage_mode == "sqlite":
+        return SqliteStore(data_dir)
+
+    raise ValueError(f"Unknown storage mode: {storage_mode}")
+
+
+def main(argv=None):
+    """Command-line entry point: import candidates.json into the sqlite store"""
+    from config.settings import STORAGE_CONFIG
+    from utils.process_lock import lock_data_dir
+
+    parser = argparse.ArgumentParser(description="Import a json-mode candidates.json into candidates.db")
+    parser.add_argument("--data-dir", default=STORAGE_CONFIG["data_dir"])
+    parser.add_argument("--shred", action="store_true",
+                        help="Overwrite and delete candidates.json instead of keeping candidates.json.migrated")
+    args = parser.parse_args(argv)
+
+    # Moving candidates.json away under a running json-mode server would break its saves
+    try:
+        process_lock = lock_data_dir(args.data_dir)
+    except RuntimeError as e:
+        print(f"Error migrating candidates.json: {str(e)}")
+        return
+
+    try:
+        store = SqliteStore(args.data_dir)
+        imported = store.migrate_from_json(os.path.join(args.data_dir, "candidates.json"), shred=args.shred)
+        store.close()
+        print(f"Imported {imported} records")
+    finally:
+        process_lock.close()
+
+
+if __name__ == "__main__":
+    main()
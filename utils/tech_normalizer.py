@@ -0,0 +1,180 @@
+"""
+Tech Name Normalizer - Maps free-form technology names onto question bank keys
+All lookup tables are built once; each name then costs a few dict lookups
+"""
+
+import re
+from functools import lru_cache
+
+from utils.fuzzy_match import TrigramIndex, edit_distance
+
+
+# Alias -> question bank key. Spacing/punctuation variants ("node js", "vue.js")
+# are covered by the compact form and don't need their own entries.
+TECH_ALIASES = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "es6": "javascript",
+    "node": "express",
+    "nodejs": "express",
+    "expressjs": "express",
+    "reactjs": "react",
+    "angularjs": "angular",
+    "vuejs": "vue",
+    "vuex": "vue",
+    "postgres": "postgresql",
+    "postgre": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "mssql": "sql",
+    "sqlserver": "sql",
+    "tsql": "sql",
+    "k8s": "kubernetes",
+    "kube": "kubernetes",
+    "py": "python",
+    "drf": "django",
+    "djangorestframework": "django",
+    "dockercompose": "docker",
+    "amazonwebservices": "aws",
+    "ec2": "aws",
+    "s3": "aws",
+    "lambda": "aws",
+    "github": "git",
+    "gitlab": "git",
+}
+
+PARENTHETICAL_PATTERN = re.compile(r"\(.*?(?:\)|$)|\[.*?(?:\]|$)")
+VERSION_SUFFIX_PATTERN = re.compile(r"(?:\s+v?|\s*-\s*|v)\d+(?:\.\d+)*(?:\.x|\+)?$")
+GLUED_VERSION_PATTERN = re.compile(r"(?<=[a-z])\d+(?:\.\d+)*$")
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s+#.]+")
+NON_ALNUM_PATTERN = re.compile(r"[^a-z0-9+#]+")
+
+
+class TechNameNormalizer:
+    """
+    Resolves technology names like "Node JS", "React 18", "PostgreSQL 15"
+    or "AWS (EC2, S3)" to question bank keys
+
+    Every canonical key and alias is stored under its lowercase form and
+    its compact form (no spaces or punctuation) in one hash map. A name is
+    resolved by trying progressively cleaned variants against that map:
+    as typed, without parentheticals and punctuation, without a version
+    suffix, then compacted.
+    """
+
+    # Names shorter than this are too ambiguous to match fuzzily ("js", "s3", "go")
+    MIN_FUZZY_LENGTH = 4
+    # Typos allowed per this many characters of the matched name beyond the first:
+    # "Kubernates" and "Djano" are typos, "Reactive", "Expressive" and "Javas" other words
+    FUZZY_CHARS_PER_EDIT = 4
+
+    def __init__(self, canonical_names, aliases=None, cache_size=4096):
+        """
+        Args:
+            canonical_names: Question bank keys
+            aliases: Alias -> canonical name mapping (defaults to TECH_ALIASES)
+            cache_size: Number of distinct raw names memoized
+        """
+        aliases = TECH_ALIASES if aliases is None else aliases
+        self.canonical_names = set(canonical_names)
+        self.lookup = {}
+
+        for name in self.canonical_names:
+            self._register(name, name)
+        for alias, target in aliases.items():
+            self._register(alias, target)
+
+        self.fuzzy_index = TrigramIndex({
+            name: target for name, target in self.lookup.items()
+            if len(name) >= self.MIN_FUZZY_LENGTH
+        })
+
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _register(self, name, target):
+        self.lookup.setdefault(name, target)
+        self.lookup.setdefault(self._compact(name), target)
+
+    @staticmethod
+    def _compact(name):
+        return NON_ALNUM_PATTERN.sub("", name.lower())
+
+    def _normalize(self, tech):
+        name = tech.lower().strip()
+        lookup = self.lookup
+
+        if name in lookup:
+            return lookup[name]
+
+        cleaned = PARENTHETICAL_PATTERN.sub(" ", name)
+        cleaned = PUNCTUATION_PATTERN.sub(" ", cleaned)
+        cleaned = " ".join(cleaned.split()).strip(" .")
+        if cleaned in lookup:
+            return lookup[cleaned]
+
+        compact = self._compact(cleaned)
+        if compact in lookup:
+            return lookup[compact]
+
+        unversioned = VERSION_SUFFIX_PATTERN.sub("", cleaned)
+        unversioned = GLUED_VERSION_PATTERN.sub("", unversioned).strip(" .")
+        if unversioned in lookup:
+            return lookup[unversioned]
+
+        compact = self._compact(unversioned)
+        if compact in lookup:
+            return lookup[compact]
+
+        return cleaned or name
+
+    def _resolve(self, tech):
+        name = self.normalize(tech)
+        if name in self.canonical_names:
+            return name, 1.0
+
+        compact = self._compact(name)
+        if len(compact) < self.MIN_FUZZY_LENGTH:
+            return name, 0.0
+
+        match, score = self.fuzzy_index.best_name(compact)
+        if match is None:
+            return name, 0.0
+        if edit_distance(compact, match) > (len(match) - 1) // self.FUZZY_CHARS_PER_EDIT:
+            return name, 0.0
+        return self.lookup[match], score
+
+    def resolve_many(self, techs):
+        """
+        Resolve a whole tech stack, falling back to fuzzy matching
+
+        Exact and alias matches come back with confidence 1.0. Anything
+        else is matched against the trigram index of known names and comes
+        back with its similarity, so callers decide which confidence is
+        good enough.
+
+        Args:
+            techs: Iterable of technology names
+
+        Returns:
+            List of (name, confidence) pairs in input order
+        """
+        resolve = self.resolve
+        return [resolve(tech) for tech in techs]
+
+    def normalize_many(self, techs):
+        """
+        Normalize a whole tech stack
+
+        Args:
+            techs: Iterable of technology names
+
+        Returns:
+            List of normalized names in input order
+        """
+        normalize = self.normalize
+        return [normalize(tech) for tech in techs]
+
+    def is_known(self, tech):
+        """Check whether a name resolves to a question bank key"""
+        return self.normalize(tech) in self.canonical_names
@@ -2,200 +2,336 @@
 Tech Stack Question Generator - Generates relevant technical questions
 """
 
+import os
 import random
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.question_bank import ANY_DIFFICULTY, QuestionBank
+from utils.tech_normalizer import TechNameNormalizer
+from utils.ttl_cache import TTLCache
+
+
+# Trigram similarity needed to treat a misspelling ("Djano") as a known technology
+FUZZY_MATCH_THRESHOLD = 0.6
+
+YEARS_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+# Bucket key of the generic questions in rotation mode
+GENERIC_BUCKET = ("_generic", None)
+
+# Cohorts at least this large are split across worker processes
+PARALLEL_BATCH_THRESHOLD = 20000
+
+# (years below, seniority); anything above the last band is senior
+SENIORITY_BANDS = ((2, "junior"), (5, "mid"))
+
+# Difficulty buckets tried for each seniority, best fit first
+DIFFICULTY_PREFERENCE = {
+    "junior": ("junior", ANY_DIFFICULTY, "mid", "senior"),
+    "mid": ("mid", ANY_DIFFICULTY, "junior", "senior"),
+    "senior": ("senior", ANY_DIFFICULTY, "mid", "junior"),
+}
 
 
 class TechStackQuestionGenerator:
     """Generates technical questions tailored to candidate's declared tech stack"""
 
-    def __init__(self):
-        self.question_bank = {
-            "python": [
-                "What is the difference between lists and tuples in Python?",
-                "Explain decorators in Python and provide a use case.",
-                "How does Python's garbage collection work?",
-                "What are list comprehensions and how do they improve code readability?",
-                "Explain the difference between 'is' and '==' in Python."
-            ],
-            "javascript": [
-                "Explain the concept of closures in JavaScript with an example.",
-                "What is the difference between 'let', 'const', and 'var'?",
-                "How does event delegation work in JavaScript?",
-                "Explain promises and async/await in JavaScript.",
-                "What is the event loop in JavaScript and how does it work?"
-            ],
-            "java": [
-                "What is the difference between an interface and an abstract class in Java?",
-                "Explain the concept of multithreading in Java.",
-                "What are Java Collections and which ones do you use most frequently?",
-                "How does garbage collection work in Java?",
-                "Explain the SOLID principles in Java development."
-            ],
-            "react": [
-                "Explain the Virtual DOM and how React uses it for performance optimization.",
-                "What are React Hooks and why were they introduced?",
-                "How do you manage state in a React application?",
-                "What is the difference between controlled and uncontrolled components?",
-                "Explain the component lifecycle methods in React."
-            ],
-            "angular": [
-                "What are Angular directives and what types exist?",
-                "Explain dependency injection in Angular.",
-                "What is the difference between Observables and Promises in Angular?",
-                "How does change detection work in Angular?",
-                "What are Angular modules and why are they important?"
-            ],
-            "vue": [
-                "Explain the Vue component lifecycle hooks.",
-                "What is the difference between computed properties and watchers in Vue?",
-                "How does Vue's reactivity system work?",
-                "What are slots in Vue and when would you use them?",
-                "Explain Vuex and how it helps with state management."
-            ],
-            "django": [
-                "Explain Django's MVT (Model-View-Template) architecture.",
-                "What are Django middleware and how do they work?",
-                "How does Django's ORM handle database queries?",
-                "Explain Django signals and provide a use case.",
-                "How do you handle authentication and authorization in Django?"
-            ],
-            "flask": [
-                "What makes Flask a 'micro' framework?",
-                "How do you handle routing in Flask?",
-                "Explain Flask blueprints and when you would use them.",
-                "How do you manage database connections in Flask?",
-                "What is the difference between Flask and Django?"
-            ],
-            "express": [
-                "How does middleware work in Express.js?",
-                "Explain the request-response cycle in Express.",
-                "How do you handle errors in Express applications?",
-                "What are route parameters and query strings in Express?",
-                "How do you implement authentication in Express.js?"
-            ],
-            "sql": [
-                "Explain the difference between INNER JOIN, LEFT JOIN, and RIGHT JOIN.",
-                "What are indexes and how do they improve database performance?",
-                "Explain database normalization and why it is important.",
-                "What is the difference between DELETE, TRUNCATE, and DROP?",
-                "How do you optimize a slow SQL query?"
-            ],
-            "postgresql": [
-                "What makes PostgreSQL different from other relational databases?",
-                "Explain JSONB data type in PostgreSQL and its advantages.",
-                "What are PostgreSQL extensions and name a few useful ones?",
-                "How does PostgreSQL handle concurrency?",
-                "Explain full-text search capabilities in PostgreSQL."
-            ],
-            "mysql": [
-                "What storage engines does MySQL support and what are their differences?",
-                "Explain transactions and ACID properties in MySQL.",
-                "How do you handle replication in MySQL?",
-                "What are stored procedures and when would you use them?",
-                "Explain the difference between CHAR and VARCHAR in MySQL."
-            ],
-            "mongodb": [
-                "Explain the document model in MongoDB.",
-                "What is the difference between SQL and NoSQL databases?",
-                "How do you design schemas in MongoDB?",
-                "Explain indexing strategies in MongoDB.",
-                "What are aggregation pipelines in MongoDB?"
-            ],
-            "redis": [
-                "What data structures does Redis support?",
-                "How do you use Redis for caching?",
-                "Explain Redis persistence mechanisms.",
-                "What is the difference between Redis and Memcached?",
-                "How can Redis be used for pub/sub messaging?"
-            ],
-            "docker": [
-                "What is the difference between a Docker image and a container?",
-                "Explain Docker volumes and why they are important.",
-                "How do you optimize Docker images for size and performance?",
-                "What is the purpose of Docker Compose?",
-                "Explain the Docker networking model."
-            ],
-            "kubernetes": [
-                "What are Pods in Kubernetes?",
-                "Explain the difference between Deployments and StatefulSets.",
-                "How does Kubernetes handle load balancing?",
-                "What are Kubernetes Services and why are they needed?",
-                "Explain horizontal pod autoscaling in Kubernetes."
-            ],
-            "aws": [
-                "Explain the difference between EC2 and Lambda.",
-                "What is the purpose of S3 and what are its use cases?",
-                "How does AWS handle security and access control?",
-                "Explain VPC and its components in AWS.",
-                "What is the difference between RDS and DynamoDB?"
-            ],
-            "git": [
-                "Explain the difference between merge and rebase in Git.",
-                "What is the purpose of branches in Git?",
-                "How do you resolve merge conflicts?",
-                "Explain Git workflow strategies (GitFlow, GitHub Flow, etc.).",
-                "What is the difference between 'git pull' and 'git fetch'?"
-            ],
-        }
-
-        self.generic_questions = [
-            "Describe a challenging technical problem you have solved recently. What was your approach?",
-            "How do you stay updated with new technologies and best practices in your field?",
-            "Explain a project you are proud of. What technologies did you use and why?",
-            "How do you approach debugging when you encounter a difficult issue?",
-            "What factors do you consider when choosing between different technologies for a project?"
-        ]
+    def __init__(self, bank_dir=None, reload_interval=2.0, pool_cache_size=1024, pool_cache_ttl=300,
+                 exposure_tracker=None):
+        """
+        Args:
+            bank_dir: Directory with one question file per technology
+                (defaults to question_bank/ in the repo)
+            reload_interval: Seconds between checks of the bank files for edits
+            pool_cache_size: Number of distinct tech stacks whose question pools are cached
+            pool_cache_ttl: Seconds a cached pool is reused, bounding how long
+                edited bank files take to reach cached stacks
+            exposure_tracker: Optional QuestionExposureTracker; when given, the
+                least-exposed questions are asked instead of random ones
+        """
+        self.question_bank = QuestionBank(bank_dir, reload_interval=reload_interval)
+        self.pool_cache = TTLCache(max_size=pool_cache_size, ttl_seconds=pool_cache_ttl)
+        self.exposure_tracker = exposure_tracker
+        self._normalizer = None
+        self._normalizer_version = None
+
+    @property
+    def generic_questions(self):
+        """Questions used when the tech stack does not supply enough"""
+        return self.question_bank.generic
+
+    @property
+    def normalizer(self):
+        """Name normalizer over the current bank; rebuilt when technologies are added or removed"""
+        names = self.question_bank.names()
+        if self._normalizer_version != self.question_bank.version:
+            self._normalizer = TechNameNormalizer(names)
+            self._normalizer_version = self.question_bank.version
+        return self._normalizer
 
     def normalize_tech_name(self, tech):
         """Normalize technology names to match question bank keys"""
-        tech_lower = tech.lower().strip()
-
-        variations = {
-            "js": "javascript",
-            "node": "express",
-            "nodejs": "express",
-            "node.js": "express",
-            "reactjs": "react",
-            "react.js": "react",
-            "angularjs": "angular",
-            "vue.js": "vue",
-            "vuejs": "vue",
-            "postgres": "postgresql",
-            "mongo": "mongodb",
-            "k8s": "kubernetes",
-            "py": "python",
-        }
-
-        return variations.get(tech_lower, tech_lower)
-
-    def generate_questions(self, tech_stack, num_questions=5):
+        return self.normalizer.normalize(tech)
+
+    def normalize_many(self, techs):
+        """Normalize a whole tech stack in one call"""
+        return self.normalizer.normalize_many(techs)
+
+    def resolve_tech_name(self, tech):
+        """Match a technology name, tolerating misspellings; returns (name, confidence)"""
+        return self.normalizer.resolve(tech)
+
+    def generate_questions(self, tech_stack, num_questions=5, min_confidence=FUZZY_MATCH_THRESHOLD, seed=None,
+                           years_of_experience=None):
         """
         Generate technical questions based on candidate's tech stack
 
+        Picks one question per recognized technology (in random order), then
+        fills up from the generic questions, then from the remaining
+        technology questions. Every pool is sampled without replacement, so
+        the work is bounded by num_questions; if all pools together hold
+        fewer questions than requested, all of them are returned.
+
+        With years_of_experience, each technology's questions are drawn from
+        the difficulty buckets in the order DIFFICULTY_PREFERENCE gives for
+        the candidate's seniority, so seniors get senior questions first.
+
+        In rotation mode (an exposure tracker is set) the least-exposed
+        questions of each bucket are asked; the seed then only orders the
+        technologies, so question sets are not reproducible from it.
+
         Args:
             tech_stack: List of technologies the candidate knows
             num_questions: Number of questions to generate (default 5)
+            min_confidence: Minimum fuzzy match similarity for a misspelled
+                technology to count as a question bank entry
+            seed: Optional seed (e.g. the session token); the same seed and
+                stack always produce the same questions
+            years_of_experience: Candidate's experience as stored ("5", "3-5 years")
 
         Returns:
             List of technical question strings
         """
+        pools = self.question_pools(tech_stack, min_confidence, seniority_for_years(years_of_experience))
+        return self._select(pools, num_questions, random.Random(seed))
+
+    def generate_questions_batch(self, stacks, num_questions=5, seeds=None, years_of_experience=None,
+                                 min_confidence=FUZZY_MATCH_THRESHOLD, processes=None,
+                                 parallel_threshold=PARALLEL_BATCH_THRESHOLD):
+        """
+        Generate question sets for a whole cohort of candidates
+
+        Every distinct technology name in the cohort is resolved once, and
+        candidates with identical stacks share one pool lookup; each
+        candidate then gets their own sample. Cohorts of at least
+        parallel_threshold candidates are split across worker processes.
+
+        Args:
+            stacks: List of tech stacks (lists of technology names), one per candidate
+            num_questions: Number of questions per candidate
+            seeds: Optional list of per-candidate seeds, parallel to stacks
+            years_of_experience: Optional list of per-candidate experience values, parallel to stacks
+            min_confidence: Minimum fuzzy match similarity for a technology to count
+            processes: Worker processes for large cohorts (defaults to the CPU count; 1 disables).
+                Rotation mode always runs in this process, where the exposure counters live
+            parallel_threshold: Minimum cohort size before worker processes are used
+
+        Returns:
+            List of question lists in the same order as stacks
+        """
+        stacks = [list(stack or ()) for stack in stacks]
+        count = len(stacks)
+        seeds = list(seeds) if seeds is not None else [None] * count
+        years = list(years_of_experience) if years_of_experience is not None else [None] * count
+        if len(seeds) != count or len(years) != count:
+            raise ValueError("seeds and years_of_experience must have one entry per stack")
+
+        workers = processes or os.cpu_count() or 1
+        if workers > 1 and count >= parallel_threshold and self.exposure_tracker is None:
+            return self._generate_batch_parallel(stacks, num_questions, seeds, years, min_confidence, workers)
+
+        # Resolve every distinct name in the cohort once
+        resolve = self.normalizer.resolve
+        resolved = {}
+        for stack in stacks:
+            for tech in stack:
+                if tech not in resolved:
+                    resolved[tech] = resolve(tech)
+
+        bank_names = self.question_bank.names()
+        pools_by_stack = {}
+        shared_rng = random.Random()
+        results = []
+
+        for stack, seed, candidate_years in zip(stacks, seeds, years):
+            seniority = seniority_for_years(candidate_years)
+            key = (tuple(stack), seniority)
+            pools = pools_by_stack.get(key)
+            if pools is None:
+                names = sorted({
+                    name for name, confidence in (resolved[tech] for tech in stack)
+                    if confidence >= min_confidence and name in bank_names
+                })
+                pools = self._cached_pools(names, seniority)
+                pools_by_stack[key] = pools
+
+            rng = shared_rng if seed is None else random.Random(seed)
+            results.append(self._select(pools, num_questions, rng))
+
+        return results
+
+    def _generate_batch_parallel(self, stacks, num_questions, seeds, years, min_confidence, workers):
+        # A few chunks per worker keeps processes busy when stacks differ in cost
+        chunk_size = max(1, -(-len(stacks) // (workers * 4)))
+        chunks = [
+            (stacks[i:i + chunk_size], num_questions, seeds[i:i + chunk_size],
+             years[i:i + chunk_size], min_confidence)
+            for i in range(0, len(stacks), chunk_size)
+        ]
+
+        results = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(self.question_bank.bank_dir, self.question_bank.reload_interval)
+        ) as executor:
+            for part in executor.map(_generate_batch_chunk, chunks):
+                results.extend(part)
+        return results
+
+    def _select(self, pools, num_questions, rng):
+        """Sample num_questions questions from a stack's pools; work is bounded by num_questions"""
         questions = []
-        normalized_stack = [self.normalize_tech_name(tech) for tech in tech_stack]
+        chosen = set()
+
+        tracker = self.exposure_tracker
+
+        # Cached pools are in name order; shuffle so no technology is favoured
+        pools = rng.sample(pools, len(pools))
 
-        # Try to get questions for each technology in the stack
-        for tech in normalized_stack:
-            if tech in self.question_bank:
-                available_questions = self.question_bank[tech]
-                if available_questions:
-                    question = random.choice(available_questions)
-                    if question not in questions:
-                        questions.append(question)
+        def take(key, texts, ids, count):
+            added = 0
+            if count <= 0 or not ids:
+                return added
+            if tracker is not None:
+                picked = tracker.pick(key, texts, ids, min(count, num_questions - len(questions)), chosen)
+            else:
+                picked = rng.sample(ids, min(count, len(ids)))
+            for question_id in picked:
+                if len(questions) >= num_questions:
+                    break
+                question = texts[question_id]
+                if question not in chosen:
+                    chosen.add(question)
+                    questions.append(question)
+                    added += 1
+            return added
+
+        # One question per technology first, so every listed skill is covered
+        for buckets in pools:
+            if len(questions) >= num_questions:
+                break
+            for key, texts, ids in buckets:
+                if take(key, texts, ids, 1):
+                    break
 
         # If we don't have enough tech-specific questions, add generic ones
-        while len(questions) < num_questions:
-            generic_q = random.choice(self.generic_questions)
-            if generic_q not in questions:
-                questions.append(generic_q)
+        generic = self.generic_questions
+        take(GENERIC_BUCKET, generic, range(len(generic)), num_questions - len(questions))
+
+        # Generic pool exhausted: draw further questions from the technologies
+        for buckets in pools:
+            for key, texts, ids in buckets:
+                if len(questions) >= num_questions:
+                    break
+                # One extra draw covers a question already taken from this bucket
+                take(key, texts, ids, num_questions - len(questions) + 1)
+
+        return questions
+
+    def question_pools(self, tech_stack, min_confidence=FUZZY_MATCH_THRESHOLD, seniority=None):
+        """
+        Get the candidate question pools of a tech stack
+
+        Pools are cached by the sorted set of recognized technology names,
+        so "Python, Django" and "django, python 3" share one entry.
+
+        Args:
+            tech_stack: List of technologies the candidate knows
+            min_confidence: Minimum fuzzy match similarity for a technology to count
+            seniority: "junior", "mid", "senior" or None for no difficulty ordering
+
+        Returns:
+            Tuple with one entry per technology (sorted by name), each a tuple of
+            (bucket key, question texts, question ids) buckets in difficulty
+            preference order
+        """
+        names = sorted({
+            name for name, confidence in self.normalizer.resolve_many(tech_stack)
+            if confidence >= min_confidence and name in self.question_bank
+        })
+        return self._cached_pools(names, seniority)
+
+    def _cached_pools(self, names, seniority):
+        key = (tuple(names), seniority, self.question_bank.version)
+        return self.pool_cache.get_or_create(key, lambda: self._build_pools(names, seniority))
+
+    def _build_pools(self, names, seniority):
+        levels = DIFFICULTY_PREFERENCE[seniority] if seniority else None
+        pools = []
+        for name in names:
+            compiled = self.question_bank.compiled(name)
+            if compiled is None:
+                continue
+            if levels is None:
+                pools.append((((name, None), compiled.texts, range(len(compiled.texts))),))
+            else:
+                buckets = compiled.buckets
+                pools.append(tuple(
+                    ((name, level), compiled.texts, buckets[level]) for level in levels if level in buckets
+                ))
+        return tuple(pools)
+
+    def cache_stats(self):
+        """Hit/miss/eviction counters of the question pool cache"""
+        return self.pool_cache.stats()
+
+
+def seniority_for_years(years_of_experience):
+    """
+    Map a years-of-experience value to a seniority level
+
+    Args:
+        years_of_experience: Number or stored string ("5", "3-5", "2.5 years")
+
+    Returns:
+        "junior", "mid" or "senior", or None if no number can be read
+    """
+    if years_of_experience is None:
+        return None
+    match = YEARS_PATTERN.search(str(years_of_experience))
+    if not match:
+        return None
+    years = float(match.group(0))
+    for limit, level in SENIORITY_BANDS:
+        if years < limit:
+            return level
+    return "senior"
+
+
+# Per-process generator for generate_questions_batch() workers
+_batch_worker_generator = None
+
+
+def _init_batch_worker(bank_dir, reload_interval):
+    global _batch_worker_generator
+    _batch_worker_generator = TechStackQuestionGenerator(bank_dir, reload_interval=reload_interval)
+
 
-        # Limit to requested number of questions
-        return questions[:num_questions]
+def _generate_batch_chunk(chunk):
+    stacks, num_questions, seeds, years, min_confidence = chunk
+    return _batch_worker_generator.generate_questions_batch(
+        stacks, num_questions, seeds=seeds, years_of_experience=years,
+        min_confidence=min_confidence, processes=1
+    )
@@ -0,0 +1,113 @@
+"""
+TTL Cache - Bounded, thread-safe LRU cache whose entries also expire after a fixed age
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Least-recently-used cache with a maximum size and per-entry time to live
+
+    Counters (hits, misses, evictions, expirations) are kept so callers can
+    report how well the cache works for their traffic.
+    """
+
+    def __init__(self, max_size=1024, ttl_seconds=300, clock=time.monotonic):
+        """
+        Args:
+            max_size: Maximum number of entries; the least recently used is evicted beyond it
+            ttl_seconds: Seconds an entry stays valid (None keeps entries until evicted)
+            clock: Monotonic time source, replaceable for tests
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # key -> (expires at, value)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Look up a key
+
+        Returns:
+            Cached value, or `default` if the key is missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] is None or entry[0] > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entries beyond max_size"""
+        expires_at = None if self.ttl_seconds is None else self.clock() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_create(self, key, factory):
+        """
+        Return the cached value of a key, building and storing it on a miss
+
+        The factory runs outside the lock, so a slow build does not block
+        other keys; two threads missing the same key may both build it.
+
+        Args:
+            key: Hashable cache key
+            factory: Zero-argument callable producing the value
+
+        Returns:
+            Cached or newly built value
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def invalidate(self, key):
+        """Drop one entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Get cache counters
+
+        Returns:
+            Dictionary with size, hits, misses, evictions, expirations and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }